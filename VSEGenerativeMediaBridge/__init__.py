@@ -26,14 +26,25 @@ import os
 if "bpy" in locals():
     from . import utils
     importlib.reload(utils)
-    from . import yaml_parser
-    importlib.reload(yaml_parser)
+    # Lazily loaded modules only need reloading if they have been imported already
+    for _lazy_module in ("yaml_parser", "process_groups", "executors", "scheduler", "input_cache", "output_dedup",
+                         "proxy_builder"):
+        if f"{__name__}.{_lazy_module}" in sys.modules:
+            importlib.reload(sys.modules[f"{__name__}.{_lazy_module}"])
+    from . import profiling
+    importlib.reload(profiling)
     from . import properties
     importlib.reload(properties)
     from . import operators
     importlib.reload(operators)
     from . import ui
     importlib.reload(ui)
+    from . import config_watcher
+    importlib.reload(config_watcher)
+    from . import job_recovery
+    importlib.reload(job_recovery)
+    from . import project_compaction
+    importlib.reload(project_compaction)
 
     # Reload the new preferences package and its modules
     from . import preferences
@@ -44,11 +55,19 @@ if "bpy" in locals():
         importlib.reload(preferences.ui)
 
 
+# Startup loads the RNA classes and menus, plus the modules that install timers and handlers
+# at registration (config_watcher, job_recovery, project_compaction); all of them only need bpy.
+# The YAML parser, the process machinery and everything used while generating or ingesting
+# (yaml_parser, process_groups, executors, scheduler, input_cache, output_dedup, proxy_builder)
+# are imported on first use.
 from . import utils
-from . import yaml_parser
+from . import profiling
 from . import properties
 from . import operators
 from . import ui
+from . import config_watcher
+from . import job_recovery
+from . import project_compaction
 from . import preferences
 
 
@@ -58,10 +77,19 @@ def register():
     operators.register()
     ui.register()
     preferences.register()
+    config_watcher.register()
+    job_recovery.register()
+    project_compaction.register()
 
 
 def unregister():
     """Unregister all parts of the addon."""
+    # Only has timers to stop if it was used
+    if f"{__name__}.proxy_builder" in sys.modules:
+        sys.modules[f"{__name__}.proxy_builder"].unregister()
+    project_compaction.unregister()
+    job_recovery.unregister()
+    config_watcher.unregister()
     properties.unregister()
     operators.unregister()
     ui.unregister()
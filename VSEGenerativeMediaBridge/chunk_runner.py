@@ -0,0 +1,162 @@
+# VSE Generative Media Bridge
+# Copyright (C) 2024 Paul Siegfried
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Driver for chunked generation.
+# Blender writes a plan with one resolved command per frame-range chunk and runs
+#
+#   python chunk_runner.py <plan.json>
+#
+# as the job's command. The chunks run in parallel (up to 'max_parallel'), then each
+# output is joined losslessly: movie and sound files with ffmpeg's concat demuxer
+# (stream copy, no re-encode), text files by plain concatenation. Because it is the
+# job's only process, cancellation, timeouts, logs and executors work unchanged.
+# It does not depend on Blender.
+
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+POLL_INTERVAL = 0.2
+
+
+def run_chunks(chunks, max_parallel):
+    """Run the chunk commands, at most max_parallel at a time. Returns True if all succeeded."""
+    count = len(chunks)
+    pending = list(range(count))
+    running = {}
+    failure = None
+
+    while (pending or running) and failure is None:
+        while pending and len(running) < max_parallel:
+            index = pending.pop(0)
+            chunk = chunks[index]
+            print(f"Chunk {index + 1}/{count}: frames {chunk['frame_start']}-{chunk['frame_end']} started", flush=True)
+            try:
+                running[index] = subprocess.Popen(chunk["command"], shell=False)
+            except (OSError, subprocess.SubprocessError) as e:
+                failure = f"Chunk {index + 1}/{count} could not be started: {e}"
+                break
+
+        time.sleep(POLL_INTERVAL)
+        for index, process in list(running.items()):
+            return_code = process.poll()
+            if return_code is None:
+                continue
+            del running[index]
+            if return_code != 0:
+                failure = f"Chunk {index + 1}/{count} failed with exit code {return_code}"
+                break
+            print(f"Chunk {index + 1}/{count} finished", flush=True)
+
+    if failure is None:
+        return True
+
+    print(failure, file=sys.stderr, flush=True)
+    for process in running.values():
+        process.terminate()
+    for process in running.values():
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+    return False
+
+
+def _concat_media(ffmpeg, parts, output_path, work_dir):
+    """Join media files with ffmpeg's concat demuxer, copying the streams."""
+    list_path = os.path.join(work_dir, f".{os.path.basename(output_path)}.concat.txt")
+    with open(list_path, 'w', encoding='utf-8') as f:
+        for part in parts:
+            escaped = os.path.abspath(part).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+    try:
+        return subprocess.call([
+            ffmpeg, "-y", "-hide_banner", "-loglevel", "error",
+            "-f", "concat", "-safe", "0", "-i", list_path,
+            "-c", "copy", output_path
+        ])
+    except OSError as e:
+        print(f"Could not run ffmpeg ('{ffmpeg}'): {e}", file=sys.stderr, flush=True)
+        return 1
+    finally:
+        os.remove(list_path)
+
+
+def _concat_text(parts, output_path):
+    with open(output_path, 'wb') as out:
+        for part in parts:
+            with open(part, 'rb') as f:
+                out.write(f.read())
+    return 0
+
+
+def join_outputs(plan):
+    """Join the chunk outputs into the final outputs. Returns True on success."""
+    chunks = plan["chunks"]
+    work_dir = os.path.dirname(os.path.abspath(plan["path"]))
+    for name, output in plan["outputs"].items():
+        parts = [chunk["outputs"][name] for chunk in chunks]
+        existing = [part for part in parts if os.path.exists(part)]
+        if not existing and not output.get("required", True):
+            continue
+        if len(existing) != len(parts):
+            print(f"Output '{name}' is missing for {len(parts) - len(existing)} chunk(s)", file=sys.stderr, flush=True)
+            return False
+
+        if output["type"] == "text":
+            result = _concat_text(parts, output["path"])
+        else:
+            result = _concat_media(plan.get("ffmpeg") or "ffmpeg", parts, output["path"], work_dir)
+        if result != 0:
+            print(f"Joining the chunks of output '{name}' failed", file=sys.stderr, flush=True)
+            return False
+        print(f"Joined {len(parts)} chunks into output '{name}'", flush=True)
+    return True
+
+
+def _remove_chunk_outputs(plan):
+    for chunk in plan["chunks"]:
+        for path in chunk["outputs"].values():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def main(plan_path):
+    with open(plan_path, 'r', encoding='utf-8') as f:
+        plan = json.load(f)
+    plan["path"] = plan_path
+
+    try:
+        if not run_chunks(plan["chunks"], max(1, plan.get("max_parallel", 1))):
+            return 1
+        return 0 if join_outputs(plan) else 1
+    finally:
+        _remove_chunk_outputs(plan)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: chunk_runner.py <plan.json>", file=sys.stderr)
+        sys.exit(2)
+    # Cancellation stops the job with SIGTERM; exit through main's cleanup instead of dying on the spot
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(143))
+    sys.exit(main(sys.argv[1]))
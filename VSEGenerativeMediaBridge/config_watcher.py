@@ -0,0 +1,203 @@
+# VSE Generative Media Bridge
+# Copyright (C) 2024 Paul Siegfried
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import bpy
+import os
+import sys
+import struct
+from .utils import get_prefs, get_yaml_parser
+from .properties import populate_generator_config, get_config_mtime, reconcile_linked_inputs
+
+
+class _InotifyWatcher:
+    """Minimal non-blocking inotify wrapper watching the directories of the config files."""
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_Q_OVERFLOW = 0x00004000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self):
+        import ctypes
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self._fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dir_by_wd = {}
+        self._wd_by_dir = {}
+
+    def sync_directories(self, directories):
+        """Watch exactly the given set of directories."""
+        for directory in set(self._wd_by_dir) - directories:
+            self._libc.inotify_rm_watch(self._fd, self._wd_by_dir.pop(directory))
+        for directory in directories - set(self._wd_by_dir):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self.WATCH_MASK)
+            if wd >= 0:
+                self._wd_by_dir[directory] = wd
+                self._dir_by_wd[wd] = directory
+
+    def read_changed_paths(self):
+        """
+        Returns the set of paths that changed since the last call,
+        or None if events were lost and everything must be re-checked.
+        """
+        changed = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = self.EVENT_HEADER.unpack_from(data, offset)
+                offset += self.EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if mask & self.IN_Q_OVERFLOW:
+                    return None
+                directory = self._dir_by_wd.get(wd)
+                if directory and name:
+                    changed.add(os.path.join(directory, os.fsdecode(name)))
+
+    def close(self):
+        os.close(self._fd)
+
+
+_inotify = None
+_needs_full_scan = True
+
+
+def _normalize(filepath):
+    return os.path.normcase(os.path.abspath(bpy.path.abspath(filepath)))
+
+
+def reload_generator_config(config):
+    """
+    Re-parse a registered generator's YAML file and update it in place.
+    Strips using the generator have their linked_inputs reconciled with the new definition.
+    Returns True if the generator was updated.
+    """
+    validate_yaml_config = get_yaml_parser().validate_yaml_config
+
+    mtime = get_config_mtime(config.config_filepath)
+    try:
+        with open(bpy.path.abspath(config.config_filepath), 'r', encoding='utf-8') as f:
+            parsed_data = validate_yaml_config(f.read())
+    except Exception as e:
+        # Keep the previous snapshot while the file is being edited into a valid state.
+        print(f"GMB Config Watcher: Could not reload '{config.config_filepath}': {e}")
+        config.config_mtime = mtime
+        return False
+
+    old_name = config.name
+    config.inputs.clear()
+    config.outputs.clear()
+    populate_generator_config(config, parsed_data)
+    config.config_mtime = mtime
+
+    for scene in bpy.data.scenes:
+        for strip_props in scene.gmb_strip_properties:
+            if strip_props.generator_name != old_name:
+                continue
+            if old_name != config.name:
+                strip_props.generator_name = config.name
+            reconcile_linked_inputs(strip_props, config)
+
+    print(f"GMB Config Watcher: Reloaded generator '{config.name}' from '{config.config_filepath}'")
+    return True
+
+
+def _tag_sequencer_redraw():
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type in {'SEQUENCE_EDITOR', 'PREFERENCES'}:
+                area.tag_redraw()
+
+
+def _check_configs():
+    """
+    Timer callback that re-parses only the registered configs whose mtime changed.
+    On Linux, inotify tells us which files changed so idle ticks don't touch the
+    filesystem; otherwise every registered file is stat'ed on each tick.
+    Returns the delay until the next check.
+    """
+    global _needs_full_scan
+
+    try:
+        prefs = get_prefs(bpy.context)
+    except (KeyError, AttributeError):
+        return 2.0
+
+    interval = prefs.config_watch_interval
+    if not prefs.watch_configs:
+        _needs_full_scan = True
+        return interval
+
+    configs_by_path = {}
+    for config in prefs.generators:
+        if config.config_filepath:
+            configs_by_path.setdefault(_normalize(config.config_filepath), []).append(config)
+
+    candidates = configs_by_path.keys()
+    if _inotify is not None:
+        _inotify.sync_directories({os.path.dirname(p) for p in configs_by_path})
+        changed = _inotify.read_changed_paths()
+        if changed is None:
+            _needs_full_scan = True
+        if not _needs_full_scan:
+            candidates = {_normalize(p) for p in changed} & configs_by_path.keys()
+    _needs_full_scan = False
+
+    reloaded = False
+    for path in candidates:
+        mtime = get_config_mtime(path)
+        for config in configs_by_path[path]:
+            if mtime and mtime != config.config_mtime:
+                reloaded |= reload_generator_config(config)
+
+    if reloaded:
+        _tag_sequencer_redraw()
+    return interval
+
+
+def register():
+    global _inotify, _needs_full_scan
+    # Nothing to watch in background (render farm) sessions
+    if bpy.app.background:
+        return
+    _needs_full_scan = True
+    if sys.platform.startswith('linux'):
+        try:
+            _inotify = _InotifyWatcher()
+        except (OSError, AttributeError) as e:
+            print(f"GMB Config Watcher: inotify unavailable, falling back to polling: {e}")
+            _inotify = None
+    bpy.app.timers.register(_check_configs, first_interval=1.0, persistent=True)
+
+
+def unregister():
+    global _inotify
+    if bpy.app.timers.is_registered(_check_configs):
+        bpy.app.timers.unregister(_check_configs)
+    if _inotify is not None:
+        _inotify.close()
+        _inotify = None
@@ -0,0 +1,511 @@
+# VSE Generative Media Bridge
+# Copyright (C) 2024 Paul Siegfried
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Process machinery for running generators.
+# This module is imported lazily on the first generation to keep addon startup light.
+# The process group and rlimit helpers it shares with job_supervisor.py and spool_worker.py
+# live in process_groups.py; limit_command is used from here by the generate operator.
+
+import os
+import subprocess
+import time
+
+from .process_groups import (
+    write_json_atomic,
+    new_process_group_kwargs,
+    is_group_running,
+    list_process_group,
+    send_stop,
+    force_kill,
+    limit_command,
+)
+
+
+def start_local_process(command_list, stdout_fp, stderr_fp):
+    """
+    Launch a generator command on this machine, writing its output to the given files.
+    The command gets its own process group, so everything it spawns can be stopped with it.
+    Returns a subprocess.Popen handle. Raises OSError if the process can't be started.
+    """
+    try:
+        return subprocess.Popen(
+            command_list,
+            stdout=stdout_fp,
+            stderr=stderr_fp,
+            shell=False,
+            **new_process_group_kwargs()
+        )
+    except subprocess.SubprocessError as e:
+        raise OSError(str(e)) from e
+
+
+# --- Resource accounting ---
+
+
+class ResourceMonitor:
+    """
+    Samples /proc for every process in a job's process group and accumulates peak RSS,
+    CPU seconds and bytes read/written. Processes that start and exit between two
+    samples are missed, so the figures are a lower bound. Linux only; elsewhere
+    sample() does nothing and the figures stay at zero.
+    """
+
+    def __init__(self, pgid):
+        self.pgid = pgid
+        self.peak_rss_bytes = 0
+        # pid -> last seen (cpu ticks, read bytes, write bytes); totals sum over every pid seen
+        self._per_pid = {}
+        self._ticks_per_second = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+        self._page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+    @property
+    def cpu_seconds(self):
+        return sum(ticks for ticks, _, _ in self._per_pid.values()) / self._ticks_per_second
+
+    @property
+    def read_bytes(self):
+        return sum(read for _, read, _ in self._per_pid.values())
+
+    @property
+    def write_bytes(self):
+        return sum(written for _, _, written in self._per_pid.values())
+
+    def sample(self):
+        """Take one sample of the process group. Cheap enough to call about once a second."""
+        try:
+            entries = os.listdir("/proc")
+        except OSError:
+            return
+        rss_pages = 0
+        for name in entries:
+            if not name.isdigit():
+                continue
+            try:
+                with open(f"/proc/{name}/stat", 'rb') as f:
+                    stat = f.read()
+            except OSError:
+                continue
+            # Fields after the command name: state, ppid, pgrp, ... utime (11), stime (12), ... rss (21)
+            fields = stat[stat.rfind(b")") + 2:].split()
+            if len(fields) < 22 or int(fields[2]) != self.pgid:
+                continue
+            rss_pages += int(fields[21])
+            read_bytes, write_bytes = self._read_io(name)
+            pid = int(name)
+            _, last_read, last_write = self._per_pid.get(pid, (0, 0, 0))
+            self._per_pid[pid] = (
+                int(fields[11]) + int(fields[12]),
+                max(read_bytes, last_read),
+                max(write_bytes, last_write),
+            )
+        self.peak_rss_bytes = max(self.peak_rss_bytes, rss_pages * self._page_size)
+
+    @staticmethod
+    def _read_io(pid):
+        """Returns (read_bytes, write_bytes) from /proc/<pid>/io, or zeros if it isn't readable."""
+        read_bytes = write_bytes = 0
+        try:
+            with open(f"/proc/{pid}/io", 'r') as f:
+                for line in f:
+                    if line.startswith("read_bytes:"):
+                        read_bytes = int(line.split()[1])
+                    elif line.startswith("write_bytes:"):
+                        write_bytes = int(line.split()[1])
+        except (OSError, ValueError):
+            pass
+        return read_bytes, write_bytes
+
+
+# --- Process group termination ---
+# Cancelled or timed out commands get SIGTERM on their whole process group, then
+# SIGKILL once the grace period is over (see process_groups.py). Terminations are tracked
+# here and advanced by reap_terminations(), which the operator calls from a timer so
+# Blender never blocks during the grace period.
+
+
+class _Termination:
+    def __init__(self, process, deadline, label):
+        self.process = process
+        self.deadline = deadline
+        self.label = label
+        self.killed = False
+
+
+_terminations = []
+_messages = []
+
+
+def terminate_process(process, grace_period, label="job"):
+    """
+    Stop a job and everything it spawned.
+    Local processes get SIGTERM on their process group and SIGKILL after grace_period
+    seconds; descendants still running after a normal exit are stopped the same way.
+    Job handles (spool, detached) forward the request to their worker or supervisor.
+    """
+    if not isinstance(process, subprocess.Popen):
+        if process.poll() is None:
+            process.kill()
+        return
+
+    termination = _Termination(process, time.monotonic() + grace_period, label)
+    if not is_group_running(termination.process):
+        return
+
+    if process.returncode is not None:
+        lingering = list_process_group(process.pid)
+        _messages.append(
+            f"{label}: {len(lingering) or 'some'} process(es) were left running after the command exited"
+            + (f" (pids {', '.join(map(str, lingering))})" if lingering else "")
+        )
+
+    send_stop(process)
+    _terminations.append(termination)
+
+
+def _force_kill(termination):
+    process = termination.process
+    lingering = list_process_group(process.pid)
+    if not force_kill(process):
+        return
+    if os.name == 'posix':
+        _messages.append(
+            f"{termination.label}: killed {len(lingering) or 'remaining'} process(es) that ignored SIGTERM"
+            + (f" (pids {', '.join(map(str, lingering))})" if lingering else "")
+        )
+    else:
+        _messages.append(f"{termination.label}: killed process tree that ignored the stop request")
+
+
+def reap_terminations():
+    """
+    Advance pending terminations: forget the finished ones and SIGKILL the groups whose
+    grace period is over. Returns the messages to report, e.g. about lingering descendants.
+    """
+    now = time.monotonic()
+    pending = []
+    for termination in _terminations:
+        if not is_group_running(termination.process):
+            continue
+        if not termination.killed and now >= termination.deadline:
+            _force_kill(termination)
+            termination.killed = True
+        # Keep killed groups until they are gone so the direct child gets reaped
+        pending.append(termination)
+    _terminations[:] = pending
+
+    messages = list(_messages)
+    _messages.clear()
+    return messages
+
+
+def has_pending_terminations():
+    return bool(_terminations)
+
+
+# --- Spool directory executor ---
+# Jobs are serialised as JSON manifests into a shared spool directory:
+#   pending/<job_id>.json   submitted by Blender (written atomically)
+#   claimed/<job_id>.json   moved there by the worker that claimed it (atomic rename)
+#   done/<job_id>.json      result written by the worker (exit code, host, times)
+#   cancel/<job_id>         cancellation request written by Blender
+#   jobs/<job_id>/          working directory: logs, temp inputs and outputs
+# See spool_worker.py for the reference worker.
+
+SPOOL_SUBDIRS = ("pending", "claimed", "done", "cancel", "jobs")
+
+
+def get_spool_job_dir(spool_dir, job_id):
+    """Returns (and creates) the shared working directory for a spool job."""
+    for subdir in SPOOL_SUBDIRS:
+        os.makedirs(os.path.join(spool_dir, subdir), exist_ok=True)
+    job_dir = os.path.join(spool_dir, "jobs", job_id)
+    os.makedirs(job_dir, exist_ok=True)
+    return job_dir
+
+
+class SpoolJob:
+    """
+    A job submitted to a spool directory. Mimics the parts of subprocess.Popen
+    used by the generate operator (poll/wait/kill) so both can be supervised the same way.
+    """
+
+    def __init__(self, spool_dir, job_id):
+        self.spool_dir = spool_dir
+        self.job_id = job_id
+        self.job_dir = os.path.join(spool_dir, "jobs", job_id)
+        self.stdout_path = os.path.join(self.job_dir, "stdout.log")
+        self.stderr_path = os.path.join(self.job_dir, "stderr.log")
+        self.returncode = None
+        self.result = None
+        self.claimed = False
+
+    def _path(self, subdir, suffix=".json"):
+        return os.path.join(self.spool_dir, subdir, f"{self.job_id}{suffix}")
+
+    def is_claimed(self):
+        """Whether a worker has picked up the job, i.e. its pending manifest is gone."""
+        if not self.claimed and self.returncode is None:
+            self.claimed = not os.path.exists(self._path("pending"))
+        return self.claimed
+
+    def poll(self):
+        """Returns the exit code once a worker has reported a result, otherwise None."""
+        if self.returncode is not None:
+            return self.returncode
+        done_path = self._path("done")
+        if not os.path.exists(done_path):
+            return None
+        import json
+        try:
+            with open(done_path, 'r', encoding='utf-8') as f:
+                self.result = json.load(f)
+        except (OSError, ValueError):
+            # Result is still being written or unreadable; try again on the next tick
+            return None
+        self.returncode = int(self.result.get("exit_code", 1))
+        return self.returncode
+
+    def wait(self):
+        return self.poll()
+
+    def kill(self):
+        """Withdraw the job if nobody claimed it yet, otherwise ask the worker to stop it."""
+        try:
+            os.remove(self._path("pending"))
+            self.returncode = -1
+            return
+        except FileNotFoundError:
+            pass
+        with open(self._path("cancel", ""), 'w', encoding='utf-8') as f:
+            f.write("cancel")
+
+    def discard(self):
+        """
+        Remove the job's files from the spool directory. A job that was cancelled while
+        running keeps its cancel marker; the worker cleans up once it has stopped the command.
+        """
+        import shutil
+        leftovers = [("pending", ".json"), ("done", ".json")]
+        if self.returncode is not None:
+            leftovers.append(("cancel", ""))
+        for subdir, suffix in leftovers:
+            try:
+                os.remove(self._path(subdir, suffix))
+            except OSError:
+                pass
+        shutil.rmtree(self.job_dir, ignore_errors=True)
+
+
+def submit_spool_job(spool_dir, job_id, command_list, input_files, output_files, grace_period=5.0, limits=None,
+                     python_script=False):
+    """
+    Serialise a resolved command into a job manifest in the spool directory.
+    input_files: list of file paths the command reads.
+    output_files: dict of output name -> file path the command is expected to write.
+    grace_period: seconds the worker waits between SIGTERM and SIGKILL when cancelling.
+    limits: optional dict with 'max_memory_mb' and 'nice', applied by the worker.
+    python_script: the command is a Python script (and its arguments) for the worker's own interpreter.
+    Returns a SpoolJob handle. Raises OSError if the spool directory isn't writable.
+    """
+    import time
+    import socket
+
+    job = SpoolJob(spool_dir, job_id)
+    get_spool_job_dir(spool_dir, job_id)
+    # Create the log files up front so Blender can start tailing them immediately
+    for log_path in (job.stdout_path, job.stderr_path):
+        open(log_path, 'a', encoding='utf-8').close()
+
+    write_json_atomic(job._path("pending"), {
+        "job_id": job_id,
+        "command": list(command_list),
+        "inputs": list(input_files),
+        "outputs": dict(output_files),
+        "stdout": job.stdout_path,
+        "stderr": job.stderr_path,
+        "grace_period": grace_period,
+        "limits": dict(limits or {}),
+        "python_script": python_script,
+        "submitted_by": socket.gethostname(),
+        "submitted_at": time.time(),
+    })
+    return job
+
+
+# --- Detached executor ---
+# Jobs run under job_supervisor.py in their own session, so they outlive Blender.
+# Their state lives in a per-project directory (see utils.get_detached_jobs_dir):
+#   <job_id>.json     state: command, outputs, strip, supervisor/command pid, exit code
+#   <job_id>.cancel   cancellation request written by Blender
+#   <job_id>/         working directory: logs, temp inputs and outputs
+
+
+def get_detached_job_dir(jobs_dir, job_id):
+    """Returns (and creates) the working directory for a detached job."""
+    job_dir = os.path.join(jobs_dir, job_id)
+    os.makedirs(job_dir, exist_ok=True)
+    return job_dir
+
+
+def _is_pid_alive(pid):
+    """Best-effort liveness check. Only reliable on POSIX; assumes alive elsewhere."""
+    if os.name != 'posix' or not pid:
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class DetachedJob:
+    """
+    A job running under job_supervisor.py. Mimics the parts of subprocess.Popen
+    used by the generate operator (poll/wait/kill), like SpoolJob.
+    """
+
+    def __init__(self, jobs_dir, job_id):
+        self.jobs_dir = jobs_dir
+        self.job_id = job_id
+        self.state_path = os.path.join(jobs_dir, f"{job_id}.json")
+        self.cancel_path = os.path.join(jobs_dir, f"{job_id}.cancel")
+        self.job_dir = os.path.join(jobs_dir, job_id)
+        self.stdout_path = os.path.join(self.job_dir, "stdout.log")
+        self.stderr_path = os.path.join(self.job_dir, "stderr.log")
+        self.returncode = None
+        self._pid = None
+
+    @property
+    def pid(self):
+        """Pid of the command (also its process group id), or None until the supervisor started it."""
+        if self._pid is None:
+            state = self.read_state()
+            if state:
+                self._pid = state.get("pid")
+        return self._pid
+
+    def read_state(self):
+        """Returns the job's state dict, or None if it can't be read right now."""
+        import json
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def poll(self):
+        """Returns the exit code once the supervisor has recorded it, otherwise None."""
+        if self.returncode is not None:
+            return self.returncode
+        state = self.read_state()
+        if state is None:
+            return None
+        if "exit_code" in state:
+            self.returncode = int(state["exit_code"])
+        elif "supervisor_pid" in state and not _is_pid_alive(state["supervisor_pid"]):
+            # The supervisor died without recording a result (e.g. the machine rebooted)
+            with open(self.stderr_path, 'a', encoding='utf-8') as f:
+                f.write("Job supervisor exited without recording a result.\n")
+            self.returncode = -1
+        return self.returncode
+
+    def wait(self):
+        return self.poll()
+
+    def kill(self):
+        """Ask the supervisor to stop the command."""
+        with open(self.cancel_path, 'w', encoding='utf-8') as f:
+            f.write("cancel")
+
+    def discard(self):
+        """
+        Remove the job's state and files. A job that was cancelled while running is
+        left for the supervisor to clean up once it has stopped the command.
+        """
+        if self.returncode is None and os.path.exists(self.cancel_path):
+            return
+        import shutil
+        for path in (self.state_path, self.cancel_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        shutil.rmtree(self.job_dir, ignore_errors=True)
+
+
+def start_detached_job(jobs_dir, job_id, command_list, output_files, metadata):
+    """
+    Start a command under job_supervisor.py, detached from Blender.
+    output_files: dict of output name -> file path the command is expected to write.
+    metadata: extra values stored in the state file (strip id, quality, grace_period, ...).
+    Returns a DetachedJob handle. Raises OSError if the supervisor can't be started.
+    """
+    import sys
+    import time
+
+    job = DetachedJob(jobs_dir, job_id)
+    get_detached_job_dir(jobs_dir, job_id)
+    for log_path in (job.stdout_path, job.stderr_path):
+        open(log_path, 'a', encoding='utf-8').close()
+
+    state = dict(metadata)
+    state.update({
+        "job_id": job_id,
+        "command": list(command_list),
+        "outputs": dict(output_files),
+        "job_dir": job.job_dir,
+        "stdout": job.stdout_path,
+        "stderr": job.stderr_path,
+        "submitted_at": time.time(),
+    })
+    write_json_atomic(job.state_path, state)
+
+    supervisor_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "job_supervisor.py")
+    popen_kwargs = {}
+    if os.name == 'posix':
+        # A new session keeps the job alive when Blender's terminal or process group goes away
+        popen_kwargs["start_new_session"] = True
+    else:
+        popen_kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    try:
+        subprocess.Popen(
+            [sys.executable, supervisor_path, job.state_path],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=True,
+            **popen_kwargs
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        job.returncode = -1
+        job.discard()
+        raise OSError(str(e)) from e
+    return job
+
+
+def list_detached_jobs(jobs_dir):
+    """Returns the state dicts of all detached jobs recorded in jobs_dir."""
+    if not os.path.isdir(jobs_dir):
+        return []
+    jobs = []
+    for entry in os.scandir(jobs_dir):
+        if entry.name.endswith(".json") and not entry.name.startswith("."):
+            state = DetachedJob(jobs_dir, entry.name[:-len(".json")]).read_state()
+            if state is not None:
+                jobs.append(state)
+    return jobs
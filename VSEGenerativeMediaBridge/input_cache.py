@@ -0,0 +1,169 @@
+# VSE Generative Media Bridge
+# Copyright (C) 2024 Paul Siegfried
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Cache of trimmed input clips.
+# Linked movie and sound strips often show a short slice of a long recording. Instead of
+# the whole source file, generators get a clip of just the visible range, cut with ffmpeg.
+# Clips are keyed by the source file's identity (path, size, mtime) and the range, so they
+# are reused by later runs and by other strips showing the same slice.
+# Clips are cut on background threads (cut_in_background), so ffmpeg never blocks Blender's UI.
+# Using a clip touches it; clips unused for a while are found by find_stale_clips().
+# It does not depend on Blender.
+
+import concurrent.futures
+import hashlib
+import os
+import subprocess
+import time
+import uuid
+
+# At most this many ffmpeg cuts run at once
+MAX_PARALLEL_CUTS = 2
+
+# Re-encoding settings for frame-exact clips, or when the source can't be stream-copied
+_ACCURATE_ARGS = {
+    'MOVIE': (".mp4", ["-map", "0:v?", "-map", "0:a?", "-c:v", "libx264", "-crf", "12", "-preset", "veryfast",
+                       "-pix_fmt", "yuv420p", "-c:a", "aac", "-b:a", "256k"]),
+    'SOUND': (".wav", ["-map", "0:a", "-c:a", "pcm_s16le"]),
+}
+_COPY_MAPS = {
+    'MOVIE': ["-map", "0:v?", "-map", "0:a?"],
+    'SOUND': ["-map", "0:a"],
+}
+# Temporary clip names end in .tmp, so ffmpeg is told the output format explicitly
+_MUXERS = {
+    ".mp4": "mp4", ".m4v": "mp4", ".mov": "mov", ".mkv": "matroska", ".webm": "webm", ".avi": "avi",
+    ".wav": "wav", ".mp3": "mp3", ".flac": "flac", ".ogg": "ogg", ".m4a": "ipod",
+}
+
+_executor = None
+# Background cuts by clip key, so strips sharing a clip wait for the same cut
+_cuts = {}
+
+
+def get_clip_key(source_path, start, duration, kind, accurate):
+    """Digest identifying a clip: the source file's path, size and mtime, the range and how it was cut."""
+    stat = os.stat(source_path)
+    identity = f"{os.path.abspath(source_path)}|{stat.st_size}|{stat.st_mtime_ns}|{start:.6f}|{duration:.6f}|{kind}|{accurate}"
+    return hashlib.blake2b(identity.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _find_cached_clip(cache_dir, key):
+    try:
+        for entry in os.scandir(cache_dir):
+            if entry.name.startswith(key) and not entry.name.endswith(".tmp"):
+                return entry.path
+    except FileNotFoundError:
+        pass
+    return None
+
+
+def _run_ffmpeg(ffmpeg, source_path, start, duration, codec_args, output_path):
+    # Seeking before -i is fast on long files and, when re-encoding, frame exact
+    command = [
+        ffmpeg, "-y", "-hide_banner", "-loglevel", "error",
+        "-ss", f"{start:.6f}", "-i", source_path, "-t", f"{duration:.6f}",
+    ] + codec_args + [output_path]
+    try:
+        result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    except OSError as e:
+        raise OSError(f"Could not run ffmpeg ('{ffmpeg}'): {e}") from e
+    return result.returncode, result.stderr.strip()
+
+
+def find_trimmed_clip(source_path, start, duration, cache_dir, kind, accurate=False):
+    """Returns the path of the cached clip of the range, or None if it hasn't been cut yet."""
+    cached = _find_cached_clip(cache_dir, get_clip_key(source_path, start, duration, kind, accurate))
+    if cached:
+        # Keep recently used clips from being collected as stale
+        os.utime(cached)
+    return cached
+
+
+def get_trimmed_clip(ffmpeg, source_path, start, duration, cache_dir, kind, accurate=False):
+    """
+    Returns the path of a clip with 'duration' seconds of source_path from 'start', cutting it if it isn't cached yet.
+    kind: 'MOVIE' or 'SOUND'.
+    accurate: re-encode for a frame-exact cut. Otherwise the streams are copied, which is fast and lossless
+    but starts at the keyframe before 'start'; sources that can't be copied are re-encoded.
+    Raises OSError if the clip can't be made.
+    """
+    cached = find_trimmed_clip(source_path, start, duration, cache_dir, kind, accurate)
+    if cached:
+        return cached
+    key = get_clip_key(source_path, start, duration, kind, accurate)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    attempts = []
+    if not accurate:
+        # Stream copies keep the source's container, falling back to Matroska for unusual ones
+        file_ext = os.path.splitext(source_path)[1].lower()
+        attempts.append((file_ext if file_ext in _MUXERS else ".mkv", _COPY_MAPS[kind] + ["-c", "copy"]))
+    attempts.append(_ACCURATE_ARGS[kind])
+
+    error = ""
+    for file_ext, codec_args in attempts:
+        # Written under a temporary name, so concurrent runs never pick up a half-written clip
+        tmp_path = os.path.join(cache_dir, f"{key}.{uuid.uuid4().hex}{file_ext}.tmp")
+        clip_path = os.path.join(cache_dir, f"{key}{file_ext}")
+        return_code, error = _run_ffmpeg(ffmpeg, source_path, start, duration, codec_args + ["-f", _MUXERS[file_ext]], tmp_path)
+        if return_code == 0 and os.path.getsize(tmp_path) > 0:
+            os.replace(tmp_path, clip_path)
+            return clip_path
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    raise OSError(f"ffmpeg could not cut '{os.path.basename(source_path)}': {error or 'no output'}")
+
+
+def cut_in_background(ffmpeg, source_path, start, duration, cache_dir, kind, accurate=False):
+    """
+    Cuts the clip with get_trimmed_clip on a background thread. Returns a future of the clip's path.
+    A cut of the same clip that is still running is shared instead of started again.
+    """
+    global _executor
+    key = get_clip_key(source_path, start, duration, kind, accurate)
+    future = _cuts.get(key)
+    if future is not None and not future.done():
+        return future
+    if _executor is None:
+        _executor = concurrent.futures.ThreadPoolExecutor(max_workers=MAX_PARALLEL_CUTS, thread_name_prefix="gmb_trim")
+    future = _executor.submit(get_trimmed_clip, ffmpeg, source_path, start, duration, cache_dir, kind, accurate)
+    _cuts[key] = future
+    return future
+
+
+def find_stale_clips(cache_dir, max_age):
+    """
+    Returns (path, size) for every cached clip that hasn't been used for max_age seconds,
+    including temporary files left behind by interrupted cuts.
+    """
+    now = time.time()
+    stale = []
+    try:
+        entries = list(os.scandir(cache_dir))
+    except FileNotFoundError:
+        return stale
+    for entry in entries:
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        if entry.is_file() and now - stat.st_mtime >= max_age:
+            stale.append((entry.path, stat.st_size))
+    return stale
+
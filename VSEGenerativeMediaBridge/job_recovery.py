@@ -0,0 +1,133 @@
+# VSE Generative Media Bridge
+# Copyright (C) 2024 Paul Siegfried
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Reattaches detached jobs when a project is opened.
+# Jobs started with "Keep Jobs Running After Closing" are recorded in the project's
+# .gmb_jobs directory. After a file is loaded, every recorded job whose strip exists is
+# handed back to GMB_OT_generate_media, which either keeps supervising it or ingests
+# its outputs if it finished while Blender was closed.
+
+import bpy
+from bpy.app.handlers import persistent
+
+RETRY_INTERVAL = 2.0
+
+# Detached jobs of the loaded project still waiting to be reattached (None until collected)
+_pending_jobs = None
+
+
+def _mark_interrupted_runs(attachable_ids):
+    """Runs saved as running that have no detached job can't be resumed."""
+    for scene in bpy.data.scenes:
+        for strip_props in scene.gmb_strip_properties:
+            if strip_props.status in {'RUNNING', 'QUEUED'} and strip_props.id not in attachable_ids:
+                strip_props.status = 'ERROR'
+                strip_props.cancel_requested = False
+                strip_props.log_history.clear()
+                strip_props.log_history.add().line = "Generation was interrupted when the project was closed."
+
+
+def _recover_jobs():
+    """
+    Timer callback that reattaches the project's detached jobs.
+    A job can only be reattached from a Sequencer showing its strip's scene, so jobs
+    for scenes that aren't on screen are retried until they are.
+    Returns the delay until the next attempt, or None when nothing is left.
+    """
+    global _pending_jobs
+
+    if _pending_jobs is None:
+        _pending_jobs = _collect_jobs()
+
+    strips_by_id = _get_strips_by_id()
+    still_pending = []
+    for state in _pending_jobs:
+        entry = strips_by_id.get(state["strip_id"])
+        if entry is None:
+            continue
+        scene, strip_props = entry
+        if strip_props.process_uuid != state.get("process_uuid") and strip_props.status in {'RUNNING', 'QUEUED'}:
+            # The strip is busy with a newer run started in this session
+            continue
+        from .utils import find_sequencer
+        target = find_sequencer(scene)
+        if target is None:
+            still_pending.append(state)
+            continue
+        window, area, region = target
+        with bpy.context.temp_override(window=window, area=area, region=region):
+            bpy.ops.gmb.generate_media(
+                'INVOKE_DEFAULT',
+                strip_id=state["strip_id"],
+                attach_job_id=state["job_id"],
+                background=True
+            )
+
+    _pending_jobs = still_pending
+    return RETRY_INTERVAL if still_pending else None
+
+
+def _get_strips_by_id():
+    strips_by_id = {}
+    for scene in bpy.data.scenes:
+        for strip_props in scene.gmb_strip_properties:
+            strips_by_id[strip_props.id] = (scene, strip_props)
+    return strips_by_id
+
+
+def _collect_jobs():
+    """Returns the detached jobs of the loaded project that belong to one of its strips."""
+    from . import executors
+    from .utils import get_detached_jobs_dir
+
+    jobs = []
+    if bpy.data.is_saved:
+        strips_by_id = _get_strips_by_id()
+        jobs = [
+            state for state in executors.list_detached_jobs(get_detached_jobs_dir(create=False))
+            if state.get("strip_id") in strips_by_id
+        ]
+    # Strips generated in a detached batch are reattached with the strip that started it
+    attachable_ids = set()
+    for state in jobs:
+        attachable_ids.add(state["strip_id"])
+        attachable_ids.update(state.get("batch", {}))
+    _mark_interrupted_runs(attachable_ids)
+    return jobs
+
+
+@persistent
+def _on_load_post(*_args):
+    global _pending_jobs
+    _pending_jobs = None
+    if bpy.app.timers.is_registered(_recover_jobs):
+        bpy.app.timers.unregister(_recover_jobs)
+    # Defer until the window manager and screens of the new file are ready
+    bpy.app.timers.register(_recover_jobs, first_interval=0.5)
+
+
+def register():
+    # Background (render farm) sessions never supervise jobs
+    if bpy.app.background:
+        return
+    bpy.app.handlers.load_post.append(_on_load_post)
+
+
+def unregister():
+    if _on_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_on_load_post)
+    if bpy.app.timers.is_registered(_recover_jobs):
+        bpy.app.timers.unregister(_recover_jobs)
@@ -0,0 +1,91 @@
+# VSE Generative Media Bridge
+# Copyright (C) 2024 Paul Siegfried
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Supervisor for detached generation jobs.
+# Blender starts it in its own session with the path of the job's state file:
+#
+#   python job_supervisor.py <project>_vse_gmb/.gmb_jobs/<job_id>.json
+#
+# It runs the command from the state file, records its pid and exit status there,
+# and keeps running if Blender quits or crashes, so the job can be reattached when
+# the project is opened again. A <job_id>.cancel file next to the state file stops it.
+# It does not depend on Blender.
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+# Next to this script, so it is on sys.path
+from process_groups import write_json_atomic, new_process_group_kwargs, stop_process_group
+
+POLL_INTERVAL = 0.5
+DEFAULT_GRACE_PERIOD = 5.0
+
+
+def supervise(state_path):
+    """Run the job described by the state file. Returns the command's exit code."""
+    with open(state_path, 'r', encoding='utf-8') as f:
+        state = json.load(f)
+    cancel_path = os.path.splitext(state_path)[0] + ".cancel"
+
+    state["supervisor_pid"] = os.getpid()
+    state["started_at"] = time.time()
+    with open(state["stdout"], 'a', encoding='utf-8') as stdout_fp, \
+            open(state["stderr"], 'a', encoding='utf-8') as stderr_fp:
+        try:
+            process = subprocess.Popen(state["command"], stdout=stdout_fp, stderr=stderr_fp, shell=False,
+                                       **new_process_group_kwargs())
+        except (OSError, subprocess.SubprocessError) as e:
+            stderr_fp.write(f"Failed to start command: {e}\n")
+            process = None
+
+        cancelled = False
+        if process is not None:
+            state["pid"] = process.pid
+            write_json_atomic(state_path, state)
+            while process.poll() is None:
+                if os.path.exists(cancel_path):
+                    cancelled = True
+                    break
+                time.sleep(POLL_INTERVAL)
+            # Also stops descendants left running after a normal exit
+            stop_process_group(process, state.get("grace_period", DEFAULT_GRACE_PERIOD))
+        exit_code = process.returncode if process is not None else 127
+
+    if cancelled:
+        # Blender has already given up on the job; just clean up after it.
+        for path in (cancel_path, state_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        shutil.rmtree(state["job_dir"], ignore_errors=True)
+        return exit_code
+
+    state["exit_code"] = exit_code
+    state["finished_at"] = time.time()
+    write_json_atomic(state_path, state)
+    return exit_code
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: job_supervisor.py <state_file>", file=sys.stderr)
+        sys.exit(2)
+    sys.exit(supervise(sys.argv[1]))
@@ -17,13 +17,15 @@
 import bpy
 import uuid
 import os
-import subprocess
 import re
 import shlex
 import tempfile
 import shutil
+import sys
+import json
+import time
 from bpy.types import Operator
-from bpy.props import StringProperty
+from bpy.props import StringProperty, BoolProperty, FloatProperty, EnumProperty
 from .utils import (
     get_gmb_type_from_strip, 
     get_strip_by_uuid,
@@ -31,14 +33,31 @@ from .utils import (
     cleanup_gmb_id_version,
     get_addon_placeholder_filepath,
     resolve_strip_filepath,
+    get_detached_jobs_dir,
+    get_input_cache_dir,
+    get_strip_source_range,
+    get_project_output_dir,
+    migrate_output_layout,
+    get_live_gmb_ids,
+    find_orphaned_outputs,
+    iter_output_entries,
+    get_blob_dir,
+    deduplicate_new_output,
+    append_run_record,
+    list_sequence_frames,
+    get_yaml_parser,
+    get_ffmpeg_executable,
     get_prefs
 )
 from .properties import (
     get_gmb_strip_properties_from_id, 
     get_gmb_config_from_strip_properties,
-    parse_yaml_config,
+    get_generator_menu,
+    get_generator_info,
+    has_all_required_inputs,
     GMB_LogEntry
 )
+from .profiling import profiled, dump_profile
 
 class GMB_OT_add_generator_strip(Operator):
     """Add a new generator strip to the timeline."""
@@ -96,6 +115,8 @@ class GMB_OT_add_generator_strip(Operator):
         if gen_config and len(gen_config.outputs) == 1:
             output_prop = gen_config.outputs[0]
             gmb_type = output_prop.type
+            # An image sequence starts out as a single placeholder image
+            placeholder_ext = ".png" if gmb_type == 'IMAGE_SEQUENCE' else output_prop.file_ext
             
             # This is a single-output strip. Create a stable placeholder for it.
             if gmb_type == 'TEXT':
@@ -106,7 +127,7 @@ class GMB_OT_add_generator_strip(Operator):
                     frame_start=frame_start,
                     frame_end=frame_start + 100
                 )
-            elif gmb_type in ['IMAGE', 'SOUND', 'MOVIE']:
+            elif gmb_type in ['IMAGE', 'IMAGE_SEQUENCE', 'SOUND', 'MOVIE']:
                 try:
                     # Generate a unique ID for the strip's data first
                     gmb_id = uuid.uuid4().hex
@@ -121,7 +142,7 @@ class GMB_OT_add_generator_strip(Operator):
                         gen_config.name,
                         output_prop.name,
                         gmb_id,
-                        output_prop.file_ext
+                        placeholder_ext
                     )
 
                     # Get the path to the addon's premade placeholder
@@ -133,7 +154,7 @@ class GMB_OT_add_generator_strip(Operator):
                     shutil.copy(source_placeholder, stable_path)
                     
                     # Now create the strip pointing to the stable placeholder
-                    if gmb_type == 'IMAGE':
+                    if gmb_type in ['IMAGE', 'IMAGE_SEQUENCE']:
                         new_strip = sequences.new_image(name=self.generator_name, filepath=stable_path, channel=channel, frame_start=frame_start)
                         # new_strip.frame_final_duration = 100
                     elif gmb_type == 'SOUND':
@@ -189,6 +210,160 @@ class GMB_OT_add_generator_strip(Operator):
 
         return {'FINISHED'}
 
+def _get_generator_search_items(self, context):
+    return get_generator_menu(context)["search_items"]
+
+class GMB_OT_search_generator(Operator):
+    """Search all generators by name, category and tags, and add a strip of the chosen one."""
+    bl_idname = "gmb.search_generator"
+    bl_label = "Search Generators"
+    bl_options = {'REGISTER', 'UNDO'}
+    bl_property = "generator"
+
+    generator: EnumProperty(
+        name="Generator",
+        items=_get_generator_search_items
+    )
+
+    def invoke(self, context, event):
+        context.window_manager.invoke_search_popup(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        return bpy.ops.gmb.add_generator_strip('EXEC_DEFAULT', generator_name=self.generator)
+
+def _find_free_channel(occupied, channel, frame_start, frame_end):
+    """The lowest channel from 'channel' up with nothing between frame_start and frame_end."""
+    while any(start < frame_end and frame_start < end for start, end in occupied.get(channel, ())):
+        channel += 1
+    return channel
+
+class GMB_OT_apply_generator_to_selection(Operator):
+    """Add one generator strip per selected strip, above it and with its inputs linked to it, in a single undo step."""
+    bl_idname = "gmb.apply_generator_to_selection"
+    bl_label = "Apply Generator to Selection"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    # Placeholder files are copied by this many threads at once
+    COPY_WORKERS = 8
+
+    generator: EnumProperty(
+        name="Generator",
+        items=_get_generator_search_items
+    )
+    generate: BoolProperty(
+        name="Generate Now",
+        description="Start generating every new strip whose required inputs are all linked",
+        default=False
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return context.scene.sequence_editor and context.selected_sequences
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        import concurrent.futures
+
+        scene = context.scene
+        gen_config, info = get_generator_info(context, self.generator)
+        if not gen_config:
+            self.report({'ERROR'}, f"Generator '{self.generator}' not found.")
+            return {'CANCELLED'}
+        sources = sorted(context.selected_sequences, key=lambda s: (s.frame_final_start, s.channel))
+
+        # The generator's inputs by type, so every source strip is matched with one lookup
+        inputs_by_type = {}
+        for input_prop in gen_config.inputs:
+            inputs_by_type.setdefault(input_prop.type, input_prop.name)
+
+        output_prop = gen_config.outputs[0] if len(gen_config.outputs) == 1 else None
+        gmb_type = output_prop.type if output_prop else None
+        source_placeholder = get_addon_placeholder_filepath(gmb_type)
+        if source_placeholder and not os.path.exists(source_placeholder):
+            self.report({'ERROR'}, f"Premade placeholder for type {gmb_type} not found.")
+            return {'CANCELLED'}
+
+        # --- Plan every strip, then copy all placeholders at once ---
+        plans = []
+        for source in sources:
+            plan = {"source": source, "gmb_id": uuid.uuid4().hex, "stable_path": None}
+            if source_placeholder:
+                # An image sequence starts out as a single placeholder image
+                placeholder_ext = ".png" if gmb_type == 'IMAGE_SEQUENCE' else output_prop.file_ext
+                plan["stable_path"] = get_stable_filepath(self.generator, gen_config.name, output_prop.name, plan["gmb_id"], placeholder_ext)
+            plans.append(plan)
+        copies = [plan["stable_path"] for plan in plans if plan["stable_path"]]
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.COPY_WORKERS) as pool:
+                list(pool.map(lambda path: shutil.copyfile(source_placeholder, path), copies))
+        except OSError as e:
+            # The paths are new, so whatever exists there was copied by this run
+            for path in copies:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self.report({'ERROR'}, f"Failed to create stable placeholders: {e}")
+            return {'CANCELLED'}
+
+        # --- Create the strips ---
+        occupied = {}
+        for strip in scene.sequence_editor.sequences:
+            occupied.setdefault(strip.channel, []).append((strip.frame_final_start, strip.frame_final_end))
+        sequences = scene.sequence_editor.sequences
+        new_ids = []
+        for plan in plans:
+            source = plan["source"]
+            frame_start, frame_end = source.frame_final_start, source.frame_final_end
+            channel = _find_free_channel(occupied, source.channel + 1, frame_start, frame_end)
+            stable_path = plan["stable_path"]
+            if gmb_type in ('IMAGE', 'IMAGE_SEQUENCE', 'SOUND', 'MOVIE'):
+                if gmb_type == 'SOUND':
+                    new_strip = sequences.new_sound(name=self.generator, filepath=stable_path, channel=channel, frame_start=frame_start)
+                elif gmb_type == 'MOVIE':
+                    new_strip = sequences.new_movie(name=self.generator, filepath=stable_path, channel=channel, frame_start=frame_start)
+                else:
+                    new_strip = sequences.new_image(name=self.generator, filepath=stable_path, channel=channel, frame_start=frame_start)
+                # Cover the source strip, whatever the placeholder's own length
+                new_strip.frame_final_duration = frame_end - frame_start
+            else:
+                # Text for a single text output, otherwise an Adjustment strip controlling the outputs
+                new_strip = sequences.new_effect(
+                    name=self.generator,
+                    type='TEXT' if gmb_type == 'TEXT' else 'ADJUSTMENT',
+                    channel=channel,
+                    frame_start=frame_start,
+                    frame_end=frame_end
+                )
+            occupied.setdefault(channel, []).append((new_strip.frame_final_start, new_strip.frame_final_end))
+            new_strip["gmb_id"] = plan["gmb_id"]
+
+            gmb_properties = scene.gmb_strip_properties.add()
+            gmb_properties.id = plan["gmb_id"]
+            gmb_properties.generator_name = self.generator
+            matched_input = inputs_by_type.get(get_gmb_type_from_strip(source))
+            if matched_input and "gmb_id" not in source:
+                source["gmb_id"] = uuid.uuid4().hex
+            for input_prop in gen_config.inputs:
+                link = gmb_properties.linked_inputs.add()
+                link.name = input_prop.name
+                if input_prop.name == matched_input:
+                    link.linked_strip_uuid = source["gmb_id"]
+            if has_all_required_inputs(gmb_properties, info):
+                new_ids.append(plan["gmb_id"])
+
+        self.report({'INFO'}, f"Added {len(plans)} '{self.generator}' strip(s), {len(new_ids)} with all required inputs linked.")
+        if self.generate and new_ids:
+            # Reuse the batch operator, so generators with a 'batch' block run once for many strips
+            new_id_set = set(new_ids)
+            for strip in scene.sequence_editor.sequences_all:
+                strip.select = strip.get("gmb_id") in new_id_set
+            bpy.ops.gmb.generate_batch()
+        return {'FINISHED'}
+
 class GMB_OT_cancel_generation(Operator):
     """Request cancellation of the running generative script."""
     bl_idname = "gmb.cancel_generation"
@@ -206,7 +381,7 @@ class GMB_OT_cancel_generation(Operator):
             self.report({'ERROR'}, f"Could not find GMB properties for strip ID: {self.strip_id}")
             return {'CANCELLED'}
         
-        if gmb_props.status != 'RUNNING':
+        if gmb_props.status not in {'RUNNING', 'QUEUED'}:
             self.report({'WARNING'}, "Process is not running.")
             return {'CANCELLED'}
             
@@ -214,6 +389,23 @@ class GMB_OT_cancel_generation(Operator):
         self.report({'INFO'}, "Cancellation requested.")
         return {'FINISHED'}
 
+# Placeholders provided by the bridge itself, see GMB_OT_generate_media._get_frame_placeholders
+BUILTIN_PLACEHOLDERS = {'frame_start', 'frame_end', 'fps'}
+# Path a generator can write intermediate previews to, see GMB_OT_generate_media._show_new_preview
+PREVIEW_PLACEHOLDER = 'preview'
+PREVIEW_OUTPUT_TYPES = ('image', 'movie', 'text')
+# Lines a batch generator prints on stdout when it is done with a manifest entry, e.g. "GMB_DONE <id>"
+BATCH_MARKER = re.compile(r'^GMB_(DONE|FAILED)\s+(\S+)\s*(.*)$')
+
+
+def _reap_terminations():
+    """Timer that escalates cancelled jobs to SIGKILL after their grace period."""
+    from . import executors
+    for message in executors.reap_terminations():
+        print(f"GMB: {message}")
+    return 0.2 if executors.has_pending_terminations() else None
+
+
 class GMB_OT_generate_media(Operator):
     """Run the generative script for the active GMB strip."""
     bl_idname = "gmb.generate_media"
@@ -222,11 +414,31 @@ class GMB_OT_generate_media(Operator):
 
     TIMER_INTERVAL = 0.1
     LOG_HISTORY_LENGTH = 3
+    RESOURCE_SAMPLE_INTERVAL = 1.0
+    FRAME_SCAN_INTERVAL = 0.5
+    PREVIEW_INTERVAL = 1.0
+    PREVIEW_SETTLE_TIME = 0.3
 
     strip_id: StringProperty(
         name="Strip ID",
         description="The GMB ID of the strip to run the script for."
     )
+    background: BoolProperty(
+        name="Background",
+        description="Run without capturing UI events (cancel only through the sidebar)",
+        default=False,
+        options={'HIDDEN', 'SKIP_SAVE'}
+    )
+    attach_job_id: StringProperty(
+        name="Attach Job",
+        description="Supervise an already running detached job instead of starting a new run",
+        options={'HIDDEN', 'SKIP_SAVE'}
+    )
+    batch_strip_ids: StringProperty(
+        name="Batch Strips",
+        description="Comma-separated GMB IDs of the strips to generate in one batch run, including this one",
+        options={'HIDDEN', 'SKIP_SAVE'}
+    )
 
     _timer = None
     _process = None
@@ -244,6 +456,32 @@ class GMB_OT_generate_media(Operator):
     _temp_files = None
     _output_temp_files = None
     _parsed_gen_config = None
+    _command_list = None
+    _quality = 'FINAL'
+    _work_dir = None
+    _spool_job_id = None
+    _detached_job_id = None
+    _input_files = None
+    _resource_demands = None
+    _spool_python_script = False
+    _monitor = None
+    _next_sample_at = 0.0
+    _run_started = False
+    _end_reason = None
+    _progressive_sequence = False
+    _sequence_frames_shown = 0
+    _next_frame_scan_at = 0.0
+    _preview_source = None
+    _preview_path = None
+    _preview_mtime = None
+    _next_preview_check_at = 0.0
+    _batch_items = None
+    _post_process_results_path = None
+    _post_process_stages = None
+    _finished_job = None
+    _command_exit_code = None
+    _trim_cuts = None
+    _cutting_inputs = False
 
     @classmethod
     def poll(cls, context):
@@ -260,9 +498,24 @@ class GMB_OT_generate_media(Operator):
             context.window_manager.event_timer_remove(self._timer)
             self._timer = None
         if self._process:
-            if self._process.poll() is None: # If the process is still running
-                self._process.kill()
+            # Stops the command and anything it spawned (SIGTERM, then SIGKILL after the grace period)
+            from . import executors
+            executors.terminate_process(
+                self._process,
+                get_prefs(context).termination_grace_period,
+                label=f"GMB job for strip {self.strip_id}"
+            )
+            if executors.has_pending_terminations() and not bpy.app.timers.is_registered(_reap_terminations):
+                bpy.app.timers.register(_reap_terminations, first_interval=0.2, persistent=True)
+            if self._run_started and self._strip_props:
+                self._write_run_record()
+            # Spool jobs also leave files in the shared spool directory
+            if hasattr(self._process, "discard"):
+                self._process.discard()
             self._process = None
+        if self._finished_job:
+            self._finished_job.discard()
+            self._finished_job = None
         
         # Close file handles if open
         for fp in (self._stdout_read_fp, self._stderr_read_fp, self._stdout_write_fp, self._stderr_write_fp):
@@ -294,24 +547,79 @@ class GMB_OT_generate_media(Operator):
         if self._temp_files:
             for temp_file in self._temp_files:
                 try:
-                    if os.path.exists(temp_file):
+                    if os.path.isdir(temp_file):
+                        shutil.rmtree(temp_file) # Frames of an image sequence
+                    elif os.path.exists(temp_file):
                         os.remove(temp_file)
                 except OSError as e:
                     print(f"Error removing temporary file {temp_file}: {e}")
             self._temp_files = None
         
+        if self._batch_items and self._strip_props:
+            self._cleanup_batch_members(context)
+        self._batch_items = None
+
         self._output_temp_files = None
         self._parsed_gen_config = None
+        self._command_list = None
+        self._input_files = None
+        self._spool_job_id = None
+        self._detached_job_id = None
+        self._resource_demands = None
+        self._spool_python_script = False
+        self._monitor = None
+        self._run_started = False
+        self._end_reason = None
+        self._progressive_sequence = False
+        self._sequence_frames_shown = 0
+        self._preview_source = None
+        self._preview_path = None
+        self._preview_mtime = None
+        self._post_process_results_path = None
+        self._post_process_stages = None
+        self._command_exit_code = None
+        self._trim_cuts = None
+        self._cutting_inputs = False
         
-        # Clear legacy thread/queue state (no longer used)
+        # Give up our scheduler slot (or queue position)
+        from . import scheduler
+        scheduler.release_slot(self.strip_id)
         
         if self._strip_props:
             if self._strip_props.status == 'RUNNING':
                 self._strip_props.status = 'ERROR' # Assume error if cleaned up while running
+            elif self._strip_props.status == 'QUEUED':
+                self._strip_props.status = 'READY' # Cancelled before it started
             self._strip_props.runtime_seconds = 0.0 # Reset timer
             self._strip_props.cancel_requested = False # Reset flag
             self._strip_props = None
-        context.area.tag_redraw()
+        if context.area:
+            context.area.tag_redraw()
+
+    def cancel(self, context: bpy.types.Context):
+        """Called by Blender when the file is closed or Blender quits during a run."""
+        # The strip data may already be freed, so leave it untouched
+        self._strip_props = None
+        if self._detached_job_id:
+            # Let the job keep running; it is reattached when the project is opened again
+            print(f"GMB: Detached job {self._detached_job_id} keeps running in the background")
+            if self._finished_job:
+                # Interrupted while post-processing: stop the local stage but keep the job's
+                # state and outputs, so reattaching runs the stage again
+                from . import executors
+                executors.terminate_process(
+                    self._process,
+                    get_prefs(context).termination_grace_period,
+                    label=f"GMB post-processing for strip {self.strip_id}"
+                )
+                if executors.has_pending_terminations() and not bpy.app.timers.is_registered(_reap_terminations):
+                    bpy.app.timers.register(_reap_terminations, first_interval=0.2, persistent=True)
+                self._finished_job = None
+            self._process = None
+            self._temp_files = None
+            self._stdout_path = None
+            self._stderr_path = None
+        self._cleanup(context)
 
     def invoke(self, context: bpy.types.Context, event: bpy.types.Event):
         """Start the script and enter the modal loop."""
@@ -320,7 +628,7 @@ class GMB_OT_generate_media(Operator):
             self.report({'ERROR'}, f"Could not find GMB properties for strip ID: {self.strip_id}")
             return {'CANCELLED'}
         
-        if self._strip_props.status == 'RUNNING':
+        if self._strip_props.status in {'RUNNING', 'QUEUED'} and not self.attach_job_id:
             self.report({'WARNING'}, "Script is already running for this strip.")
             return {'CANCELLED'}
 
@@ -335,6 +643,10 @@ class GMB_OT_generate_media(Operator):
             self._strip_props.status = 'ERROR'
             return {'CANCELLED'}
 
+        # Loaded on first use to keep addon startup light
+        parse_yaml_config = get_yaml_parser().parse_yaml_config
+        from . import scheduler
+
         try:
             with open(gmb_generator_config.config_filepath, 'r') as f:
                 yaml_string = f.read()
@@ -347,92 +659,550 @@ class GMB_OT_generate_media(Operator):
             self._cleanup(context)
             return {'CANCELLED'}
 
-        # --- Build Command ---
+        if self.attach_job_id:
+            return self._attach_detached_job(context)
+
+        if self.batch_strip_ids and not self._parsed_gen_config.command.batch:
+            self.report({'ERROR'}, f"Generator '{self._parsed_gen_config.name}' has no 'batch' block.")
+            self._cleanup(context)
+            return {'CANCELLED'}
+
+        # Draft quality only applies if the generator defines a 'draft' block
+        self._quality = self._strip_props.quality if self._parsed_gen_config.command.draft else 'FINAL'
+
+        # --- Choose where the job's files live ---
+        # Spool jobs may run on another node, so their files go in the shared spool directory.
+        prefs = get_prefs(context)
+        self._spool_job_id = None
+        self._work_dir = tempfile.gettempdir()
+        if prefs.executor == 'SPOOL':
+            from . import executors
+            if not prefs.spool_directory:
+                self.report({'ERROR'}, "No spool directory set in the addon preferences.")
+                self._strip_props.status = 'ERROR'
+                self._cleanup(context)
+                return {'CANCELLED'}
+            self._spool_job_id = uuid.uuid4().hex
+            try:
+                self._work_dir = executors.get_spool_job_dir(bpy.path.abspath(prefs.spool_directory), self._spool_job_id)
+            except OSError as e:
+                self.report({'ERROR'}, f"Could not use spool directory: {e}")
+                self._strip_props.status = 'ERROR'
+                self._cleanup(context)
+                return {'CANCELLED'}
+        elif prefs.detach_jobs:
+            from . import executors
+            if not bpy.data.is_saved:
+                self.report({'ERROR'}, "Save the project before running detached jobs.")
+                self._strip_props.status = 'ERROR'
+                self._cleanup(context)
+                return {'CANCELLED'}
+            self._detached_job_id = uuid.uuid4().hex
+            try:
+                self._work_dir = executors.get_detached_job_dir(get_detached_jobs_dir(), self._detached_job_id)
+            except OSError as e:
+                self.report({'ERROR'}, f"Could not create the job directory: {e}")
+                self._strip_props.status = 'ERROR'
+                self._cleanup(context)
+                return {'CANCELLED'}
+
+        # A job that needs more than a pool's total capacity would wait forever
+        capacities = self._get_resource_capacities(context)
+        unsatisfiable = scheduler.get_unsatisfiable_resources(self._parsed_gen_config.resources, capacities)
+        if unsatisfiable:
+            details = ", ".join(f"{name} ({self._parsed_gen_config.resources[name]:g} > {capacities[name]:g})" for name in unsatisfiable)
+            self.report({'ERROR'}, f"Generator needs more than the configured resource pools provide: {details}")
+            self._strip_props.status = 'ERROR'
+            self._cleanup(context)
+            return {'CANCELLED'}
+
         self._temp_files = []
+        self._strip_props.log_history.clear() # Clear log on new run
+
+        # Trimmed inputs are cut on background threads; the command is built once they are ready
+        self._trim_cuts = {}
+        self._prepare_trimmed_inputs(context)
+        pending_cuts = sum(not future.done() for future in self._trim_cuts.values())
+        if pending_cuts:
+            self._cutting_inputs = True
+            self._strip_props.status = 'QUEUED'
+            self._add_log_line(f"Cutting {pending_cuts} trimmed input(s)...")
+            print(f"Cutting trimmed inputs for strip '{self._strip_props.generator_name}' before it starts")
+        elif not self._build_and_start(context):
+            return {'CANCELLED'}
+        
+        # Add a timer to check the process status periodically
+        self._timer = context.window_manager.event_timer_add(self.TIMER_INTERVAL, window=context.window)
+        context.window_manager.modal_handler_add(self)
+        
+        context.area.tag_redraw()
+        return {'RUNNING_MODAL'}
+
+    def _build_and_start(self, context: bpy.types.Context):
+        """
+        Builds the command, then starts it if the scheduler has a free slot or queues it.
+        Returns False (after cleaning up) if the run can't go ahead.
+        """
+        # --- Build Command ---
         self._output_temp_files = {}
+        self._input_files = []
+        self._resource_demands = dict(self._parsed_gen_config.resources)
+        self._progressive_sequence = (not self._spool_job_id and not self.batch_strip_ids
+                                      and self._has_progressive_sequence(self._parsed_gen_config))
+        self._sequence_frames_shown = 0
+        self._next_frame_scan_at = 0.0
+        self._preview_source = None
+        self._preview_path = None
+        self._preview_mtime = None
+        self._next_preview_check_at = 0.0
         try:
-            command_list = self._build_command(self._parsed_gen_config)
-        except ValueError as e:
+            if self.batch_strip_ids:
+                self._command_list = self._build_batch_command(context, self._parsed_gen_config)
+            elif self._parsed_gen_config.command.chunking:
+                self._command_list = self._build_chunked_command(context, self._parsed_gen_config)
+            else:
+                self._command_list = self._build_command(self._parsed_gen_config)
+        except (ValueError, OSError) as e:
             self.report({'ERROR'}, f"Failed to build command: {e}")
             print(f"Failed to build command: {e}")
             self._strip_props.status = 'ERROR'
             self._cleanup(context)
-            return {'CANCELLED'}
-        
+            return False
+
+        # Apply the generator's rlimits; spool workers apply them on their own host
+        command_config = self._parsed_gen_config.command
+        if not self._spool_job_id and (command_config.max_memory_mb or command_config.nice):
+            from . import executors
+            self._command_list = executors.limit_command(self._command_list, command_config.max_memory_mb, command_config.nice)
+
+        self._strip_props.process_uuid = uuid.uuid4().hex
+        self._strip_props.runtime_seconds = 0.0 # Reset timer
+        self._strip_props.queue_seconds = 0.0
+        self._reset_resource_usage()
+        self._strip_props.cancel_requested = False # Ensure flag is reset
+
+        # Start now if the scheduler has a free slot, otherwise wait in the modal loop.
+        # Spool jobs don't use local resources, the farm's workers do their own admission.
+        if self._spool_job_id or self._request_slot(context):
+            if not self._start_process(context):
+                self._cleanup(context)
+                return False
+        else:
+            self._strip_props.status = 'QUEUED'
+            print(f"Queued generative script for strip '{self._strip_props.generator_name}'")
+        if self._batch_items:
+            self._start_batch_members(context)
+        return True
+
+    def _get_resource_capacities(self, context: bpy.types.Context):
+        """The resource pools from the addon preferences, as a name -> capacity dict."""
+        return {pool.name: pool.capacity for pool in get_prefs(context).resource_pools if pool.name}
+
+    def _request_slot(self, context: bpy.types.Context):
+        """Ask the scheduler to admit this run. Returns True once it may start."""
+        from . import scheduler
+
+        admitted = scheduler.request_slot(
+            self.strip_id,
+            get_prefs(context).max_concurrent_jobs,
+            self._resource_demands,
+            self._get_resource_capacities(context)
+        )
+        self._strip_props.queue_seconds = scheduler.get_wait_seconds(self.strip_id)
+        return admitted
+
+    def _start_process(self, context: bpy.types.Context):
+        """Open the log files and launch the built command. Returns False on failure."""
+        from . import executors
+
+        command_list = self._command_list
+        if self._spool_job_id:
+            return self._submit_spool_job(context)
+        if self._detached_job_id:
+            return self._start_detached_job(context)
+
         try:
-            # Prepare temp files for stdout/stderr and tail them in the modal timer
-            self._stdout_path = os.path.join(tempfile.gettempdir(), f"gmb_{uuid.uuid4().hex}_stdout.log")
-            self._stderr_path = os.path.join(tempfile.gettempdir(), f"gmb_{uuid.uuid4().hex}_stderr.log")
-            self._stdout_write_fp = open(self._stdout_path, 'w', encoding='utf-8')
-            self._stderr_write_fp = open(self._stderr_path, 'w', encoding='utf-8')
-            self._stdout_read_fp = open(self._stdout_path, 'r', encoding='utf-8')
-            self._stderr_read_fp = open(self._stderr_path, 'r', encoding='utf-8')
-            self._stdout_pos = 0
-            self._stderr_pos = 0
-            self._stdout_buf = ""
-            self._stderr_buf = ""
+            self._open_local_logs()
 
             # Launch process writing to files; no threads/queues
-            self._process = subprocess.Popen(
+            self._process = executors.start_local_process(
                 command_list,
-                stdout=self._stdout_write_fp,
-                stderr=self._stderr_write_fp,
-                shell=False
+                self._stdout_write_fp,
+                self._stderr_write_fp
             )
-        except (OSError, subprocess.SubprocessError) as err:
+        except OSError as err:
             self.report({'ERROR'}, f"Failed to start script: {err}")
             print(f"Failed to start script: {command_list}, Error: {err}")
             self._strip_props.status = 'ERROR'
+            return False
+
+        self._monitor = executors.ResourceMonitor(self._process.pid)
+        self._run_started = True
+        self._strip_props.status = 'RUNNING'
+        print(f"Started generative script for strip '{self._strip_props.generator_name}'")
+        return True
+
+    def _open_local_logs(self):
+        """Prepare temp files for stdout/stderr of a local process and tail them in the modal timer."""
+        self._stdout_path = os.path.join(tempfile.gettempdir(), f"gmb_{uuid.uuid4().hex}_stdout.log")
+        self._stderr_path = os.path.join(tempfile.gettempdir(), f"gmb_{uuid.uuid4().hex}_stderr.log")
+        self._stdout_write_fp = open(self._stdout_path, 'w', encoding='utf-8')
+        self._stderr_write_fp = open(self._stderr_path, 'w', encoding='utf-8')
+        self._stdout_read_fp = open(self._stdout_path, 'r', encoding='utf-8')
+        self._stderr_read_fp = open(self._stderr_path, 'r', encoding='utf-8')
+        self._stdout_pos = 0
+        self._stderr_pos = 0
+        self._stdout_buf = ""
+        self._stderr_buf = ""
+
+    def _start_post_processing(self, context: bpy.types.Context):
+        """
+        Starts post_processor.py on the outputs that have 'post-process' steps, in place of the finished command.
+        The steps run in a local process pool while the modal timer keeps polling, so ingest waits
+        for them without blocking Blender. Returns False if no output needs post-processing.
+        Raises OSError if the stage can't be started.
+        """
+        from . import executors
+
+        ffmpeg = get_ffmpeg_executable(context)
+        outputs = {}
+        for output_def in self._parsed_gen_config.properties.output:
+            input_path = self._output_temp_files.get(output_def.name)
+            if not output_def.post_process or not input_path or not os.path.exists(input_path):
+                continue
+            steps = []
+            file_ext = output_def.file_ext or '.tmp'
+            for step in output_def.post_process:
+                file_ext = step.file_ext or file_ext
+                output_path = os.path.join(self._work_dir, f"{uuid.uuid4()}{file_ext}")
+                self._temp_files.append(output_path)
+                arguments = [arg.replace("{input}", input_path).replace("{output}", output_path)
+                             for arg in shlex.split(step.arguments)]
+                steps.append({
+                    "name": step.name,
+                    "command": [step.program.replace("{ffmpeg}", ffmpeg)] + arguments,
+                    "output": output_path,
+                })
+                input_path = output_path
+            outputs[output_def.name] = {"steps": steps}
+        if not outputs:
+            return False
+
+        plan_path = os.path.join(self._work_dir, f"gmb_post_{uuid.uuid4().hex}.json")
+        results_path = os.path.join(self._work_dir, f"gmb_post_{uuid.uuid4().hex}_results.json")
+        with open(plan_path, 'w', encoding='utf-8') as f:
+            json.dump({"outputs": outputs, "max_parallel": os.cpu_count() or 1, "results": results_path}, f, indent=2)
+        self._temp_files.extend([plan_path, results_path])
+
+        # The run record and the strip keep the generator's exit code and runtime
+        self._command_exit_code = self._process.returncode
+        # Spool and detached jobs keep their directory (holding the outputs) until cleanup
+        if hasattr(self._process, "discard"):
+            self._finished_job = self._process
+        if self._stdout_write_fp is None:
+            for fp in (self._stdout_read_fp, self._stderr_read_fp):
+                if fp:
+                    fp.close()
+            self._open_local_logs()
+
+        runner_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "post_processor.py")
+        self._process = executors.start_local_process(
+            [sys.executable, runner_path, plan_path],
+            self._stdout_write_fp,
+            self._stderr_write_fp
+        )
+        self._post_process_results_path = results_path
+        self._add_log_line(f"Post-processing {len(outputs)} output(s)")
+        print(f"Started post-processing for strip '{self._strip_props.generator_name}'")
+        return True
+
+    def _apply_post_process_results(self):
+        """Points the outputs at their post-processed files and logs what each step cost."""
+        try:
+            with open(self._post_process_results_path, 'r', encoding='utf-8') as f:
+                results = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"GMB Post-process: Could not read results: {e}")
+            return
+        self._output_temp_files.update(results["outputs"])
+        self._post_process_stages = results["stages"]
+        for stage in self._post_process_stages:
+            cpu = f", {stage['cpu_seconds']:.1f}s CPU" if stage["cpu_seconds"] is not None else ""
+            self._add_log_line(f"Post-process '{stage['step']}' on '{stage['output']}' took {stage['seconds']:.1f}s{cpu}")
+
+    def _get_output_file_ext(self, output_def):
+        """The extension of an output's ingested file, which post-process steps may have changed."""
+        if self._post_process_results_path:
+            return output_def.get_final_file_ext()
+        return output_def.file_ext
+
+    def _submit_spool_job(self, context: bpy.types.Context):
+        """Write the job manifest to the spool directory and tail the worker's logs."""
+        from . import executors
+
+        spool_dir = bpy.path.abspath(get_prefs(context).spool_directory)
+        try:
+            self._process = executors.submit_spool_job(
+                spool_dir,
+                self._spool_job_id,
+                self._command_list,
+                self._input_files,
+                self._output_temp_files,
+                get_prefs(context).termination_grace_period,
+                {
+                    "max_memory_mb": self._parsed_gen_config.command.max_memory_mb,
+                    "nice": self._parsed_gen_config.command.nice,
+                },
+                python_script=self._spool_python_script
+            )
+            self._open_job_logs()
+        except OSError as err:
+            self.report({'ERROR'}, f"Failed to submit job to spool directory: {err}")
+            self._strip_props.status = 'ERROR'
+            return False
+
+        self._run_started = True
+        # Status is 'RUNNING' while the job waits for a worker, but that time counts as queue time
+        # until a worker claims it (and logs that it picked it up); see modal.
+        self._strip_props.status = 'RUNNING'
+        print(f"Submitted spool job {self._spool_job_id} for strip '{self._strip_props.generator_name}'")
+        return True
+
+    def _reset_resource_usage(self):
+        self._strip_props.peak_memory_mb = 0.0
+        self._strip_props.cpu_seconds = 0.0
+        self._strip_props.io_read_mb = 0.0
+        self._strip_props.io_write_mb = 0.0
+        self._next_sample_at = 0.0
+
+    def _sample_resource_usage(self):
+        """Sample the job's process tree about once a second and show the figures on the strip."""
+        now = time.monotonic()
+        if now < self._next_sample_at:
+            return
+        self._next_sample_at = now + self.RESOURCE_SAMPLE_INTERVAL
+
+        if self._post_process_results_path:
+            # The figures are the generator's; post-processing costs are recorded per step
+            return
+
+        if self._monitor is None:
+            # Detached jobs only know their pid once the supervisor has started the command.
+            # Spool jobs run on another host and aren't sampled.
+            if not self._detached_job_id or not self._process.pid:
+                return
+            from . import executors
+            self._monitor = executors.ResourceMonitor(self._process.pid)
+
+        self._monitor.sample()
+        self._strip_props.peak_memory_mb = self._monitor.peak_rss_bytes / (1024 * 1024)
+        self._strip_props.cpu_seconds = self._monitor.cpu_seconds
+        self._strip_props.io_read_mb = self._monitor.read_bytes / (1024 * 1024)
+        self._strip_props.io_write_mb = self._monitor.write_bytes / (1024 * 1024)
+
+    def _write_run_record(self):
+        """Append this run's outcome and resource usage to the project's run log."""
+        if self._spool_job_id:
+            executor = 'SPOOL'
+        elif self._detached_job_id:
+            executor = 'DETACHED'
+        else:
+            executor = 'LOCAL'
+        command_config = self._parsed_gen_config.command if self._parsed_gen_config else None
+        outcome = self._end_reason or self._strip_props.status
+        if outcome == 'RUNNING':
+            outcome = 'ERROR' # Cleaned up while running
+        append_run_record({
+            "finished_at": time.time(),
+            "strip_id": self.strip_id,
+            "process_uuid": self._strip_props.process_uuid,
+            "generator": self._strip_props.generator_name,
+            "quality": self._quality,
+            "executor": executor,
+            "outcome": outcome,
+            "exit_code": self._command_exit_code if self._command_exit_code is not None else self._process.returncode,
+            "queue_seconds": round(self._strip_props.queue_seconds, 3),
+            "runtime_seconds": round(self._strip_props.runtime_seconds, 3),
+            "peak_memory_mb": round(self._strip_props.peak_memory_mb, 1),
+            "cpu_seconds": round(self._strip_props.cpu_seconds, 2),
+            "io_read_mb": round(self._strip_props.io_read_mb, 2),
+            "io_write_mb": round(self._strip_props.io_write_mb, 2),
+            "batch_size": len(self._batch_items) if self._batch_items else None,
+            "post_process": self._post_process_stages,
+            "max_memory_mb": command_config.max_memory_mb if command_config else None,
+            "nice": command_config.nice if command_config else None,
+        })
+
+    def _open_job_logs(self):
+        """Start tailing the log files of a job handle that writes its own logs."""
+        self._stdout_path = self._process.stdout_path
+        self._stderr_path = self._process.stderr_path
+        self._stdout_read_fp = open(self._stdout_path, 'r', encoding='utf-8')
+        self._stderr_read_fp = open(self._stderr_path, 'r', encoding='utf-8')
+        self._stdout_pos = 0
+        self._stderr_pos = 0
+        self._stdout_buf = ""
+        self._stderr_buf = ""
+
+    def _start_detached_job(self, context: bpy.types.Context):
+        """Launch the command under the job supervisor so it survives Blender closing."""
+        from . import executors
+
+        try:
+            self._process = executors.start_detached_job(
+                get_detached_jobs_dir(),
+                self._detached_job_id,
+                self._command_list,
+                self._output_temp_files,
+                {
+                    "strip_id": self.strip_id,
+                    "process_uuid": self._strip_props.process_uuid,
+                    "generator_name": self._strip_props.generator_name,
+                    "quality": self._quality,
+                    "grace_period": get_prefs(context).termination_grace_period,
+                    "batch": {strip_id: item["outputs"] for strip_id, item in (self._batch_items or {}).items()},
+                }
+            )
+            self._open_job_logs()
+        except OSError as err:
+            self.report({'ERROR'}, f"Failed to start detached job: {err}")
+            self._strip_props.status = 'ERROR'
+            return False
+
+        self._run_started = True
+        self._strip_props.status = 'RUNNING'
+        print(f"Started detached job {self._detached_job_id} for strip '{self._strip_props.generator_name}'")
+        return True
+
+    def _attach_detached_job(self, context: bpy.types.Context):
+        """Resume supervising a detached job started in an earlier session."""
+        from . import executors
+        from . import scheduler
+
+        self._process = executors.DetachedJob(get_detached_jobs_dir(), self.attach_job_id)
+        state = self._process.read_state()
+        if state is None:
+            self.report({'ERROR'}, f"Could not read the state of detached job {self.attach_job_id}")
+            self._process = None
+            self._strip_props.status = 'ERROR'
+            self._cleanup(context)
             return {'CANCELLED'}
 
+        self._detached_job_id = self.attach_job_id
+        self._quality = state.get("quality", 'FINAL')
+        self._output_temp_files = dict(state.get("outputs", {}))
+        self._temp_files = []
+        self._batch_items = {
+            strip_id: {"outputs": outputs, "status": 'RUNNING'} for strip_id, outputs in state.get("batch", {}).items()
+        } or None
+        self._progressive_sequence = not self._batch_items and self._has_progressive_sequence(self._parsed_gen_config)
+        self._sequence_frames_shown = 0
+        self._next_frame_scan_at = 0.0
+        # Detached jobs never run on the spool, so their previews are written straight to the strip's preview file
+        self._preview_source = self._preview_path = None if self._batch_items else self._find_preview_path()
+        self._preview_mtime = None
+        self._next_preview_check_at = 0.0
+        try:
+            self._open_job_logs()
+        except OSError as err:
+            self.report({'ERROR'}, f"Could not open the logs of detached job {self.attach_job_id}: {err}")
+            self._process = None # Leave the job running
+            self._strip_props.status = 'ERROR'
+            self._cleanup(context)
+            return {'CANCELLED'}
+
+        # The job is already running, so it takes its resources without queueing
+        scheduler.claim_slot(self.strip_id, self._parsed_gen_config.resources)
+        self._strip_props.process_uuid = state.get("process_uuid", self._strip_props.process_uuid)
+        # A job that finished while Blender was closed ran until its exit code was recorded
+        started_at = state.get("started_at", state.get("submitted_at", time.time()))
+        self._strip_props.runtime_seconds = state.get("finished_at", time.time()) - started_at
+        self._strip_props.cancel_requested = False
+        self._reset_resource_usage()
+        self._run_started = True
         self._strip_props.status = 'RUNNING'
-        self._strip_props.process_uuid = uuid.uuid4().hex
-        self._strip_props.runtime_seconds = 0.0 # Reset timer
-        self._strip_props.log_history.clear() # Clear log on new run
-        self._strip_props.cancel_requested = False # Ensure flag is reset
-        
-        # Add a timer to check the process status periodically
+        if self._batch_items:
+            self._start_batch_members(context)
+        print(f"Reattached to detached job {self.attach_job_id} for strip '{self._strip_props.generator_name}'")
+
         self._timer = context.window_manager.event_timer_add(self.TIMER_INTERVAL, window=context.window)
         context.window_manager.modal_handler_add(self)
-        
         context.area.tag_redraw()
-        print(f"Started generative script for strip '{self._strip_props.generator_name}'")
         return {'RUNNING_MODAL'}
 
+    @profiled("GMB_OT_generate_media.modal")
     def modal(self, context: bpy.types.Context, event: bpy.types.Event):
         """The modal loop for checking the process."""
-        if event.type in {'RIGHTMOUSE', 'ESC'} or (self._strip_props and self._strip_props.cancel_requested):
+        # Background runs leave UI events to the rest of Blender
+        idle_result = {'PASS_THROUGH'} if self.background else {'RUNNING_MODAL'}
+        user_cancelled = not self.background and event.type in {'RIGHTMOUSE', 'ESC'}
+        if user_cancelled or (self._strip_props and self._strip_props.cancel_requested):
             self.report({'INFO'}, "Cancelled script execution.")
+            self._end_reason = 'CANCELLED'
             self._cleanup(context)
             return {'CANCELLED'}
 
         if event.type == 'TIMER':
+            # --- Wait for trimmed inputs to be cut ---
+            if self._cutting_inputs:
+                if not all(future.done() for future in self._trim_cuts.values()):
+                    return idle_result
+                self._cutting_inputs = False
+                if not self._build_and_start(context):
+                    return {'CANCELLED'}
+                context.area.tag_redraw()
+            # --- Wait for a scheduler slot ---
+            elif self._strip_props.status == 'QUEUED':
+                if not self._request_slot(context):
+                    context.area.tag_redraw() # Update the queue time
+                    return idle_result
+                if not self._start_process(context):
+                    self._cleanup(context)
+                    return {'CANCELLED'}
+                if self._batch_items:
+                    self._set_batch_members_status(context, 'RUNNING')
+                print(f"Strip '{self._strip_props.generator_name}' waited {self._strip_props.queue_seconds:.1f}s in the queue")
+                context.area.tag_redraw()
+
             # --- Update runtime and check for timeout ---
+            if self._batch_items:
+                self._update_batch_members(context)
+
             if self._strip_props.status == 'RUNNING':
-                self._strip_props.runtime_seconds += self.TIMER_INTERVAL
                 context.area.tag_redraw() # Force UI update for timer text
-
-                # Get timeout value. Priority: YAML > Addon Prefs. 0 means no timeout.
-                prefs = get_prefs(context)
-                timeout_val = self._parsed_gen_config.command.timeout
-                if timeout_val is None:
-                    timeout_val = prefs.global_timeout
-                
-                if timeout_val and timeout_val > 0 and self._strip_props.runtime_seconds > timeout_val:
-                    self.report({'ERROR'}, f"Process timed out after {timeout_val} seconds.")
-                    self._cleanup(context)
-                    return {'FINISHED'}
-
-            def add_to_log(log_line):
-                if not log_line:
-                    return
-                new_entry = self._strip_props.log_history.add()
-                new_entry.line = log_line
-                # Trim the log history
-                while len(self._strip_props.log_history) > self.LOG_HISTORY_LENGTH:
-                    self._strip_props.log_history.remove(0)
-
-            def read_new(fp, pos, buf, prefix=None):
+                self._sample_resource_usage()
+
+                # A job that has already exited (e.g. a reattached detached job that finished
+                # while Blender was closed) is ingested below and never times out.
+                # Post-processing isn't part of the command's runtime or timeout either.
+                running = not self._post_process_results_path and self._process.poll() is None
+                if running and self._spool_job_id and not self._process.is_claimed():
+                    # Waiting in the spool for a free worker isn't runtime
+                    self._strip_props.queue_seconds += self.TIMER_INTERVAL
+                elif running:
+                    self._strip_props.runtime_seconds += self.TIMER_INTERVAL
+
+                    # Get timeout value. Priority: YAML > Addon Prefs. 0 means no timeout.
+                    prefs = get_prefs(context)
+                    timeout_val = self._parsed_gen_config.command.timeout
+                    if timeout_val is None:
+                        timeout_val = prefs.global_timeout
+                    # The timeout is per strip, so a batch run gets it once for every strip it generates
+                    if self._batch_items:
+                        timeout_val *= len(self._batch_items)
+
+                    if timeout_val and timeout_val > 0 and self._strip_props.runtime_seconds > timeout_val:
+                        self.report({'ERROR'}, f"Process timed out after {timeout_val} seconds.")
+                        self._end_reason = 'TIMEOUT'
+                        self._cleanup(context)
+                        return {'FINISHED'}
+
+                if self._progressive_sequence:
+                    self._show_new_frames()
+                if self._preview_source:
+                    self._show_new_preview()
+
+            def read_new(fp, pos, buf, prefix=None, on_line=None):
                 if not fp:
                     return pos, buf
                 try:
@@ -456,20 +1226,43 @@ class GMB_OT_generate_media(Operator):
                             print(f"{prefix} {stripped}")
                         else:
                             print(f"GMB Log: {stripped}")
-                        add_to_log(stripped)
+                        self._add_log_line(stripped)
+                        if on_line:
+                            on_line(stripped)
                 return pos, buf
 
             # Tail stdout and stderr files
-            self._stdout_pos, self._stdout_buf = read_new(self._stdout_read_fp, self._stdout_pos, self._stdout_buf)
+            on_stdout_line = (lambda line: self._handle_batch_marker(context, line)) if self._batch_items else None
+            self._stdout_pos, self._stdout_buf = read_new(self._stdout_read_fp, self._stdout_pos, self._stdout_buf, on_line=on_stdout_line)
             self._stderr_pos, self._stderr_buf = read_new(self._stderr_read_fp, self._stderr_pos, self._stderr_buf, prefix="GMB-STDERR:")
             
             # --- Check if the process has finished ---
             if self._process.poll() is not None:
                 return_code = self._process.wait()
-                if return_code == 0:
+                if return_code == 0 and not self._batch_items and not self._post_process_results_path:
+                    # Outputs with 'post-process' steps are processed before ingest, still polled by this timer
+                    try:
+                        if self._start_post_processing(context):
+                            return idle_result
+                    except OSError as e:
+                        self.report({'ERROR'}, f"Could not start post-processing: {e}")
+                        self._strip_props.status = 'ERROR'
+                        self._cleanup(context)
+                        return {'FINISHED'}
+                if self._post_process_results_path:
+                    self._apply_post_process_results()
+
+                if self._batch_items:
+                    self._complete_batch(context, return_code)
+                elif return_code == 0:
                     self.report({'INFO'}, f"Script finished successfully.")
                     self._strip_props.status = 'FINISHED'
                     self._populate_outputs(context)
+                    self._strip_props.output_quality = self._quality
+                    self._remove_preview()
+                elif self._post_process_results_path:
+                    self.report({'ERROR'}, f"Post-processing failed with exit code {return_code}. See log for details.")
+                    self._strip_props.status = 'ERROR'
                 else:
                     error_summary = f"Script failed with exit code {return_code}. See log for details."
                     self.report({'ERROR'}, error_summary)
@@ -478,13 +1271,307 @@ class GMB_OT_generate_media(Operator):
                 self._cleanup(context)
                 return {'FINISHED'}
 
-        return {'RUNNING_MODAL'}
+        return idle_result
+
+    def _add_log_line(self, log_line):
+        if not log_line:
+            return
+        new_entry = self._strip_props.log_history.add()
+        new_entry.line = log_line
+        # Trim the log history
+        while len(self._strip_props.log_history) > self.LOG_HISTORY_LENGTH:
+            self._strip_props.log_history.remove(0)
+
+    def _get_frame_placeholders(self, frame_range=None):
+        """
+        Values of the built-in {frame_start}, {frame_end} and {fps} placeholders.
+        Frames are 0-based and inclusive, relative to the start of the controller strip.
+        """
+        scene = bpy.context.scene
+        if frame_range is None:
+            strip = get_strip_by_uuid(self.strip_id)
+            if not strip:
+                raise ValueError(f"Could not find strip with ID {self.strip_id} for its frame range.")
+            frame_range = (0, strip.frame_final_duration - 1)
+        return {
+            'frame_start': frame_range[0],
+            'frame_end': frame_range[1],
+            'fps': f"{scene.render.fps / scene.render.fps_base:g}",
+        }
+
+    def _build_chunked_command(self, context: bpy.types.Context, gen_config):
+        """
+        Splits the strip's frame range into chunks and returns the command of chunk_runner.py,
+        which runs one resolved command per chunk in parallel and joins their outputs.
+        Strips that fit in a single chunk run the generator directly.
+        """
+        chunking = gen_config.command.chunking
+        strip = get_strip_by_uuid(self.strip_id)
+        if not strip:
+            raise ValueError(f"Could not find strip with ID {self.strip_id} to split into chunks.")
+        duration = strip.frame_final_duration
+        ranges = [(start, min(start + chunking.frames, duration) - 1) for start in range(0, duration, chunking.frames)]
+        if len(ranges) < 2:
+            return self._build_command(gen_config)
+
+        # Every chunk needs the generator's resources, so run as many in parallel as the pools allow
+        parallel = min(chunking.max_parallel or len(ranges), len(ranges))
+        capacities = self._get_resource_capacities(context)
+        for name, amount in gen_config.resources.items():
+            if amount > 0 and name in capacities:
+                parallel = min(parallel, max(1, int(capacities[name] // amount)))
+        self._resource_demands = {name: amount * parallel for name, amount in gen_config.resources.items()}
+
+        chunks = []
+        for frame_start, frame_end in ranges:
+            self._output_temp_files = {}
+            chunks.append({
+                "frame_start": frame_start,
+                "frame_end": frame_end,
+                "command": self._build_command(gen_config, (frame_start, frame_end)),
+                "outputs": dict(self._output_temp_files),
+            })
+
+        # The joined outputs are what gets ingested
+        output_defs = {odef.name: odef for odef in gen_config.properties.output}
+        self._output_temp_files = {}
+        outputs = {}
+        for name in chunks[0]["outputs"]:
+            output_def = output_defs[name]
+            path = os.path.join(self._work_dir, f"{uuid.uuid4()}{output_def.file_ext or '.tmp'}")
+            self._output_temp_files[name] = path
+            self._temp_files.append(path)
+            outputs[name] = {"path": path, "type": output_def.type.lower(), "required": output_def.required}
+
+        plan_path = os.path.join(self._work_dir, f"gmb_chunks_{uuid.uuid4().hex}.json")
+        with open(plan_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "chunks": chunks,
+                "outputs": outputs,
+                "max_parallel": parallel,
+                # Spool workers use the ffmpeg on their own PATH; this host's path may not exist there
+                "ffmpeg": "ffmpeg" if self._spool_job_id else get_ffmpeg_executable(context),
+            }, f, indent=2)
+        self._temp_files.append(plan_path)
+        self._input_files.append(plan_path)
+        print(f"Split strip '{strip.name}' into {len(chunks)} chunks of {chunking.frames} frames, {parallel} in parallel")
+
+        runner_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "chunk_runner.py")
+        if self._spool_job_id:
+            # The worker runs the job with its own interpreter, from a copy it can reach
+            spool_runner_path = os.path.join(self._work_dir, "chunk_runner.py")
+            shutil.copyfile(runner_path, spool_runner_path)
+            self._spool_python_script = True
+            return [spool_runner_path, plan_path]
+        return [sys.executable, runner_path, plan_path]
+
+    def _build_batch_command(self, context: bpy.types.Context, gen_config):
+        """
+        Resolves the inputs and outputs of every strip in the batch with _build_command and writes
+        them to a JSONL manifest, one line per strip: {"id", "arguments", "inputs", "outputs"}.
+        Returns the command that runs the program once for the whole manifest.
+        Strips that can't be resolved are marked as failed and left out of the batch.
+        """
+        leader_id, leader_props = self.strip_id, self._strip_props
+        input_names = {idef.name for idef in gen_config.properties.input}
+        strip_ids = [leader_id] + [i for i in self.batch_strip_ids.split(",") if i and i != leader_id]
+
+        self._batch_items = {}
+        lines = []
+        try:
+            for strip_id in strip_ids:
+                strip_props = leader_props if strip_id == leader_id else self._get_batch_member(context, strip_id)
+                if strip_props is None:
+                    continue
+                self.strip_id, self._strip_props = strip_id, strip_props
+                self._output_temp_files = {}
+                values = {}
+                try:
+                    arguments = self._build_command(gen_config, resolved_values=values)[1:]
+                except ValueError as e:
+                    if strip_id == leader_id:
+                        raise
+                    strip_props.status = 'ERROR'
+                    strip_props.log_history.clear()
+                    strip_props.log_history.add().line = f"Left out of the batch: {e}"
+                    continue
+                self._batch_items[strip_id] = {"outputs": dict(self._output_temp_files), "status": 'RUNNING'}
+                lines.append({
+                    "id": strip_id,
+                    "arguments": arguments,
+                    "inputs": {name: str(value) for name, value in values.items() if name in input_names},
+                    "outputs": dict(self._output_temp_files),
+                })
+        finally:
+            self.strip_id, self._strip_props = leader_id, leader_props
+
+        manifest_path = os.path.join(self._work_dir, f"gmb_batch_{uuid.uuid4().hex}.jsonl")
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            for line in lines:
+                f.write(json.dumps(line) + "\n")
+        self._temp_files.append(manifest_path)
+        self._input_files.append(manifest_path)
+        # Executors only need to know every file the job writes
+        self._output_temp_files = {
+            f"{strip_id}/{name}": path
+            for strip_id, item in self._batch_items.items()
+            for name, path in item["outputs"].items()
+        }
+        print(f"Batch of {len(lines)} strips for generator '{gen_config.name}', manifest: {manifest_path}")
+
+        arguments = [arg.replace("{manifest}", manifest_path) for arg in shlex.split(gen_config.command.batch.arguments)]
+        return [gen_config.command.program] + arguments
+
+    def _get_batch_member(self, context: bpy.types.Context, strip_id):
+        """Returns the properties of a strip that can join the batch, or None."""
+        strip_props = get_gmb_strip_properties_from_id(context, strip_id)
+        if not strip_props or not get_strip_by_uuid(strip_id):
+            print(f"GMB Batch: Strip {strip_id} not found, leaving it out")
+            return None
+        if strip_props.status in {'RUNNING', 'QUEUED'}:
+            print(f"GMB Batch: Strip '{strip_props.generator_name}' ({strip_id}) is already running, leaving it out")
+            return None
+        if strip_props.generator_name != self._strip_props.generator_name:
+            print(f"GMB Batch: Strip {strip_id} uses another generator, leaving it out")
+            return None
+        return strip_props
+
+    def _iter_batch_members(self, context: bpy.types.Context, status='RUNNING'):
+        """Yields (strip_id, item, strip properties) for the batch's other strips whose item has the given status."""
+        for strip_id, item in self._batch_items.items():
+            if strip_id == self.strip_id or item["status"] != status:
+                continue
+            strip_props = get_gmb_strip_properties_from_id(context, strip_id)
+            if strip_props:
+                yield strip_id, item, strip_props
+
+    def _start_batch_members(self, context: bpy.types.Context):
+        """The batch's other strips follow the run of the strip that started it."""
+        for _strip_id, _item, strip_props in self._iter_batch_members(context):
+            strip_props.process_uuid = self._strip_props.process_uuid
+            strip_props.runtime_seconds = self._strip_props.runtime_seconds
+            strip_props.queue_seconds = 0.0
+            strip_props.cancel_requested = False
+            strip_props.log_history.clear()
+            strip_props.log_history.add().line = f"In a batch of {len(self._batch_items)} run by strip {self.strip_id}"
+        self._set_batch_members_status(context, self._strip_props.status)
+
+    def _set_batch_members_status(self, context: bpy.types.Context, status):
+        for _strip_id, _item, strip_props in self._iter_batch_members(context):
+            strip_props.status = status
+
+    def _update_batch_members(self, context: bpy.types.Context):
+        """Advance the other strips' timers and take out the ones whose generation was cancelled."""
+        for strip_id, item, strip_props in list(self._iter_batch_members(context)):
+            if strip_props.cancel_requested:
+                # The batch keeps running for the other strips; this one's outputs are just not ingested
+                item["status"] = 'CANCELLED'
+                strip_props.status = 'READY'
+                strip_props.cancel_requested = False
+                strip_props.runtime_seconds = 0.0
+                strip_props.log_history.add().line = "Cancelled; left out of the rest of the batch"
+            elif self._strip_props.status == 'RUNNING':
+                strip_props.runtime_seconds = self._strip_props.runtime_seconds
+                strip_props.queue_seconds = self._strip_props.queue_seconds
+
+    def _handle_batch_marker(self, context: bpy.types.Context, line):
+        """Ingest a strip's outputs as soon as the generator reports it done ("GMB_DONE <id>")."""
+        match = BATCH_MARKER.match(line)
+        if not match:
+            return
+        state, strip_id, message = match.groups()
+        item = self._batch_items.get(strip_id)
+        if not item or item["status"] != 'RUNNING':
+            return
+        if state == 'DONE':
+            self._complete_batch_item(context, strip_id)
+        else:
+            self._fail_batch_item(context, strip_id, f"Generator reported failure: {message}" if message else "Generator reported failure")
+
+    def _batch_outputs_exist(self, item):
+        required = {odef.name for odef in self._parsed_gen_config.properties.output if odef.required}
+        return all(os.path.exists(path) for name, path in item["outputs"].items() if name in required)
+
+    def _complete_batch_item(self, context: bpy.types.Context, strip_id):
+        """Populate one strip of the batch with its outputs."""
+        item = self._batch_items[strip_id]
+        strip_props = self._strip_props if strip_id == self.strip_id else get_gmb_strip_properties_from_id(context, strip_id)
+        if not strip_props:
+            item["status"] = 'ERROR'
+            return
+        if not any(os.path.exists(path) for path in item["outputs"].values()) and self.attach_job_id:
+            # Reattached: the strip was already ingested before Blender was closed
+            item["status"] = 'FINISHED'
+            if strip_id != self.strip_id:
+                strip_props.status = 'FINISHED'
+            return
+        if not self._batch_outputs_exist(item):
+            self._fail_batch_item(context, strip_id, "Reported done, but its outputs are missing")
+            return
 
-    def _build_command(self, gen_config):
-        """Builds the command list from the generator config and linked strips."""
+        leader = (self.strip_id, self._strip_props, self._output_temp_files)
+        try:
+            self.strip_id, self._strip_props, self._output_temp_files = strip_id, strip_props, item["outputs"]
+            self._populate_outputs(context)
+        finally:
+            self.strip_id, self._strip_props, self._output_temp_files = leader
+        item["status"] = 'FINISHED'
+        strip_props.output_quality = self._quality
+        # The strip that started the batch keeps running until the whole batch is done
+        if strip_id != self.strip_id:
+            strip_props.status = 'FINISHED'
+            strip_props.log_history.add().line = "Finished in batch"
+        print(f"GMB Batch: Ingested outputs of strip {strip_id}")
+        if context.area:
+            context.area.tag_redraw()
+
+    def _fail_batch_item(self, context: bpy.types.Context, strip_id, message):
+        item = self._batch_items[strip_id]
+        item["status"] = 'ERROR'
+        strip_props = self._strip_props if strip_id == self.strip_id else get_gmb_strip_properties_from_id(context, strip_id)
+        if strip_props:
+            if strip_id != self.strip_id:
+                strip_props.status = 'ERROR'
+            strip_props.log_history.add().line = message
+        print(f"GMB Batch: Strip {strip_id}: {message}")
+
+    def _complete_batch(self, context: bpy.types.Context, return_code):
+        """
+        Settle the strips the generator didn't report on when the batch process exits.
+        After a successful exit their outputs are ingested if they exist.
+        """
+        for strip_id, item in self._batch_items.items():
+            if item["status"] != 'RUNNING':
+                continue
+            if return_code == 0 and self._batch_outputs_exist(item):
+                self._complete_batch_item(context, strip_id)
+            elif return_code == 0:
+                self._fail_batch_item(context, strip_id, "Batch finished without producing this strip's outputs")
+            else:
+                self._fail_batch_item(context, strip_id, f"Batch failed with exit code {return_code}")
+
+        finished = sum(1 for item in self._batch_items.values() if item["status"] == 'FINISHED')
+        summary = f"Batch finished: {finished} of {len(self._batch_items)} strips generated."
+        if return_code != 0:
+            summary += f" The process failed with exit code {return_code}, see log for details."
+        self.report({'INFO'} if finished == len(self._batch_items) else {'WARNING'}, summary)
+        self._strip_props.status = 'FINISHED' if self._batch_items[self.strip_id]["status"] == 'FINISHED' else 'ERROR'
+
+    def _cleanup_batch_members(self, context: bpy.types.Context):
+        """The batch's other strips stop with it."""
+        for _strip_id, _item, strip_props in self._iter_batch_members(context):
+            strip_props.status = 'ERROR' if strip_props.status == 'RUNNING' else 'READY'
+            strip_props.runtime_seconds = 0.0
+            strip_props.cancel_requested = False
+
+    def _build_command(self, gen_config, frame_range=None, resolved_values=None):
+        """
+        Builds the command list from the generator config and linked strips.
+        frame_range: optional (frame_start, frame_end) for the built-in frame placeholders.
+        resolved_values: optional dict that receives the value of every resolved placeholder.
+        """
         program = gen_config.command.program
-        arguments = gen_config.command.arguments
-        argument_list = gen_config.command.argument_list
+        arguments, argument_list = gen_config.command.get_arguments(draft=self._quality == 'DRAFT')
 
         arg_item_list = []
         if arguments is not None:
@@ -499,6 +1586,7 @@ class GMB_OT_generate_media(Operator):
         input_defs = {idef.name: idef for idef in gen_config.properties.input}
         
         resolved_args = []
+        builtin_values = None
 
         for arg_item in arg_item_list:
             # Handle conditional arguments based on 'if_property_set'
@@ -532,10 +1620,14 @@ class GMB_OT_generate_media(Operator):
                 # Is it an output placeholder?
                 if placeholder in output_defs:
                     output_def = output_defs[placeholder]
-                    if output_def.pass_via.lower() == 'file':
+                    if output_def.type.lower() == 'image-sequence':
+                        # The generator writes its frames into a directory
+                        value = self._output_temp_files.get(placeholder) or self._create_frames_dir(output_def)
+                        self._output_temp_files[placeholder] = value
+                    elif output_def.pass_via.lower() == 'file':
                         # Generate a unique path in the system's temp directory
                         # without creating the file itself.
-                        temp_dir = tempfile.gettempdir()
+                        temp_dir = self._work_dir
                         unique_filename = f"{uuid.uuid4()}{output_def.file_ext or '.tmp'}"
                         value = os.path.join(temp_dir, unique_filename)
                         
@@ -581,12 +1673,22 @@ class GMB_OT_generate_media(Operator):
                                 raise ValueError(f"Could not find strip for input '{placeholder}' (UUID: {input_link.linked_strip_uuid}).")
                         
                         value = self._get_input_value(linked_strip, input_def, input_link)
+                # Is it a built-in placeholder?
+                elif placeholder in BUILTIN_PLACEHOLDERS:
+                    if builtin_values is None:
+                        builtin_values = self._get_frame_placeholders(frame_range)
+                    value = builtin_values[placeholder]
+                elif placeholder == PREVIEW_PLACEHOLDER:
+                    value = self._get_preview_source()
+
                 else:
                     raise ValueError(f"Placeholder '{{{placeholder}}}' does not match any defined input or output property.")
 
                 if value is not None:
                     # Replace the placeholder with the actual value.
                     current_arg = current_arg.replace(f'{{{placeholder}}}', str(value))
+                    if resolved_values is not None:
+                        resolved_values[placeholder] = value
             
             resolved_args.append(current_arg)
 
@@ -613,9 +1715,9 @@ class GMB_OT_generate_media(Operator):
             elif strip_type == 'IMAGE' and linked_strip.elements:
                 input_value = resolve_strip_filepath(linked_strip.elements[0].filename)
             elif strip_type == 'SOUND':
-                input_value = resolve_strip_filepath(linked_strip.sound.filepath)
+                input_value = self._get_trimmed_input(linked_strip, resolve_strip_filepath(linked_strip.sound.filepath))
             elif strip_type == 'MOVIE':
-                input_value = resolve_strip_filepath(linked_strip.filepath)
+                input_value = self._get_trimmed_input(linked_strip, resolve_strip_filepath(linked_strip.filepath))
             else:
                 raise ValueError(f"Unsupported strip type '{strip_type}' for input '{input_def.name}'.")
 
@@ -639,10 +1741,11 @@ class GMB_OT_generate_media(Operator):
         value_is_file = not value_is_text
         if input_def.pass_via.lower() == 'file' and value_is_text:
             # Create a temp file and copy the text value to it.
-            with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix=".txt", encoding='utf-8') as temp_f:
+            with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix=".txt", encoding='utf-8', dir=self._work_dir) as temp_f:
                 temp_f.write(input_value)
                 arg_value = temp_f.name
                 self._temp_files.append(arg_value)
+                self._input_files.append(arg_value)
         elif input_def.pass_via.lower() == 'text' and value_is_file:
             if input_def.type.upper() != 'TEXT':
                 raise ValueError(f"Input '{input_def.name}' has type '{input_def.type}' which is incompatible with 'TEXT' mode.")
@@ -653,9 +1756,241 @@ class GMB_OT_generate_media(Operator):
             # Not implemented yet
             # TODO: Implement this
             raise ValueError("Pass-via 'stream' is not implemented yet.")
+        elif value_is_file:
+            # Media passed by path; remote executors need to know which files the job reads
+            self._input_files.append(arg_value)
             
         return arg_value
 
+    def _prepare_trimmed_inputs(self, context: bpy.types.Context):
+        """Starts cutting the clips of the movie and sound strips linked to the run's strips, unless they are cached."""
+        if get_prefs(context).trim_linked_inputs == 'OFF':
+            return
+        strip_ids = [self.strip_id] + [i for i in self.batch_strip_ids.split(",") if i and i != self.strip_id]
+        for strip_id in strip_ids:
+            strip_props = get_gmb_strip_properties_from_id(context, strip_id)
+            if not strip_props:
+                continue
+            for input_link in strip_props.linked_inputs:
+                if input_link.input_mode != 'STRIP' or not input_link.linked_strip_uuid:
+                    continue
+                linked_strip = get_strip_by_uuid(input_link.linked_strip_uuid)
+                if linked_strip and linked_strip.type in {'MOVIE', 'SOUND'}:
+                    source = linked_strip.sound.filepath if linked_strip.type == 'SOUND' else linked_strip.filepath
+                    self._get_trimmed_input(linked_strip, resolve_strip_filepath(source))
+
+    def _get_trimmed_input(self, linked_strip, source_path):
+        """
+        Returns a cached clip of just the part of source_path the strip shows, or source_path itself
+        if the strip isn't trimmed, trimming is off, or the clip can't be made.
+        Clips that aren't cached yet are cut in the background (see _prepare_trimmed_inputs) and
+        source_path is returned until they are ready.
+        """
+        prefs = get_prefs(bpy.context)
+        if prefs.trim_linked_inputs == 'OFF':
+            return source_path
+        source_range = get_strip_source_range(linked_strip)
+        if source_range is None:
+            return source_path
+
+        from . import input_cache
+        start, duration = source_range
+        accurate = prefs.trim_linked_inputs == 'ACCURATE'
+        cut_key = (source_path, start, duration, linked_strip.type, accurate)
+        try:
+            future = self._trim_cuts.get(cut_key)
+            if future is None:
+                clip_path = input_cache.find_trimmed_clip(source_path, start, duration, get_input_cache_dir(), linked_strip.type, accurate)
+                if not clip_path:
+                    self._trim_cuts[cut_key] = input_cache.cut_in_background(
+                        get_ffmpeg_executable(),
+                        source_path,
+                        start,
+                        duration,
+                        get_input_cache_dir(),
+                        linked_strip.type,
+                        accurate
+                    )
+                    return source_path
+            elif not future.done():
+                return source_path
+            else:
+                clip_path = future.result()
+        except (OSError, ValueError) as e:
+            print(f"GMB: Could not trim input strip '{linked_strip.name}', passing the whole file: {e}")
+            return source_path
+        print(f"GMB: Passing {duration:.2f}s from {start:.2f}s of '{os.path.basename(source_path)}' as '{clip_path}'")
+        return clip_path
+
+    def _get_output_variant(self):
+        """Drafts are stored as a separate version of the stable output file."""
+        return 'draft' if self._quality == 'DRAFT' else ""
+
+    def _has_progressive_sequence(self, gen_config):
+        """A single image-sequence output is shown on the controller strip while it renders."""
+        outputs = gen_config.properties.output
+        return len(outputs) == 1 and outputs[0].type.lower() == 'image-sequence'
+
+    def _get_sequence_stable_dir(self, strip_name, output_def, gmb_id):
+        """The stable location of an image sequence is a directory named like a stable output file."""
+        return get_stable_filepath(
+            strip_name,
+            self._parsed_gen_config.name,
+            output_def.name,
+            gmb_id,
+            "",
+            self._get_output_variant()
+        )
+
+    def _create_frames_dir(self, output_def):
+        """
+        Creates the directory an image-sequence output writes its frames to.
+        Progressively shown sequences are written next to their stable location (<stable dir>_partial),
+        so the frames on the strip outlive a failed or cancelled run. Others use the job's work directory.
+        """
+        if self._progressive_sequence:
+            strip = get_strip_by_uuid(self.strip_id)
+            if not strip:
+                raise ValueError(f"Could not find strip with ID {self.strip_id} for its frame directory.")
+            frames_dir = self._get_sequence_stable_dir(strip.name, output_def, strip["gmb_id"]) + "_partial"
+            # Frames left over from an earlier failed run
+            shutil.rmtree(frames_dir, ignore_errors=True)
+        else:
+            frames_dir = os.path.join(self._work_dir, f"gmb_frames_{uuid.uuid4().hex}")
+            self._temp_files.append(frames_dir)
+        os.makedirs(frames_dir, exist_ok=True)
+        return frames_dir
+
+    def _show_new_frames(self):
+        """
+        Appends the frames written since the last check to the controller strip, so early frames
+        can be scrubbed while the rest render. The newest frame may still be being written,
+        so it is only shown once a later frame exists (or at the end of the run).
+        """
+        now = time.monotonic()
+        if now < self._next_frame_scan_at:
+            return
+        self._next_frame_scan_at = now + self.FRAME_SCAN_INTERVAL
+
+        output_def = self._parsed_gen_config.properties.output[0]
+        frames_dir = self._output_temp_files.get(output_def.name)
+        if not frames_dir:
+            return
+        frames = list_sequence_frames(frames_dir, output_def.file_ext)[:-1]
+        if len(frames) <= self._sequence_frames_shown:
+            return
+
+        strip = get_strip_by_uuid(self.strip_id)
+        if not strip or strip.type != 'IMAGE':
+            return
+        self._sequence_frames_shown = self._show_sequence_frames(strip, frames_dir, frames, self._sequence_frames_shown)
+
+    def _find_preview_path(self):
+        """
+        Returns where the controller strip's intermediate previews are stored, next to its stable output
+        (<stable name>_preview<ext>), or None if the generator's outputs can't be previewed.
+        Previews replace the controller strip's media, so they need a single image, movie or text output.
+        """
+        outputs = self._parsed_gen_config.properties.output
+        if len(outputs) != 1 or outputs[0].type.lower() not in PREVIEW_OUTPUT_TYPES:
+            return None
+        strip = get_strip_by_uuid(self.strip_id)
+        if not strip:
+            return None
+        output_def = outputs[0]
+        file_ext = output_def.file_ext or ('.txt' if output_def.type.lower() == 'text' else '.tmp')
+        variant = "_".join(v for v in (self._get_output_variant(), "preview") if v)
+        return get_stable_filepath(strip.name, self._parsed_gen_config.name, output_def.name, strip["gmb_id"], file_ext, variant)
+
+    def _get_preview_source(self):
+        """
+        Value of the {preview} placeholder. Local and detached jobs write their previews straight to the
+        preview file; spool jobs may run on another host, so they write to their job directory and
+        every new preview is copied over.
+        """
+        if self._preview_source:
+            return self._preview_source
+        if self._batch_items is not None:
+            raise ValueError("The {preview} placeholder can't be used in batch runs.")
+        self._preview_path = self._find_preview_path()
+        if not self._preview_path:
+            raise ValueError("The {preview} placeholder needs a single image, movie or text output.")
+        # A preview left over from an earlier run would be shown as soon as the job starts
+        self._remove_preview()
+        if self._spool_job_id:
+            self._preview_source = os.path.join(self._work_dir, f"gmb_preview_{uuid.uuid4().hex}{os.path.splitext(self._preview_path)[1]}")
+            self._temp_files.append(self._preview_source)
+        else:
+            self._preview_source = self._preview_path
+        return self._preview_source
+
+    def _remove_preview(self):
+        if self._preview_path and os.path.exists(self._preview_path):
+            try:
+                os.remove(self._preview_path)
+            except OSError as e:
+                print(f"GMB: Could not remove preview '{self._preview_path}': {e}")
+
+    def _show_new_preview(self):
+        """
+        Hot-swaps the generator's latest preview into the controller strip, checking at most once per
+        PREVIEW_INTERVAL. A new preview (by mtime) is picked up once it hasn't changed for
+        PREVIEW_SETTLE_TIME, so a file that is still being written isn't shown.
+        """
+        now = time.monotonic()
+        if now < self._next_preview_check_at:
+            return
+        self._next_preview_check_at = now + self.PREVIEW_INTERVAL
+
+        try:
+            stat = os.stat(self._preview_source)
+        except OSError:
+            return
+        if stat.st_mtime == self._preview_mtime or not stat.st_size or time.time() - stat.st_mtime < self.PREVIEW_SETTLE_TIME:
+            return
+
+        strip = get_strip_by_uuid(self.strip_id)
+        if not strip:
+            return
+        try:
+            if self._preview_source != self._preview_path:
+                shutil.copyfile(self._preview_source, self._preview_path)
+            if strip.type == 'IMAGE':
+                strip.directory = os.path.join(os.path.dirname(self._preview_path), "")
+                strip.elements[0].filename = os.path.basename(self._preview_path)
+            elif strip.type == 'MOVIE':
+                # Assigning the path reopens the movie, even when it is unchanged
+                strip.filepath = self._preview_path
+            elif strip.type == 'TEXT':
+                with open(self._preview_path, 'r', encoding='utf-8') as f:
+                    strip.text = f.read()
+            else:
+                return
+            if strip.type != 'TEXT':
+                strip.invalidate_cache('RAW')
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"GMB: Could not show preview for strip '{strip.name}': {e}")
+            return
+        self._preview_mtime = stat.st_mtime
+
+    def _show_sequence_frames(self, strip, frames_dir, frames, shown=0):
+        """
+        Points an image strip at frames_dir and appends the frames after the first 'shown' ones.
+        With shown=0 the strip's current images are replaced. Returns the number of frames on the strip.
+        """
+        elements = strip.elements
+        if shown == 0:
+            strip.directory = os.path.join(frames_dir, "")
+            while len(elements) > 1:
+                elements.pop(len(elements) - 1)
+            elements[0].filename = frames[0]
+            shown = 1
+        for filename in frames[shown:]:
+            elements.append(filename)
+        strip.frame_final_duration = len(elements)
+        return len(elements)
+
+    @profiled("GMB_OT_generate_media._populate_outputs")
     def _populate_outputs(self, context):
         """
         After a successful generation, create or populate the output strips
@@ -709,7 +2044,7 @@ class GMB_OT_generate_media(Operator):
     def _create_and_populate_output_strip(self, context, controller_strip, output_def, temp_filepath):
         """Creates and populates a new strip from a file."""
         sequences = context.scene.sequence_editor.sequences
-        gmb_type = output_def.type.upper()
+        gmb_type = output_def.type.upper().replace('-', '_')
         strip_name = output_def.name
         channel = controller_strip.channel + 1  # Place above the controller
         frame_start = int(controller_strip.frame_start)
@@ -725,6 +2060,21 @@ class GMB_OT_generate_media(Operator):
             except Exception as e:
                 self.report({'ERROR'}, f"Failed to read text output file: {e}")
                 return None
+        elif gmb_type == 'IMAGE_SEQUENCE':
+            frames = list_sequence_frames(temp_filepath, output_def.file_ext)
+            if not frames:
+                self.report({'ERROR'}, f"Output '{output_def.name}' produced no frames.")
+                return None
+            try:
+                stable_dir = self._get_sequence_stable_dir(strip_name, output_def, strip_gmb_id)
+                shutil.move(temp_filepath, stable_dir)
+                deduplicate_new_output(stable_dir)
+            except (ValueError, OSError) as e:
+                self.report({'ERROR'}, f"Could not move generated frames to stable location: {e}")
+                return None
+
+            new_strip = sequences.new_image(name=strip_name, filepath=os.path.join(stable_dir, frames[0]), channel=channel, frame_start=frame_start)
+            self._show_sequence_frames(new_strip, stable_dir, frames, shown=1)
         elif gmb_type in ['IMAGE', 'SOUND', 'MOVIE']:
             try:
                 stable_filepath = get_stable_filepath(
@@ -732,9 +2082,11 @@ class GMB_OT_generate_media(Operator):
                     self._parsed_gen_config.name,
                     output_def.name,
                     strip_gmb_id,
-                    output_def.file_ext
+                    self._get_output_file_ext(output_def),
+                    self._get_output_variant()
                 )
                 shutil.move(temp_filepath, stable_filepath)
+                digest_future = deduplicate_new_output(stable_filepath)
             except (ValueError, FileNotFoundError, OSError) as e:
                 self.report({'ERROR'}, f"Could not move generated file to stable location: {e}")
                 return None
@@ -748,6 +2100,9 @@ class GMB_OT_generate_media(Operator):
                 new_strip = sequences.new_movie(name=strip_name, filepath=stable_filepath, channel=channel, frame_start=frame_start)
 
         new_strip["gmb_id"] = strip_gmb_id
+        if gmb_type == 'MOVIE':
+            from . import proxy_builder
+            proxy_builder.queue_proxy_build(context.scene, strip_gmb_id, stable_filepath, digest_future)
         return new_strip
 
     def _populate_strip_from_file(self, context, strip, output_def, temp_filepath):
@@ -757,7 +2112,7 @@ class GMB_OT_generate_media(Operator):
         # Creation method toggle: True = use bpy.ops, False = use sequences.new_*
         USE_OPERATOR_CREATION = True
         
-        gmb_type = output_def.type.upper()
+        gmb_type = output_def.type.upper().replace('-', '_')
         strip_name = strip.name
         strip_gmb_id = strip["gmb_id"]
 
@@ -768,6 +2123,27 @@ class GMB_OT_generate_media(Operator):
                     strip.text = f.read()
             except Exception as e:
                 self.report({'ERROR'}, f"Failed to read text output file: {e}")
+        elif gmb_type == 'IMAGE_SEQUENCE':
+            frames = list_sequence_frames(temp_filepath, output_def.file_ext)
+            if not frames:
+                self.report({'ERROR'}, f"Output '{output_def.name}' produced no frames.")
+                return
+            if strip.type != 'IMAGE':
+                self.report({'ERROR'}, f"Strip '{strip_name}' is not an image strip and can't show an image sequence.")
+                return
+            try:
+                stable_dir = self._get_sequence_stable_dir(strip_name, output_def, strip_gmb_id)
+
+                # Clean up the previous version (e.g., the placeholder image); partial frames are kept until the move
+                cleanup_gmb_id_version(strip_gmb_id, self._get_output_variant())
+                shutil.move(temp_filepath, stable_dir)
+                deduplicate_new_output(stable_dir)
+
+                self._show_sequence_frames(strip, stable_dir, frames)
+                strip.invalidate_cache('RAW')
+                self._remove_superseded_draft(strip_gmb_id)
+            except (ValueError, OSError) as e:
+                self.report({'ERROR'}, f"Could not populate strip with stable frames: {e}")
         elif gmb_type in ['IMAGE', 'SOUND', 'MOVIE']:
             try:
                 # Get the directory where the stable file should be.
@@ -776,19 +2152,23 @@ class GMB_OT_generate_media(Operator):
                     self._parsed_gen_config.name,
                     output_def.name,
                     strip_gmb_id,
-                    output_def.file_ext
+                    self._get_output_file_ext(output_def),
+                    self._get_output_variant()
                 )
                 stable_dir = os.path.dirname(stable_filepath)
 
                 # Clean up any previous versions of this file (e.g., the placeholder)
-                cleanup_gmb_id_version(stable_dir, strip_gmb_id)
+                cleanup_gmb_id_version(strip_gmb_id, self._get_output_variant())
                 
                 # Move the new temp file to the stable location
                 shutil.move(temp_filepath, stable_filepath)
+                digest_future = deduplicate_new_output(stable_filepath)
 
                 if gmb_type == 'IMAGE':
-                    # Images are simpler, just update the filepath
-                    strip.filepath = stable_filepath
+                    # Images are simpler, just point the strip's single element at the new file
+                    strip.directory = os.path.join(stable_dir, "")
+                    strip.elements[0].filename = os.path.basename(stable_filepath)
+                    strip.invalidate_cache('RAW')
                     
                 elif gmb_type in ['SOUND', 'MOVIE']:
                     if USE_UPDATE_STRATEGY:
@@ -797,10 +2177,19 @@ class GMB_OT_generate_media(Operator):
                     else:
                         # STRATEGY 2: Replace strip with new one, preserving user properties
                         self._replace_strip_with_new(context, strip, gmb_type, stable_filepath, USE_OPERATOR_CREATION)
+                    if gmb_type == 'MOVIE':
+                        from . import proxy_builder
+                        proxy_builder.queue_proxy_build(context.scene, strip_gmb_id, stable_filepath, digest_future)
+                self._remove_superseded_draft(strip_gmb_id)
                     
             except (ValueError, FileNotFoundError, OSError) as e:
                 self.report({'ERROR'}, f"Could not populate strip with stable file: {e}")
 
+    def _remove_superseded_draft(self, gmb_id):
+        """Once a final output is ingested, the strip's draft output is no longer shown and its files are removed."""
+        if self._quality == 'FINAL':
+            cleanup_gmb_id_version(gmb_id, "draft")
+
     def _update_strip_with_temp(self, context, strip, gmb_type, stable_filepath, USE_OPERATOR_CREATION):
         """Strategy 1: Update existing strip using a temporary strip for accurate properties."""
         sequences = context.scene.sequence_editor.sequences
@@ -1055,13 +2444,291 @@ class GMB_OT_generate_media(Operator):
             if 'pitch' in preserved_props and hasattr(new_strip, 'pitch'):
                 new_strip.pitch = preserved_props['pitch']
 
+class GMB_OT_promote_drafts(Operator):
+    """Re-generate every strip that currently shows a draft output at final quality, in the background."""
+    bl_idname = "gmb.promote_drafts"
+    bl_label = "Promote All Drafts to Final"
+    bl_options = {'REGISTER'}
+
+    @classmethod
+    def poll(cls, context):
+        return context.area and context.area.type == 'SEQUENCE_EDITOR' and context.scene.sequence_editor
+
+    def execute(self, context):
+        scene = context.scene
+        existing_ids = {strip.get("gmb_id") for strip in scene.sequence_editor.sequences_all}
+        # Collect the ids first; invoking the operator changes the properties we iterate over.
+        strip_ids = [
+            props.id for props in scene.gmb_strip_properties
+            if props.output_quality == 'DRAFT'
+            and props.status not in {'RUNNING', 'QUEUED'}
+            and props.id in existing_ids
+        ]
+        if not strip_ids:
+            self.report({'INFO'}, "No draft outputs to promote.")
+            return {'CANCELLED'}
+
+        for strip_id in strip_ids:
+            gmb_props = get_gmb_strip_properties_from_id(context, strip_id)
+            gmb_props.quality = 'FINAL'
+            bpy.ops.gmb.generate_media('INVOKE_DEFAULT', strip_id=strip_id, background=True)
+
+        self.report({'INFO'}, f"Queued {len(strip_ids)} final-quality generation(s).")
+        return {'FINISHED'}
+
+class GMB_OT_generate_batch(Operator):
+    """Generate the selected strips, running generators with a 'batch' block once for many strips."""
+    bl_idname = "gmb.generate_batch"
+    bl_label = "Generate Selected in Batches"
+    bl_options = {'REGISTER'}
+
+    @classmethod
+    def poll(cls, context):
+        return context.area and context.area.type == 'SEQUENCE_EDITOR' and context.scene.sequence_editor
+
+    def execute(self, context):
+        scene = context.scene
+        # Strips are batched per generator and quality; the others run on their own
+        batches = {}
+        single_ids = []
+        for strip in scene.sequence_editor.sequences_all:
+            gmb_id = strip.get("gmb_id")
+            if not strip.select or not gmb_id:
+                continue
+            gmb_props = get_gmb_strip_properties_from_id(context, gmb_id)
+            if not gmb_props or gmb_props.status in {'RUNNING', 'QUEUED'}:
+                continue
+            gen_config = get_gmb_config_from_strip_properties(context, gmb_props)
+            if not gen_config:
+                continue
+            if gen_config.has_batch:
+                quality = gmb_props.quality if gen_config.has_draft else 'FINAL'
+                batches.setdefault((gen_config.name, quality), (gen_config.batch_max_size, []))[1].append(gmb_id)
+            else:
+                single_ids.append(gmb_id)
+
+        if not batches and not single_ids:
+            self.report({'INFO'}, "No selected generator strips to generate.")
+            return {'CANCELLED'}
+
+        runs = 0
+        for max_size, strip_ids in batches.values():
+            size = max_size or len(strip_ids)
+            for start in range(0, len(strip_ids), size):
+                batch_ids = strip_ids[start:start + size]
+                bpy.ops.gmb.generate_media('INVOKE_DEFAULT', strip_id=batch_ids[0], batch_strip_ids=",".join(batch_ids), background=True)
+                runs += 1
+        for strip_id in single_ids:
+            bpy.ops.gmb.generate_media('INVOKE_DEFAULT', strip_id=strip_id, background=True)
+            runs += 1
+
+        batched = sum(len(strip_ids) for _max_size, strip_ids in batches.values())
+        self.report({'INFO'}, f"Started {runs} run(s) for {batched + len(single_ids)} strip(s), {batched} in batches.")
+        return {'FINISHED'}
+
+class GMB_OT_migrate_output_layout(Operator):
+    """Move the open project's generated media into the output layout chosen in the preferences, repoint its strips and save the project."""
+    bl_idname = "gmb.migrate_output_layout"
+    bl_label = "Migrate Output Layout"
+    bl_options = {'REGISTER'}
+
+    @classmethod
+    def poll(cls, context):
+        return bpy.data.is_saved
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_confirm(self, event)
+
+    def execute(self, context):
+        if any(props.status in {'RUNNING', 'QUEUED'} for scene in bpy.data.scenes for props in scene.gmb_strip_properties):
+            self.report({'ERROR'}, "Wait for running generations to finish before migrating.")
+            return {'CANCELLED'}
+
+        layout = get_prefs(context).output_layout
+        output_dir = get_project_output_dir(create=False)
+        moved = migrate_output_layout(output_dir, layout)
+        if not moved:
+            self.report({'INFO'}, f"Generated media already uses the {layout.lower()} layout.")
+            return {'FINISHED'}
+
+        repointed = self._repoint_data(moved)
+        bpy.ops.wm.save_mainfile()
+        self.report({'INFO'}, f"Moved {len(moved)} generated file(s) and repointed {repointed} strip(s) and sound(s).")
+        return {'FINISHED'}
+
+    def _repoint_data(self, moved):
+        """Update every strip and sound that uses a moved file. Returns how many were changed."""
+        def new_path(filepath):
+            """The new path of a moved file (keeping '//'-relative paths relative), or None."""
+            if not filepath:
+                return None
+            target = moved.get(os.path.normpath(bpy.path.abspath(filepath)))
+            if target is None:
+                return None
+            return bpy.path.relpath(target) if filepath.startswith("//") else target
+
+        changed = 0
+        for sound in bpy.data.sounds:
+            path = new_path(sound.filepath)
+            if path:
+                sound.filepath = path
+                changed += 1
+        for scene in bpy.data.scenes:
+            if not scene.sequence_editor:
+                continue
+            for strip in scene.sequence_editor.sequences_all:
+                if strip.type == 'MOVIE':
+                    path = new_path(strip.filepath)
+                    if path:
+                        strip.filepath = path
+                        changed += 1
+                elif strip.type == 'IMAGE':
+                    directory = strip.directory
+                    # Image sequences move as a whole directory, single images as a file
+                    path = new_path(directory.rstrip("/\\"))
+                    if not path and strip.elements:
+                        file_path = new_path(os.path.join(directory, strip.elements[0].filename))
+                        path = os.path.dirname(file_path) if file_path else None
+                    if path:
+                        strip.directory = os.path.join(path, "")
+                        changed += 1
+        return changed
+
+class GMB_OT_collect_orphaned_outputs(Operator):
+    """Find generated media in the project's output directory that no strip uses anymore and delete it."""
+    bl_idname = "gmb.collect_orphaned_outputs"
+    bl_label = "Clean Up Orphaned Outputs"
+    bl_options = {'REGISTER'}
+
+    dry_run: BoolProperty(
+        name="Dry Run",
+        description="Only report what would be deleted",
+        default=True
+    )
+    grace_period: FloatProperty(
+        name="Grace Period (hours)",
+        description="Keep outputs orphaned more recently than this (counted from the first cleanup that found them), e.g. of strips that may still be restored with Undo, "
+                    "and trimmed input clips or movie proxies used more recently than this",
+        default=24.0,
+        min=0.0
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return bpy.data.is_saved
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        from . import output_dedup
+        from . import input_cache
+        from . import proxy_builder
+
+        output_dir = get_project_output_dir(create=False)
+        orphans = find_orphaned_outputs(output_dir, get_live_gmb_ids(), self.grace_period * 3600)
+        # Trimmed input clips no run has used within the grace period are collected as well
+        orphans += input_cache.find_stale_clips(get_input_cache_dir(), self.grace_period * 3600)
+        # Proxies are stored per content hash, so they are collected once no movie strip uses them
+        orphans += proxy_builder.find_unused_proxies(output_dir, self.grace_period * 3600)
+        total_mb = sum(size for _path, size in orphans) / (1024 * 1024)
+
+        if self.dry_run:
+            # Deduplicated outputs only free their space once their blob is unused as well,
+            # so their size counts as reclaimable here and the blobs are reported separately
+            unused_blobs = output_dedup.find_unused_blobs(get_blob_dir())
+            for path, size in orphans + unused_blobs:
+                print(f"GMB GC: Would remove '{os.path.relpath(path, output_dir)}' ({size / (1024 * 1024):.1f} MB)")
+            blobs_mb = sum(size for _path, size in unused_blobs) / (1024 * 1024)
+            self.report({'INFO'}, f"Found {len(orphans)} orphaned output(s), stale input clip(s) or unused proxies, {total_mb:.1f} MB, and {len(unused_blobs)} unused "
+                                  f"blob(s), {blobs_mb:.1f} MB, reclaimable (dry run, nothing deleted).")
+            return {'FINISHED'}
+
+        removed = 0
+        for path, _size in orphans:
+            try:
+                if os.path.isdir(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+                removed += 1
+            except OSError as e:
+                print(f"GMB GC Error: Could not remove '{path}': {e}")
+        # Blobs are checked after the orphans are gone, so the blobs only they linked to are collected too
+        unused_blobs = output_dedup.find_unused_blobs(get_blob_dir())
+        for path, size in unused_blobs:
+            try:
+                os.remove(path)
+                total_mb += size / (1024 * 1024)
+            except OSError as e:
+                print(f"GMB GC Error: Could not remove '{path}': {e}")
+        if not orphans and not unused_blobs:
+            self.report({'INFO'}, "No orphaned outputs found.")
+            return {'FINISHED'}
+        self.report({'INFO'} if removed == len(orphans) else {'WARNING'},
+                    f"Removed {removed} of {len(orphans)} orphaned output(s), stale input clip(s) or unused proxies and {len(unused_blobs)} unused blob(s), {total_mb:.1f} MB.")
+        return {'FINISHED'}
+
+class GMB_OT_deduplicate_outputs(Operator):
+    """Replace byte-identical generated files in the project's output directory with hardlinks to one stored copy."""
+    bl_idname = "gmb.deduplicate_outputs"
+    bl_label = "Deduplicate Outputs"
+    bl_options = {'REGISTER'}
+
+    @classmethod
+    def poll(cls, context):
+        return bpy.data.is_saved
+
+    def execute(self, context):
+        from . import output_dedup
+
+        paths = [path for _gmb_id, path in iter_output_entries(get_project_output_dir(create=False))]
+        freed, linked = output_dedup.deduplicate_outputs(paths, get_blob_dir())
+        self.report({'INFO'}, f"Linked {linked} duplicate file(s), freeing {freed / (1024 * 1024):.1f} MB.")
+        return {'FINISHED'}
+
+class GMB_OT_dump_profile(Operator):
+    """Write the collected profiling stats (pstats and a text summary) next to the .blend file."""
+    bl_idname = "gmb.dump_profile"
+    bl_label = "Dump Profile"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        try:
+            pstats_path, summary_path = dump_profile()
+        except (ValueError, OSError) as e:
+            self.report({'ERROR'}, f"Could not dump profile: {e}")
+            return {'CANCELLED'}
+
+        if pstats_path:
+            self.report({'INFO'}, f"Profile written to '{pstats_path}' and '{summary_path}'")
+        else:
+            self.report({'INFO'}, f"Profile summary written to '{summary_path}'")
+        return {'FINISHED'}
+
 def register():
     bpy.utils.register_class(GMB_OT_add_generator_strip)
+    bpy.utils.register_class(GMB_OT_search_generator)
+    bpy.utils.register_class(GMB_OT_apply_generator_to_selection)
     bpy.utils.register_class(GMB_OT_cancel_generation)
     bpy.utils.register_class(GMB_OT_generate_media)
+    bpy.utils.register_class(GMB_OT_promote_drafts)
+    bpy.utils.register_class(GMB_OT_generate_batch)
+    bpy.utils.register_class(GMB_OT_migrate_output_layout)
+    bpy.utils.register_class(GMB_OT_collect_orphaned_outputs)
+    bpy.utils.register_class(GMB_OT_deduplicate_outputs)
+    bpy.utils.register_class(GMB_OT_dump_profile)
 
 
 def unregister():
     bpy.utils.unregister_class(GMB_OT_add_generator_strip)
+    bpy.utils.unregister_class(GMB_OT_search_generator)
+    bpy.utils.unregister_class(GMB_OT_apply_generator_to_selection)
     bpy.utils.unregister_class(GMB_OT_cancel_generation)
-    bpy.utils.unregister_class(GMB_OT_generate_media) 
\ No newline at end of file
+    bpy.utils.unregister_class(GMB_OT_generate_media)
+    bpy.utils.unregister_class(GMB_OT_promote_drafts)
+    bpy.utils.unregister_class(GMB_OT_generate_batch)
+    bpy.utils.unregister_class(GMB_OT_migrate_output_layout)
+    bpy.utils.unregister_class(GMB_OT_collect_orphaned_outputs)
+    bpy.utils.unregister_class(GMB_OT_deduplicate_outputs)
+    bpy.utils.unregister_class(GMB_OT_dump_profile) 
\ No newline at end of file
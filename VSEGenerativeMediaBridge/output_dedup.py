@@ -0,0 +1,207 @@
+# VSE Generative Media Bridge
+# Copyright (C) 2024 Paul Siegfried
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Content-addressed deduplication of generated files.
+# Every deduplicated output is hardlinked into a blob store (<output dir>/.gmb_blobs/ab/<digest>,
+# see utils.get_blob_dir).
+# An output whose content is already stored is replaced by a hardlink to the stored blob,
+# so identical outputs take up space once while keeping their per-strip filenames: removing
+# one of them (e.g. when its strip is regenerated) just drops a link. Blobs no output links
+# to anymore are found by find_unused_blobs() and removed with the orphaned outputs; the blobs
+# of outputs removed by a regeneration are dropped right away with release_blobs().
+# It does not depend on Blender.
+
+import concurrent.futures
+import hashlib
+import os
+import uuid
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Outputs are hashed and deduplicated one at a time, off the main thread
+_executor = None
+
+
+def hash_file(path):
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _is_unchanged(path, stat):
+    """Whether path is still the file it was when stat was taken, e.g. not replaced by a regeneration."""
+    try:
+        current = os.stat(path)
+    except FileNotFoundError:
+        return False
+    return (current.st_dev, current.st_ino, current.st_mtime_ns) == (stat.st_dev, stat.st_ino, stat.st_mtime_ns)
+
+
+def deduplicate_file(path, blob_dir):
+    """
+    Stores the file in the blob store, or replaces it with a hardlink to an identical stored blob.
+    Returns (number of bytes freed, digest of the file's content). The digest is None if the
+    file wasn't hashed (already stored, empty) or changed while it was hashed.
+    """
+    stat = os.stat(path)
+    if stat.st_nlink > 1 or not stat.st_size:
+        # Already stored (or nothing to gain)
+        return 0, None
+    digest = hash_file(path)
+    # The output may have been regenerated at the same path while it was hashed
+    if not _is_unchanged(path, stat):
+        return 0, None
+    blob_path = os.path.join(blob_dir, digest[:2], digest)
+    try:
+        blob_stat = os.stat(blob_path)
+    except FileNotFoundError:
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        try:
+            os.link(path, blob_path)
+            return 0, digest
+        except FileExistsError:
+            # Stored by a concurrent run in the meantime
+            blob_stat = os.stat(blob_path)
+
+    if blob_stat.st_size != stat.st_size or (blob_stat.st_dev, blob_stat.st_ino) == (stat.st_dev, stat.st_ino):
+        return 0, digest
+    tmp_path = os.path.join(os.path.dirname(path), f".{uuid.uuid4().hex}.tmp")
+    os.link(blob_path, tmp_path)
+    if not _is_unchanged(path, stat):
+        os.remove(tmp_path)
+        return 0, None
+    try:
+        os.replace(tmp_path, path)
+    except OSError:
+        os.remove(tmp_path)
+        raise
+    return stat.st_size, digest
+
+
+def deduplicate_outputs(paths, blob_dir):
+    """
+    Deduplicates the given generated files and image-sequence directories (every frame).
+    Returns (bytes freed, number of files replaced by links). Files that can't be linked,
+    e.g. on filesystems without hardlinks or files that are open on Windows, are skipped.
+    """
+    freed = linked = 0
+    for path in paths:
+        if os.path.isdir(path):
+            files = [entry.path for entry in os.scandir(path) if entry.is_file() and not entry.name.startswith(".")]
+        else:
+            files = [path]
+        for file_path in files:
+            try:
+                saved, _digest = deduplicate_file(file_path, blob_dir)
+            except OSError as e:
+                print(f"GMB Dedup: Skipped '{file_path}': {e}")
+                continue
+            if saved:
+                freed += saved
+                linked += 1
+    return freed, linked
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="gmb_dedup")
+    return _executor
+
+
+def deduplicate_in_background(paths, blob_dir):
+    """Queues the paths for deduplication on a background thread. Returns the future."""
+    return _get_executor().submit(deduplicate_outputs, list(paths), blob_dir)
+
+
+def _deduplicate_and_hash(path, blob_dir):
+    try:
+        _freed, digest = deduplicate_file(path, blob_dir)
+    except OSError as e:
+        print(f"GMB Dedup: Skipped '{path}': {e}")
+        digest = None
+    return digest or hash_file(path)
+
+
+def deduplicate_file_in_background(path, blob_dir):
+    """
+    Deduplicates one file on the background thread. Returns a future of its digest,
+    so callers that need the hash too (e.g. proxies) don't read the file a second time.
+    """
+    return _get_executor().submit(_deduplicate_and_hash, path, blob_dir)
+
+
+def hash_in_background(path):
+    """Hashes the file on the background thread. Returns a future of the digest."""
+    return _get_executor().submit(hash_file, path)
+
+
+def find_unused_blobs(blob_dir):
+    """Returns (path, size) for every stored blob that no output links to anymore."""
+    unused = []
+    try:
+        shards = [entry for entry in os.scandir(blob_dir) if entry.is_dir()]
+    except FileNotFoundError:
+        return unused
+    for shard in shards:
+        for entry in os.scandir(shard.path):
+            # os.stat, as DirEntry.stat() leaves st_nlink at 0 on Windows
+            stat = os.stat(entry.path)
+            if stat.st_nlink <= 1:
+                unused.append((entry.path, stat.st_size))
+    return unused
+
+
+def get_blob_linked_files(path):
+    """
+    Returns (st_dev, st_ino) of the files of an output (a file or an image-sequence directory)
+    that are linked by their blob and nothing else, i.e. whose blob is unused once they are removed.
+    """
+    if os.path.isdir(path):
+        files = [entry.path for entry in os.scandir(path) if entry.is_file()]
+    else:
+        files = [path]
+    inodes = set()
+    for file_path in files:
+        stat = os.stat(file_path)
+        if stat.st_nlink == 2:
+            inodes.add((stat.st_dev, stat.st_ino))
+    return inodes
+
+
+def release_blobs(inodes, blob_dir):
+    """
+    Removes the stored blobs of the given (st_dev, st_ino) that no output links to anymore.
+    Used after removing outputs, so their space is freed without waiting for a cleanup.
+    Returns the number of bytes freed.
+    """
+    wanted = {ino for _dev, ino in inodes}
+    freed = 0
+    try:
+        shards = [entry for entry in os.scandir(blob_dir) if entry.is_dir()]
+    except FileNotFoundError:
+        return freed
+    for shard in shards:
+        for entry in os.scandir(shard.path):
+            if entry.inode() not in wanted:
+                continue
+            stat = os.stat(entry.path)
+            if (stat.st_dev, stat.st_ino) in inodes and stat.st_nlink <= 1:
+                os.remove(entry.path)
+                freed += stat.st_size
+    return freed
@@ -0,0 +1,103 @@
+# VSE Generative Media Bridge
+# Copyright (C) 2024 Paul Siegfried
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Runner for the post-processing stage.
+# After a generator exits successfully, Blender writes a plan with the resolved 'post-process'
+# steps of each output and runs
+#
+#   python post_processor.py <plan.json>
+#
+# in place of the finished command. Each output's steps run one after another, each reading
+# the previous step's file; different outputs are processed in parallel (up to 'max_parallel').
+# The final file of every output and each step's cost (wall time, CPU time, peak memory) are
+# written to the plan's 'results' file for Blender to ingest and record.
+# It does not depend on Blender.
+
+import concurrent.futures
+import json
+import os
+import subprocess
+import sys
+import time
+
+
+def _run_step(command):
+    """Runs a step's command. Returns (exit code, cpu seconds, peak memory in MB or None)."""
+    process = subprocess.Popen(command, shell=False)
+    if not hasattr(os, "wait4"):
+        # No per-process usage on Windows
+        return process.wait(), None, None
+    _pid, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak_mb = usage.ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+    return process.returncode, usage.ru_utime + usage.ru_stime, peak_mb
+
+
+def process_output(name, output):
+    """Runs the steps of one output. Returns (final path or None, list of stage records)."""
+    stages = []
+    for step in output["steps"]:
+        print(f"Output '{name}': {step['name']} started", flush=True)
+        started = time.monotonic()
+        try:
+            exit_code, cpu_seconds, peak_mb = _run_step(step["command"])
+        except OSError as e:
+            print(f"Output '{name}': {step['name']} could not be started: {e}", file=sys.stderr, flush=True)
+            return None, stages
+        stages.append({
+            "output": name,
+            "step": step["name"],
+            "exit_code": exit_code,
+            "seconds": round(time.monotonic() - started, 3),
+            "cpu_seconds": round(cpu_seconds, 2) if cpu_seconds is not None else None,
+            "peak_memory_mb": round(peak_mb, 1) if peak_mb is not None else None,
+        })
+        if exit_code != 0 or not os.path.exists(step["output"]):
+            print(f"Output '{name}': {step['name']} failed with exit code {exit_code}", file=sys.stderr, flush=True)
+            return None, stages
+        print(f"Output '{name}': {step['name']} finished in {stages[-1]['seconds']:.1f}s", flush=True)
+    return output["steps"][-1]["output"], stages
+
+
+def main(plan_path):
+    with open(plan_path, 'r', encoding='utf-8') as f:
+        plan = json.load(f)
+
+    results = {"outputs": {}, "stages": []}
+    failed = False
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, plan.get("max_parallel", 1))) as pool:
+        futures = {name: pool.submit(process_output, name, output) for name, output in plan["outputs"].items()}
+        for name, future in futures.items():
+            final_path, stages = future.result()
+            results["stages"].extend(stages)
+            if final_path is None:
+                failed = True
+            else:
+                results["outputs"][name] = final_path
+
+    tmp_path = plan["results"] + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    os.replace(tmp_path, plan["results"])
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: post_processor.py <plan.json>", file=sys.stderr)
+        sys.exit(2)
+    sys.exit(main(sys.argv[1]))
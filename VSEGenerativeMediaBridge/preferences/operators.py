@@ -17,8 +17,9 @@
 import bpy
 import os
 from bpy.types import Operator
-from bpy.props import StringProperty
-from ..utils import get_prefs
+from bpy.props import StringProperty, BoolProperty
+from ..utils import get_prefs, get_yaml_parser
+from ..properties import populate_generator_config, get_config_mtime, invalidate_generator_info
 
 
 class GMB_OT_add_generator(Operator):
@@ -72,6 +73,103 @@ class GMB_OT_add_generator(Operator):
         return {'FINISHED'}
 
 
+def _normalize_config_path(filepath):
+    """Normalize a config path so the same file always maps to the same key."""
+    return os.path.normcase(os.path.abspath(bpy.path.abspath(filepath)))
+
+
+class GMB_OT_add_generator_folder(Operator):
+    """Add every generator YAML file found in a folder (and its sub-folders)."""
+    bl_idname = "gmb.generator_add_folder"
+    bl_label = "Register Generator Folder"
+    bl_options = {'REGISTER'}
+
+    directory: StringProperty(
+        name="Directory",
+        description="Folder to scan for YAML configuration files",
+        subtype='DIR_PATH'
+    )
+    recursive: BoolProperty(
+        name="Include Sub-folders",
+        description="Also scan sub-folders for YAML configuration files",
+        default=True
+    )
+
+    # Maximum number of individual errors included in the UI report; the full list goes to the console.
+    MAX_REPORTED_ERRORS = 5
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        if not self.directory or not os.path.isdir(self.directory):
+            self.report({'WARNING'}, "No folder selected.")
+            return {'CANCELLED'}
+
+        yaml_parser = get_yaml_parser()
+
+        prefs = get_prefs(context)
+        filepaths = yaml_parser.discover_config_files(self.directory, self.recursive)
+        if not filepaths:
+            self.report({'WARNING'}, f"No YAML files found in '{self.directory}'.")
+            return {'CANCELLED'}
+
+        # Set-based duplicate detection against the existing registry
+        known_paths = {_normalize_config_path(g.config_filepath) for g in prefs.generators if g.config_filepath}
+        known_names = {g.name for g in prefs.generators if g.name}
+
+        pending = []
+        duplicates = 0
+        for filepath in filepaths:
+            key = _normalize_config_path(filepath)
+            if key in known_paths:
+                duplicates += 1
+                continue
+            known_paths.add(key)
+            pending.append(filepath)
+
+        # Parse and validate on a worker pool; the registry itself is only touched on the main thread.
+        errors = []
+        added = 0
+        for filepath, parsed_data, error in yaml_parser.load_config_files(pending):
+            if error:
+                errors.append((filepath, error))
+                continue
+            if parsed_data.name in known_names:
+                errors.append((filepath, f"A generator named '{parsed_data.name}' is already registered."))
+                continue
+            known_names.add(parsed_data.name)
+
+            new_generator = prefs.generators.add()
+            # Assign through the ID property to skip 'update_config_filepath' re-parsing the file.
+            new_generator["config_filepath"] = filepath
+            new_generator.config_mtime = get_config_mtime(filepath)
+            populate_generator_config(new_generator, parsed_data)
+            added += 1
+
+        if added:
+            prefs.active_generator_index = len(prefs.generators) - 1
+
+        summary = f"Added {added} generator(s), skipped {duplicates} duplicate(s), {len(errors)} error(s)."
+        print(f"GMB Import: {summary}")
+        for filepath, error in errors:
+            print(f"GMB Import Error: '{filepath}': {error}")
+
+        if errors:
+            details = "; ".join(
+                f"{os.path.basename(filepath)}: {error.splitlines()[-1]}"
+                for filepath, error in errors[:self.MAX_REPORTED_ERRORS]
+            )
+            if len(errors) > self.MAX_REPORTED_ERRORS:
+                details += f"; ... {len(errors) - self.MAX_REPORTED_ERRORS} more (see console)"
+            self.report({'WARNING'}, f"{summary} {details}")
+        else:
+            self.report({'INFO'}, summary)
+
+        return {'FINISHED'} if added else {'CANCELLED'}
+
+
 class GMB_OT_remove_generator(Operator):
     """Remove the selected generator from the list."""
     bl_idname = "gmb.generator_remove"
@@ -87,6 +185,7 @@ class GMB_OT_remove_generator(Operator):
         prefs = get_prefs(context)
         index = prefs.active_generator_index
         prefs.generators.remove(index)
+        invalidate_generator_info()
         
         if index >= len(prefs.generators):
             prefs.active_generator_index = len(prefs.generators) - 1
@@ -94,9 +193,47 @@ class GMB_OT_remove_generator(Operator):
         return {'FINISHED'}
 
 
+class GMB_OT_add_resource_pool(Operator):
+    """Add a resource pool that limits how many generations can use a resource at once."""
+    bl_idname = "gmb.resource_pool_add"
+    bl_label = "Add Resource Pool"
+
+    def execute(self, context):
+        prefs = get_prefs(context)
+        pool = prefs.resource_pools.add()
+        pool.name = "gpu"
+        prefs.active_resource_pool_index = len(prefs.resource_pools) - 1
+        return {'FINISHED'}
+
+
+class GMB_OT_remove_resource_pool(Operator):
+    """Remove the selected resource pool."""
+    bl_idname = "gmb.resource_pool_remove"
+    bl_label = "Remove Resource Pool"
+
+    @classmethod
+    def poll(cls, context):
+        """Disable the button if the list is empty."""
+        prefs = get_prefs(context)
+        return len(prefs.resource_pools) > 0
+
+    def execute(self, context):
+        prefs = get_prefs(context)
+        index = prefs.active_resource_pool_index
+        prefs.resource_pools.remove(index)
+
+        if index >= len(prefs.resource_pools):
+            prefs.active_resource_pool_index = len(prefs.resource_pools) - 1
+
+        return {'FINISHED'}
+
+
 classes = (
     GMB_OT_add_generator,
+    GMB_OT_add_generator_folder,
     GMB_OT_remove_generator,
+    GMB_OT_add_resource_pool,
+    GMB_OT_remove_resource_pool,
 )
 
 
@@ -25,8 +25,17 @@ class GMB_UL_Generators(UIList):
         layout.prop(item, "name", text="", emboss=False, icon_value=icon)
 
 
+class GMB_UL_ResourcePools(UIList):
+    """UIList for editing the resource pools used by the scheduler."""
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        row = layout.row(align=True)
+        row.prop(item, "name", text="", emboss=False)
+        row.prop(item, "capacity", text="Capacity")
+
+
 classes = (
     GMB_UL_Generators,
+    GMB_UL_ResourcePools,
 )
 
 
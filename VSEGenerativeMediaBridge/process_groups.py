@@ -0,0 +1,162 @@
+# VSE Generative Media Bridge
+# Copyright (C) 2024 Paul Siegfried
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Process helpers shared by the executors and the standalone scripts next to them
+# (job_supervisor.py, spool_worker.py): starting commands in their own process group,
+# stopping whole groups with SIGTERM then SIGKILL, rlimit wrapping and atomic JSON state files.
+# The scripts import it from their own directory, so it must ship next to them.
+# It does not depend on Blender.
+
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+
+def write_json_atomic(path, data):
+    """Write JSON so readers never see a partial file."""
+    tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def new_process_group_kwargs():
+    """Popen arguments that start the command in its own session / process group."""
+    if os.name == 'posix':
+        return {"start_new_session": True}
+    return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+
+
+# --- Resource limits ---
+# Limits are applied by a tiny Python wrapper that sets them and then execs the command,
+# so they are in place before the command allocates anything and are inherited by
+# everything it spawns. (preexec_fn would do the same but isn't safe in threaded Blender.)
+
+_LIMIT_WRAPPER = (
+    "import os, sys, resource\n"
+    "max_memory_mb, nice = int(sys.argv[1]), int(sys.argv[2])\n"
+    "if max_memory_mb > 0:\n"
+    "    resource.setrlimit(resource.RLIMIT_AS, (max_memory_mb * 1024 * 1024,) * 2)\n"
+    "if nice:\n"
+    "    os.nice(nice)\n"
+    "os.execvp(sys.argv[3], sys.argv[3:])\n"
+)
+
+
+def limit_command(command_list, max_memory_mb=None, nice=None, python=None):
+    """
+    Returns the command wrapped so it runs with the given limits: an address space
+    limit (RLIMIT_AS) in MiB and a niceness increment. Limits need POSIX rlimits;
+    on other platforms the command is returned unchanged.
+    """
+    if not (max_memory_mb or nice) or os.name != 'posix':
+        return list(command_list)
+    return [python or sys.executable, "-I", "-c", _LIMIT_WRAPPER,
+            str(max_memory_mb or 0), str(nice or 0)] + list(command_list)
+
+
+# --- Process group termination ---
+# Cancelled or timed out commands get SIGTERM on their whole process group, then
+# SIGKILL once the grace period is over. This catches the grandchildren of wrapper
+# scripts (bash -> python -> ffmpeg) that would otherwise keep running and holding GPU memory.
+
+
+def group_exists(pgid):
+    try:
+        os.killpg(pgid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def is_group_running(process):
+    """Whether anything in the process group of a command started with new_process_group_kwargs() still runs."""
+    # poll() also reaps the direct child, so it doesn't linger as a zombie in the group
+    child_running = process.poll() is None
+    if os.name == 'posix':
+        return group_exists(process.pid)
+    return child_running
+
+
+def list_process_group(pgid):
+    """Returns the pids of the processes in a process group (Linux only, [] elsewhere)."""
+    pids = []
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return pids
+    for name in entries:
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", 'rb') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces, so split after its closing parenthesis:
+        # state, ppid, pgrp, ...
+        fields = stat[stat.rfind(b")") + 2:].split()
+        if len(fields) > 2 and int(fields[2]) == pgid:
+            pids.append(int(name))
+    return pids
+
+
+def send_stop(process):
+    """Asks the command's process group to stop (SIGTERM, or CTRL_BREAK on Windows)."""
+    try:
+        if os.name == 'posix':
+            os.killpg(process.pid, signal.SIGTERM)
+        else:
+            process.send_signal(signal.CTRL_BREAK_EVENT)
+    except (ProcessLookupError, OSError):
+        pass
+
+
+def force_kill(process):
+    """Kills the command's process group. Returns False if it was already gone."""
+    if os.name == 'posix':
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            return False
+    else:
+        # taskkill /T also takes down the children of the process
+        subprocess.run(["taskkill", "/T", "/F", "/PID", str(process.pid)],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return True
+
+
+def stop_process_group(process, grace_period):
+    """
+    SIGTERM the command's process group, then SIGKILL whatever is left after the grace period.
+    Blocks until the group is gone; Blender uses the non-blocking executors.terminate_process instead.
+    """
+    if not is_group_running(process):
+        return
+    send_stop(process)
+    deadline = time.monotonic() + grace_period
+    while time.monotonic() < deadline:
+        if not is_group_running(process):
+            return
+        time.sleep(0.1)
+    print(f"Process group {process.pid} ignored SIGTERM for {grace_period:g}s, killing it")
+    force_kill(process)
+    process.wait()
@@ -0,0 +1,168 @@
+# VSE Generative Media Bridge
+# Copyright (C) 2024 Paul Siegfried
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import bpy
+import os
+import io
+import time
+import functools
+from .utils import get_prefs
+
+
+class FunctionStats:
+    """Aggregated call counters for a single profiled function."""
+
+    def __init__(self, label):
+        self.label = label
+        self.calls = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, elapsed):
+        self.calls += 1
+        self.total_seconds += elapsed
+        if elapsed > self.max_seconds:
+            self.max_seconds = elapsed
+
+
+# label -> FunctionStats / cProfile.Profile
+_function_stats = {}
+_profiles = {}
+# Only one cProfile.Profile can be active at a time, so nested profiled calls
+# (e.g. _populate_outputs inside modal) only update their counters.
+_active_profile = None
+
+
+def is_profiling_enabled():
+    """Check the addon preferences for the profiling toggle."""
+    try:
+        return get_prefs(bpy.context).enable_profiling
+    except (KeyError, AttributeError):
+        return False
+
+
+def _profiled_call(label, func, *args):
+    global _active_profile
+
+    if not is_profiling_enabled():
+        return func(*args)
+
+    stats = _function_stats.get(label)
+    if stats is None:
+        stats = _function_stats[label] = FunctionStats(label)
+
+    profile = None
+    if _active_profile is None:
+        profile = _profiles.get(label)
+        if profile is None:
+            import cProfile
+            profile = _profiles[label] = cProfile.Profile()
+        _active_profile = profile
+        profile.enable()
+
+    start = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        stats.record(time.perf_counter() - start)
+        if profile is not None:
+            profile.disable()
+            _active_profile = None
+
+
+def profiled(label):
+    """
+    Decorator that records per-function stats while profiling is enabled.
+
+    Blender validates the argument count of registered callbacks (draw, modal, ...),
+    so the wrapper keeps the exact positional signature of the wrapped method.
+    """
+    def decorator(func):
+        if func.__code__.co_argcount == 3:
+            def wrapper(self, context, event):
+                return _profiled_call(label, func, self, context, event)
+        else:
+            def wrapper(self, context):
+                return _profiled_call(label, func, self, context)
+        return functools.update_wrapper(wrapper, func)
+    return decorator
+
+
+def reset_profile():
+    """Discard all collected stats."""
+    _function_stats.clear()
+    _profiles.clear()
+
+
+def format_summary():
+    """Build a text summary of the collected stats."""
+    import pstats
+
+    out = io.StringIO()
+    out.write(f"GMB profile summary ({time.strftime('%Y-%m-%d %H:%M:%S')})\n\n")
+    out.write(f"{'function':<40} {'calls':>8} {'total s':>10} {'mean ms':>10} {'max ms':>10}\n")
+    for stats in sorted(_function_stats.values(), key=lambda s: s.total_seconds, reverse=True):
+        mean_ms = (stats.total_seconds / stats.calls) * 1000.0 if stats.calls else 0.0
+        out.write(
+            f"{stats.label:<40} {stats.calls:>8} {stats.total_seconds:>10.3f} "
+            f"{mean_ms:>10.3f} {stats.max_seconds * 1000.0:>10.3f}\n"
+        )
+
+    for label, profile in sorted(_profiles.items()):
+        out.write(f"\n--- {label} (top 20 by cumulative time) ---\n")
+        try:
+            pstats.Stats(profile, stream=out).sort_stats('cumulative').print_stats(20)
+        except TypeError:
+            # Profile was created but never collected any data
+            out.write("No data collected.\n")
+    return out.getvalue()
+
+
+def dump_profile():
+    """
+    Writes the collected stats next to the .blend file.
+    Returns the (pstats_path, summary_path) tuple. pstats_path is None if no
+    cProfile data was collected.
+    """
+    if not bpy.data.is_saved:
+        raise ValueError("Project must be saved to dump profile data next to it.")
+    if not _function_stats:
+        raise ValueError("No profile data collected. Enable profiling in the addon preferences first.")
+
+    import pstats
+
+    blend_name, _ = os.path.splitext(bpy.data.filepath)
+    pstats_path = f"{blend_name}_gmb_profile.pstats"
+    summary_path = f"{blend_name}_gmb_profile.txt"
+
+    combined = None
+    for profile in _profiles.values():
+        try:
+            if combined is None:
+                combined = pstats.Stats(profile)
+            else:
+                combined.add(profile)
+        except TypeError:
+            continue
+    if combined is not None:
+        combined.dump_stats(pstats_path)
+    else:
+        pstats_path = None
+
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        f.write(format_summary())
+
+    return pstats_path, summary_path
@@ -0,0 +1,96 @@
+# VSE Generative Media Bridge
+# Copyright (C) 2024 Paul Siegfried
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Keeps Scene.gmb_strip_properties small in saved projects.
+# Before a file is saved, entries whose strip no longer exists are removed, and the
+# transient fields of the remaining entries (log history, runtime) are left out of the
+# file: they are cleared before the save and put back once it is written.
+
+import bpy
+from bpy.app.handlers import persistent
+
+# (strip_props, log lines, runtime_seconds) of the entries cleared for the current save
+_stashed_fields = []
+
+
+def prune_strip_properties(scene):
+    """
+    Removes the scene's strip property entries that no strip uses anymore. Returns how many were removed.
+    Removing entries moves the others in memory, which would invalidate the references running
+    generations hold, so scenes with a running or queued generation are left for a later save.
+    """
+    entries = scene.gmb_strip_properties
+    if any(props.status in {'RUNNING', 'QUEUED'} for props in entries):
+        return 0
+    strip_ids = set()
+    if scene.sequence_editor:
+        strip_ids = {strip.get("gmb_id") for strip in scene.sequence_editor.sequences_all}
+    stale = [index for index, props in enumerate(entries) if props.id not in strip_ids]
+    for index in reversed(stale):
+        entries.remove(index)
+    return len(stale)
+
+
+def _stash_transient_fields():
+    for scene in bpy.data.scenes:
+        for strip_props in scene.gmb_strip_properties:
+            if not strip_props.log_history and not strip_props.runtime_seconds:
+                continue
+            lines = [entry.line for entry in strip_props.log_history]
+            _stashed_fields.append((strip_props, lines, strip_props.runtime_seconds))
+            strip_props.log_history.clear()
+            strip_props.runtime_seconds = 0.0
+
+
+@persistent
+def _on_save_pre(*_args):
+    _stashed_fields.clear()
+    removed = sum(prune_strip_properties(scene) for scene in bpy.data.scenes)
+    if removed:
+        print(f"GMB: Removed {removed} unused strip property entr{'y' if removed == 1 else 'ies'} before saving")
+    _stash_transient_fields()
+
+
+@persistent
+def _on_save_post(*_args):
+    for strip_props, lines, runtime_seconds in _stashed_fields:
+        for line in lines:
+            strip_props.log_history.add().line = line
+        strip_props.runtime_seconds = runtime_seconds
+    _stashed_fields.clear()
+
+
+def _get_restore_handlers():
+    # save_post_fail (Blender 4.2+) restores the fields when writing the file fails
+    handlers = [bpy.app.handlers.save_post]
+    if hasattr(bpy.app.handlers, "save_post_fail"):
+        handlers.append(bpy.app.handlers.save_post_fail)
+    return handlers
+
+
+def register():
+    bpy.app.handlers.save_pre.append(_on_save_pre)
+    for handlers in _get_restore_handlers():
+        handlers.append(_on_save_post)
+
+
+def unregister():
+    if _on_save_pre in bpy.app.handlers.save_pre:
+        bpy.app.handlers.save_pre.remove(_on_save_pre)
+    for handlers in _get_restore_handlers():
+        if _on_save_post in handlers:
+            handlers.remove(_on_save_post)
+    _stashed_fields.clear()
@@ -15,11 +15,11 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import bpy
+import os
 import uuid
 from bpy.props import StringProperty, CollectionProperty, IntProperty, BoolProperty, EnumProperty, FloatProperty
 from bpy.types import PropertyGroup, AddonPreferences, Scene
-from .yaml_parser import parse_yaml_config
-from .utils import get_strip_by_uuid
+from .utils import get_strip_by_uuid, get_yaml_parser
 
 
 def set_ui_strip_name(self, strip_name):
@@ -62,6 +62,93 @@ def get_gmb_strip_properties_from_id(context, gmb_id):
     return None
 
 
+# Derived data of the generator configs for the sidebar, keyed by generator name.
+# Entries remember the config's index in prefs.generators and are checked against it on use,
+# so removed or renamed generators miss; reloaded configs clear the cache (populate_generator_config).
+_generator_info_cache = {}
+# The add-generator menu structure, cleared along with the cache above
+_generator_menu = None
+
+
+def invalidate_generator_info():
+    global _generator_menu
+    _generator_info_cache.clear()
+    _generator_menu = None
+
+
+def get_generator_info(context, generator_name):
+    """
+    Returns (config, info) for a generator, or (None, None) if there is none with that name.
+    info is a dict with 'input_types' (input name -> type), 'required_inputs' (names, in config order)
+    and 'has_draft', computed once per config instead of on every redraw.
+    """
+    generators = context.preferences.addons[__package__].preferences.generators
+    info = _generator_info_cache.get(generator_name)
+    if info is not None:
+        index = info["index"]
+        if index < len(generators) and generators[index].name == generator_name:
+            return generators[index], info
+
+    for index, config in enumerate(generators):
+        if config.name == generator_name:
+            info = _generator_info_cache[generator_name] = {
+                "index": index,
+                "input_types": {input_prop.name: input_prop.type for input_prop in config.inputs},
+                "required_inputs": [input_prop.name for input_prop in config.inputs if input_prop.required],
+                "has_draft": config.has_draft,
+            }
+            return config, info
+    return None, None
+
+
+def has_all_required_inputs(gmb_props, info):
+    """True if every required input of the generator has a strip, file or text set."""
+    links = {link.name: link for link in gmb_props.linked_inputs}
+    for name in info["required_inputs"]:
+        link = links.get(name)
+        if not link:
+            return False
+        if link.input_mode == 'STRIP' and not link.linked_strip_uuid:
+            return False
+        if link.input_mode == 'FILE' and not link.filepath:
+            return False
+        if link.input_mode == 'TEXT' and not link.text_value:
+            return False
+    return True
+
+
+def get_generator_menu(context):
+    """
+    Returns the add-generator menu structure, built once per registry state:
+    'categories' (sorted (category, [generator names]) pairs), 'uncategorized' (names) and
+    'search_items' (enum items for the search popup, labelled with category and tags).
+    """
+    global _generator_menu
+    generators = context.preferences.addons[__package__].preferences.generators
+    if _generator_menu is not None and _generator_menu["count"] == len(generators):
+        return _generator_menu
+
+    categories = {}
+    uncategorized = []
+    search_items = []
+    for index, config in enumerate(generators):
+        if config.category:
+            categories.setdefault(config.category, []).append(config.name)
+        else:
+            uncategorized.append(config.name)
+        label = f"{config.category} > {config.name}" if config.category else config.name
+        if config.tags:
+            label += f"  ({config.tags})"
+        search_items.append((config.name, label, config.description, index))
+    _generator_menu = {
+        "count": len(generators),
+        "categories": sorted(categories.items(), key=lambda item: item[0].lower()),
+        "uncategorized": uncategorized,
+        "search_items": search_items,
+    }
+    return _generator_menu
+
+
 def get_gmb_config_from_strip_properties(context, strip_props):
     """Finds the full GMB_GeneratorConfig based on the name stored in a strip's properties."""
     if not strip_props or not strip_props.generator_name:
@@ -80,14 +167,26 @@ def update_config_filepath(self, context):
     It reads the file, parses the YAML, and populates the structured properties.
     """
     # Clear any previously parsed data to ensure a clean state
+    invalidate_generator_info()
     self.name = ""
     self.description = ""
+    self.has_draft = False
+    self.has_batch = False
+    self.batch_max_size = 0
+    self.category = ""
+    self.tags = ""
     self.inputs.clear()
     self.outputs.clear()
 
     if not self.config_filepath:
         return
 
+    # Remember which version of the file this snapshot was taken from (used by the config watcher)
+    self.config_mtime = get_config_mtime(self.config_filepath)
+
+    # Loaded on first use to keep addon startup light
+    parse_yaml_config = get_yaml_parser().parse_yaml_config
+
     try:
         with open(self.config_filepath, 'r') as f:
             yaml_string = f.read()
@@ -105,14 +204,39 @@ def update_config_filepath(self, context):
         self.name = "Invalid/Unparsed YAML"
         return
 
+    populate_generator_config(self, parsed_data)
+
+
+def get_config_mtime(filepath):
+    """
+    Returns the modification time of a config file in nanoseconds as a string, or "" if it can't be read.
+    A string, as a FloatProperty (float32) can't hold a current timestamp exactly.
+    """
+    try:
+        return str(os.stat(bpy.path.abspath(filepath)).st_mtime_ns)
+    except OSError:
+        return ""
+
+
+def populate_generator_config(config, parsed_data):
+    """
+    Populates a GMB_GeneratorConfig's structured properties from a parsed GeneratorConfig object.
+    The caller is responsible for clearing any previously parsed data.
+    """
+    invalidate_generator_info()
     # Populate the name and description from the GeneratorConfig object
-    self.name = parsed_data.name
-    self.description = parsed_data.description or ""
+    config.name = parsed_data.name
+    config.description = parsed_data.description or ""
+    config.has_draft = bool(parsed_data.command and parsed_data.command.draft)
+    config.has_batch = bool(parsed_data.command and parsed_data.command.batch)
+    config.batch_max_size = (parsed_data.command.batch.max_size or 0) if config.has_batch else 0
+    config.category = parsed_data.category or ""
+    config.tags = ", ".join(parsed_data.tags)
 
     # Populate the 'input' properties from the GeneratorConfig object
     if parsed_data.properties and parsed_data.properties.input:
         for prop_data in parsed_data.properties.input:
-            item = self.inputs.add()
+            item = config.inputs.add()
             item.name = prop_data.name
             item.type = prop_data.type.upper()
             item.pass_via = prop_data.pass_via.upper()
@@ -121,14 +245,41 @@ def update_config_filepath(self, context):
     # Populate the 'output' properties from the GeneratorConfig object
     if parsed_data.properties and parsed_data.properties.output:
         for prop_data in parsed_data.properties.output:
-            item = self.outputs.add()
+            item = config.outputs.add()
             item.name = prop_data.name
-            item.type = prop_data.type.upper()
+            item.type = prop_data.type.upper().replace('-', '_')
             item.pass_via = prop_data.pass_via.upper()
             item.file_ext = prop_data.file_ext or ""
             item.required = prop_data.required
 
 
+def reconcile_linked_inputs(strip_props, gen_config):
+    """
+    Brings a strip's linked_inputs in line with the generator's current input definitions.
+    Links for removed inputs are dropped, links for new inputs are added, and the order
+    follows the config. Existing links keep their mode and values.
+    """
+    input_names = [input_prop.name for input_prop in gen_config.inputs]
+    wanted = set(input_names)
+
+    # Remove links that no longer match an input (iterate backwards to keep indices valid)
+    for index in range(len(strip_props.linked_inputs) - 1, -1, -1):
+        if strip_props.linked_inputs[index].name not in wanted:
+            strip_props.linked_inputs.remove(index)
+
+    existing = {link.name for link in strip_props.linked_inputs}
+    for name in input_names:
+        if name not in existing:
+            link = strip_props.linked_inputs.add()
+            link.name = name
+
+    # Reorder to match the config
+    for target_index, name in enumerate(input_names):
+        current_index = next(i for i, link in enumerate(strip_props.linked_inputs) if link.name == name)
+        if current_index != target_index:
+            strip_props.linked_inputs.move(current_index, target_index)
+
+
 class GMB_InputProperty(PropertyGroup):
     """A parsed 'input' property from the YAML config."""
     name: StringProperty(name="Name")
@@ -160,6 +311,7 @@ class GMB_OutputProperty(PropertyGroup):
         items=[
             ('TEXT', "Text", "Text data"),
             ('IMAGE', "Image", "Image media"),
+            ('IMAGE_SEQUENCE', "Image Sequence", "A directory of numbered image frames"),
             ('SOUND', "Sound", "Sound media"),
             ('MOVIE', "Movie", "Movie media"),
         ]
@@ -261,6 +413,7 @@ class GMB_StripProperties(PropertyGroup):
         name="Status",
         items=[
             ('READY', "Ready", "Ready to start the process."),
+            ('QUEUED', "Queued", "Waiting for a free slot to start the process."),
             ('RUNNING', "Running", "The generative process is running."),
             ('FINISHED', "Finished", "The generative process has finished successfully."),
             ('ERROR', "Error", "An error occurred during the process."),
@@ -268,6 +421,36 @@ class GMB_StripProperties(PropertyGroup):
         default='READY'
     )
 
+    peak_memory_mb: FloatProperty(
+        name="Peak Memory (MB)",
+        description="Peak resident memory of the last run's process tree",
+        default=0.0
+    )
+
+    cpu_seconds: FloatProperty(
+        name="CPU Time (s)",
+        description="CPU time used by the last run's process tree",
+        default=0.0
+    )
+
+    io_read_mb: FloatProperty(
+        name="Read (MB)",
+        description="Bytes the last run's process tree read from storage",
+        default=0.0
+    )
+
+    io_write_mb: FloatProperty(
+        name="Written (MB)",
+        description="Bytes the last run's process tree wrote to storage",
+        default=0.0
+    )
+
+    queue_seconds: FloatProperty(
+        name="Queue Time",
+        description="Time the last run waited in the queue before it started",
+        default=0.0
+    )
+
     runtime_seconds: FloatProperty(
         name="Runtime",
         description="Elapsed time for the running process in seconds",
@@ -275,6 +458,32 @@ class GMB_StripProperties(PropertyGroup):
         precision=1
     )
 
+    # Active rows of the sidebar lists
+    active_input_index: IntProperty(default=0)
+    active_output_index: IntProperty(default=0)
+    active_log_index: IntProperty(default=0)
+
+    quality: EnumProperty(
+        name="Quality",
+        description="Quality to generate at. Draft uses the generator's 'draft' arguments",
+        items=[
+            ('FINAL', "Final", "Generate at full quality"),
+            ('DRAFT', "Draft", "Generate a quick preview using the generator's draft arguments"),
+        ],
+        default='FINAL'
+    )
+
+    output_quality: EnumProperty(
+        name="Output Quality",
+        description="Quality of the output currently shown by the strip",
+        items=[
+            ('NONE', "None", "Nothing has been generated yet"),
+            ('FINAL', "Final", "The strip shows a final-quality output"),
+            ('DRAFT', "Draft", "The strip shows a draft output"),
+        ],
+        default='NONE'
+    )
+
 
 class GMB_GeneratorConfig(PropertyGroup):
     """A generator configuration."""
@@ -286,17 +495,60 @@ class GMB_GeneratorConfig(PropertyGroup):
         name="Description",
         description="A description of what the generator does, read from the YAML file."
     )
+    category: StringProperty(
+        name="Category",
+        description="Submenu of the Add > Generative Media menu the generator is listed in, read from the YAML file"
+    )
+    tags: StringProperty(
+        name="Tags",
+        description="Comma-separated search keywords, read from the YAML file"
+    )
     config_filepath: StringProperty(
         name="Config File",
         description="Path to the YAML configuration file for the generator.",
         subtype='FILE_PATH',
         update=update_config_filepath
     )
+    config_mtime: StringProperty(
+        name="Config Modification Time",
+        description="Modification time of the config file when it was last parsed, in nanoseconds",
+        default=""
+    )
+    has_draft: BoolProperty(
+        name="Has Draft Mode",
+        description="Whether the generator defines draft-quality arguments",
+        default=False
+    )
+    has_batch: BoolProperty(
+        name="Has Batch Mode",
+        description="Whether the generator can generate many strips in one run",
+        default=False
+    )
+    batch_max_size: IntProperty(
+        name="Maximum Batch Size",
+        description="Maximum number of strips per batch run (0 for no limit)",
+        default=0,
+        min=0
+    )
     # Collections to store the parsed YAML data
     inputs: CollectionProperty(type=GMB_InputProperty)
     outputs: CollectionProperty(type=GMB_OutputProperty)
 
 
+class GMB_ResourcePool(PropertyGroup):
+    """A pool of a resource shared by all generations, e.g. GPUs or RAM."""
+    name: StringProperty(
+        name="Resource",
+        description="Resource name, as used in the 'resources' section of generator YAML files"
+    )
+    capacity: FloatProperty(
+        name="Capacity",
+        description="Total amount of the resource available to generations running at the same time",
+        default=1.0,
+        min=0.0
+    )
+
+
 class GMB_AddonPreferences(AddonPreferences):
     """Addon preferences for VSE Generative Media Bridge."""
     bl_idname = __package__
@@ -319,6 +571,130 @@ class GMB_AddonPreferences(AddonPreferences):
         min=0
     )
 
+    termination_grace_period: FloatProperty(
+        name="Termination Grace Period (s)",
+        description="When a generation is cancelled or times out, its processes get SIGTERM and are killed "
+                    "if they are still running after this many seconds",
+        default=5.0,
+        min=0.0
+    )
+
+    ffmpeg_executable: StringProperty(
+        name="FFmpeg Executable",
+        description="ffmpeg used to join the chunks of chunked generations and to trim linked inputs. "
+                    "A bare name is looked up on the PATH",
+        default="ffmpeg",
+        subtype='FILE_PATH'
+    )
+
+    output_layout: EnumProperty(
+        name="Output Layout",
+        description="How generated media is arranged in the project's <blend name>_vse_gmb directory",
+        items=[
+            ('FLAT', "Flat", "All generated files in one directory"),
+            ('SHARDED', "Sharded", "Files in nested directories named after their ID (ab/cd/...), "
+                                   "for projects with tens of thousands of outputs"),
+        ],
+        default='FLAT'
+    )
+
+    deduplicate_outputs: BoolProperty(
+        name="Deduplicate Outputs",
+        description="Hash new outputs in the background and hardlink byte-identical ones to a single stored copy",
+        default=True
+    )
+
+    build_proxies: BoolProperty(
+        name="Build Proxies for Movies",
+        description="Build sequencer proxies and a timecode index for generated movies in the background after they are ingested",
+        default=False
+    )
+
+    proxy_sizes: EnumProperty(
+        name="Proxy Sizes",
+        description="Proxy resolutions to build for generated movies",
+        items=[
+            ('25', "25%", "Build a 25% proxy"),
+            ('50', "50%", "Build a 50% proxy"),
+            ('75', "75%", "Build a 75% proxy"),
+            ('100', "100%", "Build a 100% proxy"),
+        ],
+        options={'ENUM_FLAG'},
+        default={'25', '50'}
+    )
+
+    trim_linked_inputs: EnumProperty(
+        name="Trim Linked Inputs",
+        description="Pass generators only the visible part of trimmed movie and sound strips, "
+                    "cut into clips that are cached next to the project",
+        items=[
+            ('OFF', "Off", "Pass the whole source file"),
+            ('COPY', "Stream Copy", "Fast and lossless, but the clip starts at the keyframe before the visible range"),
+            ('ACCURATE', "Re-encode", "Frame-exact clips, slower to create"),
+        ],
+        default='OFF'
+    )
+
+    enable_profiling: BoolProperty(
+        name="Enable Profiling",
+        description="Collect per-function timing stats for the generation modal loop, output population and UI drawing",
+        default=False
+    )
+
+    max_concurrent_jobs: IntProperty(
+        name="Max Concurrent Jobs",
+        description="Maximum number of generations running at once. Further runs wait in a queue. A value of 0 disables the limit.",
+        default=0,
+        min=0
+    )
+
+    executor: EnumProperty(
+        name="Executor",
+        description="Where generation commands run",
+        items=[
+            ('LOCAL', "Local", "Run generation commands as subprocesses of Blender"),
+            ('SPOOL', "Spool Directory", "Write jobs to a shared spool directory for spool_worker.py to run on another node"),
+        ],
+        default='LOCAL'
+    )
+
+    spool_directory: StringProperty(
+        name="Spool Directory",
+        description="Shared directory that Blender and the spool workers can both read and write",
+        subtype='DIR_PATH'
+    )
+
+    detach_jobs: BoolProperty(
+        name="Keep Jobs Running After Closing",
+        description="Run local generations under a supervisor process so they survive Blender closing or crashing. "
+                    "They are reattached, or their outputs ingested, when the project is opened again",
+        default=False
+    )
+
+    resource_pools: CollectionProperty(
+        name="Resource Pools",
+        description="Capacity of the resources that generators declare in their 'resources' section",
+        type=GMB_ResourcePool
+    )
+
+    active_resource_pool_index: IntProperty(
+        name="Active Resource Pool Index",
+        default=0
+    )
+
+    watch_configs: BoolProperty(
+        name="Reload Changed Configs",
+        description="Watch registered YAML files and re-register generators whose file changed",
+        default=True
+    )
+
+    config_watch_interval: FloatProperty(
+        name="Check Interval (s)",
+        description="How often to check registered YAML files for changes",
+        default=2.0,
+        min=0.25
+    )
+
     def draw(self, context):
         """Draw the preferences panel."""
         layout = self.layout
@@ -337,6 +713,8 @@ class GMB_AddonPreferences(AddonPreferences):
         button_col = list_row.column(align=True)
         button_col.operator("gmb.generator_add", icon='ADD', text="")
         button_col.operator("gmb.generator_remove", icon='REMOVE', text="")
+        button_col.separator()
+        button_col.operator("gmb.generator_add_folder", icon='FILE_FOLDER', text="")
         
         # --- Properties drawn below the list ---
         if self.generators and self.active_generator_index < len(self.generators):
@@ -362,6 +740,56 @@ class GMB_AddonPreferences(AddonPreferences):
         box = layout.box()
         box.label(text="Global Settings")
         box.prop(self, "global_timeout")
+        box.prop(self, "termination_grace_period")
+        box.prop(self, "ffmpeg_executable")
+        box.prop(self, "trim_linked_inputs")
+        row = box.row()
+        row.prop(self, "build_proxies")
+        sub = row.row()
+        sub.active = self.build_proxies
+        sub.prop(self, "proxy_sizes")
+        row = box.row()
+        row.prop(self, "output_layout")
+        row.operator("gmb.migrate_output_layout", text="Migrate Open Project")
+        row = box.row()
+        row.prop(self, "deduplicate_outputs")
+        row.operator("gmb.deduplicate_outputs", text="Deduplicate Open Project")
+        box.operator("gmb.collect_orphaned_outputs", icon='TRASH')
+        box.prop(self, "max_concurrent_jobs")
+        box.prop(self, "executor")
+        if self.executor == 'SPOOL':
+            box.prop(self, "spool_directory")
+        else:
+            box.prop(self, "detach_jobs")
+        row = box.row()
+        row.prop(self, "watch_configs")
+        sub = row.row()
+        sub.active = self.watch_configs
+        sub.prop(self, "config_watch_interval")
+
+        # --- Resource Pools ---
+        box = layout.box()
+        box.label(text="Resource Pools")
+        pool_row = box.row()
+        pool_row.template_list(
+            "GMB_UL_ResourcePools",
+            "",
+            self,
+            "resource_pools",
+            self,
+            "active_resource_pool_index",
+            rows=2
+        )
+        button_col = pool_row.column(align=True)
+        button_col.operator("gmb.resource_pool_add", icon='ADD', text="")
+        button_col.operator("gmb.resource_pool_remove", icon='REMOVE', text="")
+
+        # --- Diagnostics ---
+        box = layout.box()
+        box.label(text="Diagnostics")
+        row = box.row(align=True)
+        row.prop(self, "enable_profiling")
+        row.operator("gmb.dump_profile", icon='FILE_TEXT')
 
 classes = (
     GMB_InputLink,
@@ -371,6 +799,7 @@ classes = (
     GMB_LogEntry,
     GMB_StripProperties,
     GMB_GeneratorConfig,
+    GMB_ResourcePool,
     GMB_AddonPreferences,
 )
 
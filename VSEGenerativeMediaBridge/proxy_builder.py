@@ -0,0 +1,165 @@
+# VSE Generative Media Bridge
+# Copyright (C) 2024 Paul Siegfried
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Builds sequencer proxies for newly ingested movie outputs.
+# The movie is hashed on a background thread first, reusing the digest of its deduplication
+# pass when there is one so the file isn't read twice. Proxies are stored per content hash
+# (<output dir>/.gmb_proxies/<digest>) and never overwritten, so a regeneration that
+# produced the same movie reuses the proxies built before. The build itself runs as
+# Blender's own proxy job, with its progress shown in the status bar.
+
+import os
+import time
+import bpy
+
+POLL_INTERVAL = 0.5
+PROXY_DIR_NAME = ".gmb_proxies"
+
+# Movies waiting for their hash: (scene name, gmb_id, filepath, future)
+_pending_builds = []
+
+
+def queue_proxy_build(scene, gmb_id, filepath, digest_future=None):
+    """
+    Builds proxies for the movie strip with the given gmb_id once its file is hashed, if enabled.
+    digest_future is the future of a deduplication pass over the file (see utils.deduplicate_new_output);
+    the file is only hashed separately without one.
+    """
+    from .utils import get_prefs
+
+    prefs = get_prefs(bpy.context)
+    # Background (render farm) sessions have no Sequencer to build from
+    if bpy.app.background or not prefs.build_proxies or not prefs.proxy_sizes:
+        return
+    future = digest_future
+    if future is None:
+        from . import output_dedup
+        future = output_dedup.hash_in_background(filepath)
+    _pending_builds.append((scene.name, gmb_id, filepath, future))
+    if not bpy.app.timers.is_registered(_start_ready_builds):
+        bpy.app.timers.register(_start_ready_builds, first_interval=POLL_INTERVAL)
+
+
+def _find_movie_strip(scene, gmb_id, filepath):
+    """The scene's movie strip showing the file, or None if it was deleted or regenerated meanwhile."""
+    if not scene.sequence_editor:
+        return None
+    for strip in scene.sequence_editor.sequences_all:
+        if strip.type == 'MOVIE' and strip.get("gmb_id") == gmb_id \
+                and os.path.normpath(bpy.path.abspath(strip.filepath)) == os.path.normpath(filepath):
+            return strip
+    return None
+
+
+def _build_proxies(scene, strip, digest):
+    from .utils import get_prefs, get_project_output_dir, find_sequencer
+
+    target = find_sequencer(scene)
+    if target is None:
+        return False
+    prefs = get_prefs(bpy.context)
+    strip.use_proxy = True
+    proxy = strip.proxy
+    for size in ('25', '50', '75', '100'):
+        setattr(proxy, f"build_{size}", size in prefs.proxy_sizes)
+    proxy.build_record_run = True
+    proxy.use_overwrite = False
+    proxy.use_proxy_custom_directory = True
+    proxy.directory = os.path.join(get_project_output_dir(create=False), PROXY_DIR_NAME, digest, "")
+
+    # The proxy operator works on the selected strips
+    sequences = scene.sequence_editor.sequences_all
+    selection = [s for s in sequences if s.select]
+    for s in selection:
+        s.select = False
+    strip.select = True
+    window, area, region = target
+    try:
+        with bpy.context.temp_override(window=window, area=area, region=region):
+            bpy.ops.sequencer.rebuild_proxy()
+    finally:
+        strip.select = False
+        for s in selection:
+            s.select = True
+    print(f"GMB Proxies: Building {', '.join(sorted(prefs.proxy_sizes, key=int))}% proxies for '{strip.name}'")
+    return True
+
+
+def _start_ready_builds():
+    """Timer callback that starts the proxy builds of hashed movies. Returns None when nothing is left."""
+    still_pending = []
+    for scene_name, gmb_id, filepath, future in _pending_builds:
+        if not future.done():
+            still_pending.append((scene_name, gmb_id, filepath, future))
+            continue
+        scene = bpy.data.scenes.get(scene_name)
+        strip = _find_movie_strip(scene, gmb_id, filepath) if scene else None
+        if strip is None:
+            continue
+        try:
+            digest = future.result()
+        except OSError as e:
+            print(f"GMB Proxies: Could not hash '{filepath}': {e}")
+            continue
+        # The build needs a Sequencer showing the scene; wait for one
+        if not _build_proxies(scene, strip, digest):
+            still_pending.append((scene_name, gmb_id, filepath, future))
+    _pending_builds[:] = still_pending
+    return POLL_INTERVAL if still_pending else None
+
+
+def find_unused_proxies(output_dir, max_age):
+    """
+    Returns (path, size) for every proxy directory that no movie strip in the open project uses
+    and that hasn't been written to for max_age seconds (so strips restored with Undo keep theirs).
+    """
+    proxy_root = os.path.join(output_dir, PROXY_DIR_NAME)
+    try:
+        entries = [entry for entry in os.scandir(proxy_root) if entry.is_dir()]
+    except FileNotFoundError:
+        return []
+    used = set()
+    for scene in bpy.data.scenes:
+        if not scene.sequence_editor:
+            continue
+        for strip in scene.sequence_editor.sequences_all:
+            if strip.type == 'MOVIE' and strip.use_proxy and strip.proxy.use_proxy_custom_directory:
+                used.add(os.path.normcase(os.path.normpath(bpy.path.abspath(strip.proxy.directory))))
+
+    now = time.time()
+    unused = []
+    for entry in entries:
+        if os.path.normcase(os.path.normpath(entry.path)) in used:
+            continue
+        size = 0
+        newest = entry.stat().st_mtime
+        for root, _dirs, files in os.walk(entry.path):
+            for name in files:
+                try:
+                    stat = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                size += stat.st_size
+                newest = max(newest, stat.st_mtime)
+        if now - newest >= max_age:
+            unused.append((entry.path, size))
+    return unused
+
+
+def unregister():
+    _pending_builds.clear()
+    if bpy.app.timers.is_registered(_start_ready_builds):
+        bpy.app.timers.unregister(_start_ready_builds)
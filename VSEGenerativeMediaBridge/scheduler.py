@@ -0,0 +1,122 @@
+# VSE Generative Media Bridge
+# Copyright (C) 2024 Paul Siegfried
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Admission control for generation jobs.
+# Each GMB_OT_generate_media run asks for a slot before launching its process and
+# waits in the 'QUEUED' state until one is free. A job is admitted when a job slot is
+# free and its resource demands (from the generator's 'resources' section) fit in the
+# capacity pools configured in the addon preferences.
+#
+# Jobs are admitted in request order, except that a later job may start ahead of
+# blocked ones if it fits in what is left after reserving their demands. A large job
+# waiting for a GPU therefore doesn't hold up small CPU-only jobs, and can't be starved
+# by a stream of smaller GPU jobs either.
+# This module is imported lazily on the first generation.
+
+import time
+
+# Job ids (strip gmb_ids) currently holding a slot, mapped to their resource demands.
+_running = {}
+# Job ids waiting for a slot, in request order, and their resource demands.
+_waiting = []
+_waiting_demands = {}
+# time.monotonic() when each waiting job was queued, and how long running jobs waited.
+_queued_at = {}
+_waited = {}
+
+
+def get_unsatisfiable_resources(demands, capacities):
+    """Returns the names of resources whose demand exceeds the pool's total capacity."""
+    return [
+        name for name, amount in demands.items()
+        if name in capacities and amount > capacities[name]
+    ]
+
+
+def _fits(demands, free):
+    # Resources without a configured pool are not limited
+    return all(amount <= free[name] for name, amount in demands.items() if name in free)
+
+
+def request_slot(job_id, max_jobs, demands=None, capacities=None):
+    """
+    Ask for a slot for the given job. Returns True once the job is admitted.
+    max_jobs <= 0 means no limit on the number of jobs. demands maps resource names
+    to the amount the job needs, capacities maps pool names to their total capacity.
+    Jobs that are not admitted are queued and should ask again on their next tick.
+    """
+    if job_id in _running:
+        return True
+    if job_id not in _waiting_demands:
+        _waiting.append(job_id)
+        _waiting_demands[job_id] = dict(demands or {})
+        _queued_at[job_id] = time.monotonic()
+
+    capacities = capacities or {}
+    free = {
+        name: capacity - sum(used.get(name, 0.0) for used in _running.values())
+        for name, capacity in capacities.items()
+    }
+    jobs = len(_running)
+
+    for waiting_id in _waiting:
+        waiting_demands = _waiting_demands[waiting_id]
+        if waiting_id == job_id:
+            if (max_jobs > 0 and jobs >= max_jobs) or not _fits(waiting_demands, free):
+                return False
+            break
+        # Reserve what the jobs ahead of us need
+        jobs += 1
+        for name, amount in waiting_demands.items():
+            if name in free:
+                free[name] -= amount
+
+    _waiting.remove(job_id)
+    _running[job_id] = _waiting_demands.pop(job_id)
+    _waited[job_id] = time.monotonic() - _queued_at.pop(job_id)
+    return True
+
+
+def claim_slot(job_id, demands=None):
+    """Record a job that is already running (e.g. a reattached detached job) without queueing it."""
+    release_slot(job_id)
+    _running[job_id] = dict(demands or {})
+    _waited[job_id] = 0.0
+
+
+def release_slot(job_id):
+    """Release a job's slot, or remove it from the queue if it was never admitted."""
+    _running.pop(job_id, None)
+    _waited.pop(job_id, None)
+    if job_id in _waiting_demands:
+        _waiting.remove(job_id)
+        del _waiting_demands[job_id]
+        del _queued_at[job_id]
+
+
+def get_queue_position(job_id):
+    """Returns the 1-based position of a waiting job, or 0 if it isn't waiting."""
+    try:
+        return _waiting.index(job_id) + 1
+    except ValueError:
+        return 0
+
+
+def get_wait_seconds(job_id):
+    """Seconds the job has spent (or spent, once admitted) waiting in the queue."""
+    if job_id in _queued_at:
+        return time.monotonic() - _queued_at[job_id]
+    return _waited.get(job_id, 0.0)
@@ -0,0 +1,148 @@
+# VSE Generative Media Bridge
+# Copyright (C) 2024 Paul Siegfried
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Reference worker for the spool directory executor.
+# It does not depend on Blender and can run on any node that sees the spool directory,
+# together with process_groups.py, which it imports from its own directory:
+#
+#   python spool_worker.py /mnt/shared/gmb_spool
+#   python spool_worker.py /mnt/shared/gmb_spool --once      # run at most one job, then exit
+#
+# Jobs are claimed by atomically renaming pending/<id>.json to claimed/<id>.json, so any
+# number of workers can share a spool directory. Results are written to done/<id>.json.
+
+import argparse
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import time
+
+# Next to this script, so it is on sys.path
+from process_groups import write_json_atomic, new_process_group_kwargs, stop_process_group, limit_command
+
+SPOOL_SUBDIRS = ("pending", "claimed", "done", "cancel", "jobs")
+DEFAULT_GRACE_PERIOD = 5.0
+
+
+def claim_next_job(spool_dir):
+    """Claim the oldest pending job. Returns (job_id, manifest) or None."""
+    pending_dir = os.path.join(spool_dir, "pending")
+    try:
+        entries = [e for e in os.scandir(pending_dir) if e.name.endswith(".json") and not e.name.startswith(".")]
+    except FileNotFoundError:
+        return None
+
+    for entry in sorted(entries, key=lambda e: e.stat().st_mtime):
+        job_id = entry.name[:-len(".json")]
+        claimed_path = os.path.join(spool_dir, "claimed", entry.name)
+        try:
+            os.rename(entry.path, claimed_path)
+        except FileNotFoundError:
+            # Another worker got there first
+            continue
+        with open(claimed_path, 'r', encoding='utf-8') as f:
+            return job_id, json.load(f)
+    return None
+
+
+def run_job(spool_dir, job_id, manifest, poll_interval):
+    """Run a claimed job to completion and write its result. Returns the exit code."""
+    cancel_path = os.path.join(spool_dir, "cancel", job_id)
+    started_at = time.time()
+    print(f"[{job_id}] Running: {manifest['command']}")
+
+    with open(manifest["stdout"], 'a', encoding='utf-8') as stdout_fp, \
+            open(manifest["stderr"], 'a', encoding='utf-8') as stderr_fp:
+        # Shown in the strip's log, which only tails the job's own log files
+        stdout_fp.write(f"Picked up by spool worker on {socket.gethostname()}\n")
+        stdout_fp.flush()
+        try:
+            command = manifest["command"]
+            if manifest.get("python_script"):
+                command = [sys.executable] + command
+            limits = manifest.get("limits", {})
+            command = limit_command(command, limits.get("max_memory_mb"), limits.get("nice"))
+            process = subprocess.Popen(command, stdout=stdout_fp, stderr=stderr_fp, shell=False,
+                                       **new_process_group_kwargs())
+        except (OSError, subprocess.SubprocessError) as e:
+            stderr_fp.write(f"Failed to start command: {e}\n")
+            process = None
+
+        cancelled = False
+        if process is not None:
+            while process.poll() is None:
+                if os.path.exists(cancel_path):
+                    cancelled = True
+                    break
+                time.sleep(poll_interval)
+            # Also stops descendants left running after a normal exit
+            stop_process_group(process, manifest.get("grace_period", DEFAULT_GRACE_PERIOD))
+        exit_code = process.returncode if process is not None else 127
+
+    if cancelled:
+        # Blender has already given up on the job; just clean up after it.
+        for path in (cancel_path, os.path.join(spool_dir, "claimed", f"{job_id}.json")):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        shutil.rmtree(os.path.join(spool_dir, "jobs", job_id), ignore_errors=True)
+        print(f"[{job_id}] Cancelled")
+        return exit_code
+
+    write_json_atomic(os.path.join(spool_dir, "done", f"{job_id}.json"), {
+        "job_id": job_id,
+        "exit_code": exit_code,
+        "worker": socket.gethostname(),
+        "started_at": started_at,
+        "finished_at": time.time(),
+    })
+    try:
+        os.remove(os.path.join(spool_dir, "claimed", f"{job_id}.json"))
+    except OSError:
+        pass
+    print(f"[{job_id}] Finished with exit code {exit_code}")
+    return exit_code
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run VSE Generative Media Bridge jobs from a spool directory.")
+    parser.add_argument("spool_dir", help="Shared spool directory configured in the addon preferences")
+    parser.add_argument("--once", action="store_true", help="Run at most one job, then exit")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between spool checks")
+    args = parser.parse_args(argv)
+
+    for subdir in SPOOL_SUBDIRS:
+        os.makedirs(os.path.join(args.spool_dir, subdir), exist_ok=True)
+
+    print(f"Watching spool directory '{args.spool_dir}'")
+    while True:
+        claimed = claim_next_job(args.spool_dir)
+        if claimed:
+            run_job(args.spool_dir, *claimed, poll_interval=min(args.poll_interval, 0.5))
+            if args.once:
+                return 0
+        elif args.once:
+            return 0
+        else:
+            time.sleep(args.poll_interval)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
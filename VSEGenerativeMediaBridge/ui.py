@@ -15,17 +15,10 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import bpy
-from bpy.types import Menu, Panel
+from bpy.types import Menu, Panel, UIList
 from .utils import get_strip_by_uuid, get_prefs
-
-
-def get_generator_config(context, generator_name):
-    """Find a generator configuration by name from the addon preferences."""
-    prefs = get_prefs(context)
-    for config in prefs.generators:
-        if config.name == generator_name:
-            return config
-    return None
+from .properties import get_generator_info, get_generator_menu, has_all_required_inputs
+from .profiling import profiled
 
 
 def get_gmb_properties(context):
@@ -41,24 +34,111 @@ def get_gmb_properties(context):
     return None
 
 
+def draw_resource_usage(layout, gmb_props):
+    """Show what the (last) run cost the host, if anything was measured."""
+    if not (gmb_props.peak_memory_mb or gmb_props.cpu_seconds):
+        return
+    col = layout.column(align=True)
+    col.label(text=f"Peak memory: {gmb_props.peak_memory_mb:.0f} MB   CPU: {gmb_props.cpu_seconds:.1f}s", icon='MEMORY')
+    col.label(text=f"Read: {gmb_props.io_read_mb:.1f} MB   Written: {gmb_props.io_write_mb:.1f} MB")
+
+
+def draw_generator_items(layout, generator_names):
+    for name in generator_names:
+        op = layout.operator("gmb.add_generator_strip", text=name)
+        op.generator_name = name
+
+
 class GMB_MT_add_generator(Menu):
-    """Dynamic menu for adding a generator strip."""
+    """Dynamic menu for adding a generator strip, with a submenu per category."""
     bl_idname = "GMB_MT_add_generator"
     bl_label = "Generative Media"
 
+    @profiled("GMB_MT_add_generator.draw")
     def draw(self, context):
         layout = self.layout
-        prefs = get_prefs(context)
-        
-        if not prefs.generators:
+        menu = get_generator_menu(context)
+
+        if not menu["count"]:
             layout.label(text="No generators defined.", icon='INFO')
             return
 
-        for gen in prefs.generators:
-            # This will call the 'add_generator_strip' operator in a later milestone
-            # For now, it won't do anything, but the menu item will appear.
-            op = layout.operator("gmb.add_generator_strip", text=gen.name)
-            op.generator_name = gen.name
+        layout.operator("gmb.search_generator", text="Search...", icon='VIEWZOOM')
+        layout.separator()
+        for category, _names in menu["categories"]:
+            # The submenu reads its category from the layout's context
+            layout.context_string_set("gmb_category", category)
+            layout.menu(GMB_MT_add_generator_category.bl_idname, text=category)
+        if menu["categories"] and menu["uncategorized"]:
+            layout.separator()
+        draw_generator_items(layout, menu["uncategorized"])
+
+
+class GMB_MT_add_generator_category(Menu):
+    """The generators of one category."""
+    bl_idname = "GMB_MT_add_generator_category"
+    bl_label = "Generators"
+
+    def draw(self, context):
+        category = getattr(context, "gmb_category", "")
+        for name, names in get_generator_menu(context)["categories"]:
+            if name == category:
+                draw_generator_items(self.layout, names)
+                break
+
+
+class GMB_UL_inputs(UIList):
+    """The inputs of a generator strip. Only the visible rows are drawn."""
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        _config, info = get_generator_info(context, data.generator_name)
+        if not info or item.name not in info["input_types"]:
+            # This case should ideally not happen if properties are synced correctly
+            layout.label(text=item.name, icon='ERROR')
+            return
+        input_type = info["input_types"][item.name]
+        # Visual cue in the label text
+        label_text = f"{item.name}{' *' if item.name in info['required_inputs'] else ''}"
+
+        split = layout.split(factor=0.3)
+        split.label(text=label_text)
+        row = split.row(align=True)
+        # --- Draw Input Widget based on Mode ---
+        if item.input_mode == 'STRIP':
+            row.prop_search(item, "ui_strip_name", context.scene.sequence_editor, "sequences_all", text="")
+        elif item.input_mode == 'FILE':
+            row.prop(item, "filepath", text="")
+        elif input_type == 'TEXT':
+            row.prop(item, "text_value", text="")
+        else:
+            # 'TEXT' mode is invalid for non-text inputs (e.g. from an old file)
+            row.label(text="Use Strip or File mode", icon='ERROR')
+
+        # --- Draw Mode Buttons ---
+        # The 'TEXT' mode option is only offered for text inputs
+        modes = row.row(align=True)
+        modes.prop_enum(item, "input_mode", 'STRIP', text="", icon='SEQUENCE')
+        modes.prop_enum(item, "input_mode", 'FILE', text="", icon='FILE_FOLDER')
+        if input_type == 'TEXT':
+            modes.prop_enum(item, "input_mode", 'TEXT', text="", icon='FONT_DATA')
+
+
+class GMB_UL_outputs(UIList):
+    """The outputs of a multi-output controller strip and the strips they are linked to."""
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        # We show the name of the output property and the name of the strip it's linked to.
+        strip = get_strip_by_uuid(item.linked_strip_uuid)
+        strip_name = f"'{strip.name}'" if strip else "[Not Found]"
+        layout.label(text=f"{item.name}: {strip_name}")
+
+
+class GMB_UL_log(UIList):
+    """The log history of a generator strip, newest line first."""
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        layout.label(text=item.line)
+
+    def filter_items(self, context, data, propname):
+        count = len(getattr(data, propname))
+        return [], list(range(count - 1, -1, -1))
 
 
 class GMB_PT_vse_sidebar(Panel):
@@ -69,12 +149,16 @@ class GMB_PT_vse_sidebar(Panel):
     bl_region_type = 'UI'
     bl_category = "Strip"
 
+    # Rows shown by the input, output and log lists before they scroll
+    LIST_ROWS = 5
+
     @classmethod
     def poll(cls, context):
         """Only show the panel if the active strip is a GMB strip."""
         strip = context.active_sequence_strip
         return strip and "gmb_id" in strip
 
+    @profiled("GMB_PT_vse_sidebar.draw")
     def draw(self, context):
         layout = self.layout
         gmb_props = get_gmb_properties(context)
@@ -86,80 +170,40 @@ class GMB_PT_vse_sidebar(Panel):
         box = layout.box()
         box.label(text=f"Generator: {gmb_props.generator_name}")
 
-        # Get the full generator configuration
-        gen_config = get_generator_config(context, gmb_props.generator_name)
+        # Get the full generator configuration and the data derived from it
+        gen_config, info = get_generator_info(context, gmb_props.generator_name)
 
         if not gen_config:
             box.label(text="Generator config not found!", icon='ERROR')
             return
+
+        # --- Draft/Final toggle for generators with a 'draft' block ---
+        if info["has_draft"]:
+            quality_row = box.row(align=True)
+            quality_row.prop(gmb_props, "quality", expand=True)
+            if gmb_props.output_quality == 'DRAFT':
+                box.label(text="Showing draft output", icon='INFO')
         
         # Draw the dynamic properties based on the parsed YAML
-        if not gen_config.inputs:
+        if not info["input_types"]:
             box.label(text="No inputs defined for this generator.")
         else:
-            inputs_box = box.box()
-            inputs_box.label(text="Inputs:")
-
-            # Create a mapping of input names to their definitions for efficient lookup
-            input_defs_map = {idef.name: idef for idef in gen_config.inputs}
-
-            for link in gmb_props.linked_inputs:
-                input_def = input_defs_map.get(link.name)
-                if not input_def:
-                    # This case should ideally not happen if properties are synced correctly
-                    continue
-                
-                # Visual cue in the label text
-                label_text = f"{link.name}{' *' if input_def.required else ''}"
-                
-                input_box = inputs_box.box()
-                
-                # --- Draw Mode Buttons ---
-                mode_row = input_box.row(align=True)
-                # Use prop_enum to draw each button individually.
-                # This gives us control over which buttons to show.
-                mode_row.prop_enum(link, "input_mode", 'STRIP')
-                mode_row.prop_enum(link, "input_mode", 'FILE')
-                if input_def.type == 'TEXT':
-                    # Only show the 'TEXT' mode option for text inputs.
-                    mode_row.prop_enum(link, "input_mode", 'TEXT')
-
-                # If a non-text input somehow ends up in 'TEXT' mode (e.g. from an old file),
-                # kick it back to 'STRIP' mode to avoid an invalid state.
-                if input_def.type != 'TEXT' and link.input_mode == 'TEXT':
-                    link.input_mode = 'STRIP'
-                    
-                # --- Draw Input Widget based on Mode ---
-                if link.input_mode == 'STRIP':
-                    input_box.prop_search(
-                    link, 
-                    "ui_strip_name", 
-                    context.scene.sequence_editor, 
-                    "sequences_all",
-                    text=label_text
-                )
-                elif link.input_mode == 'FILE':
-                    input_box.prop(link, "filepath", text=label_text)
-                elif link.input_mode == 'TEXT':
-                    if input_def.type == 'TEXT':
-                        input_box.label(text=label_text)
-                        input_box.prop(link, "text_value", text="")
-                    else:
-                        # This mode is invalid for non-text inputs. Show a message.
-                        input_box.label(text=f"'{link.name}' cannot use 'Text' mode.", icon='ERROR')
+            box.label(text="Inputs:")
+            box.template_list(
+                "GMB_UL_inputs", "", gmb_props, "linked_inputs", gmb_props, "active_input_index",
+                rows=min(len(gmb_props.linked_inputs), self.LIST_ROWS), maxrows=self.LIST_ROWS
+            )
 
         # --- Draw the outputs section for multi-output controllers ---
         if gmb_props.linked_outputs:
-            outputs_box = box.box()
-            outputs_box.label(text="Outputs:")
-            for link in gmb_props.linked_outputs:
-                # We show the name of the output property and the name of the strip it's linked to.
-                strip = get_strip_by_uuid(link.linked_strip_uuid)
-                strip_name = f"'{strip.name}'" if strip else "[Not Found]"
-                outputs_box.label(text=f"{link.name}: {strip_name}")
+            box.label(text="Outputs:")
+            box.template_list(
+                "GMB_UL_outputs", "", gmb_props, "linked_outputs", gmb_props, "active_output_index",
+                rows=min(len(gmb_props.linked_outputs), self.LIST_ROWS), maxrows=self.LIST_ROWS
+            )
 
         # --- Operator Buttons ---
-        is_running = gmb_props.status == 'RUNNING'
+        is_running = gmb_props.status in {'RUNNING', 'QUEUED'}
 
         if is_running:
             # Show Cancel button and status box
@@ -168,55 +212,52 @@ class GMB_PT_vse_sidebar(Panel):
             cancel_op.strip_id = gmb_props.id
             
             status_box = layout.box()
-            status_box.label(text=f"Running... {gmb_props.runtime_seconds:.1f}s")
+            if gmb_props.status == 'QUEUED':
+                status_box.label(text=f"Queued... {gmb_props.queue_seconds:.1f}s")
+            else:
+                status_box.label(text=f"Running... {gmb_props.runtime_seconds:.1f}s")
+                if gmb_props.queue_seconds >= 0.1:
+                    status_box.label(text=f"Waited {gmb_props.queue_seconds:.1f}s in queue")
+                draw_resource_usage(status_box, gmb_props)
             
             if gmb_props.log_history:
-                log_box = status_box.box()
-                for log_entry in gmb_props.log_history:
-                    log_box.label(text=log_entry.line)
+                status_box.template_list(
+                    "GMB_UL_log", "", gmb_props, "log_history", gmb_props, "active_log_index",
+                    rows=self.LIST_ROWS
+                )
 
         else:
             op_row = layout.row(align=True)
-            
-            # Logic to check if all required inputs are linked
-            all_required_set = True
-            if gen_config:
-                # Create a mapping of input names to their linked UUIDs for efficient lookup
-                linked_input_uuids = {link.name: link.linked_strip_uuid for link in gmb_props.linked_inputs}
-
-                for input_def in gen_config.inputs:
-                    if not input_def.required:
-                        continue
-
-                    link = next((l for l in gmb_props.linked_inputs if l.name == input_def.name), None)
-                    if not link:
-                        all_required_set = False
-                        break
-                    
-                    if link.input_mode == 'STRIP' and not link.linked_strip_uuid:
-                        all_required_set = False
-                        break
-                    elif link.input_mode == 'FILE' and not link.filepath:
-                        all_required_set = False
-                        break
-                    elif link.input_mode == 'TEXT' and not link.text_value:
-                        all_required_set = False
-                        break
-
             # Disable the button if required inputs are missing
-            op_row.enabled = all_required_set
+            op_row.enabled = has_all_required_inputs(gmb_props, info)
             
             run_op = op_row.operator("gmb.generate_media", text="Generate", icon='PLAY')
             run_op.strip_id = gmb_props.id
 
+            if gmb_props.status in {'FINISHED', 'ERROR'}:
+                draw_resource_usage(layout.box(), gmb_props)
+
 
 def draw_add_menu(self, context):
     """Draw the 'Generative Media' entry in the VSE Add menu."""
     self.layout.menu(GMB_MT_add_generator.bl_idname)
 
 
+def draw_strip_menu(self, context):
+    """Draw the batch generator actions in the VSE Strip menu."""
+    layout = self.layout
+    layout.separator()
+    layout.operator("gmb.apply_generator_to_selection", icon='ADD')
+    layout.operator("gmb.promote_drafts", icon='RENDER_STILL')
+    layout.operator("gmb.generate_batch", icon='SEQ_STRIP_DUPLICATE')
+
+
 classes = (
     GMB_MT_add_generator,
+    GMB_MT_add_generator_category,
+    GMB_UL_inputs,
+    GMB_UL_outputs,
+    GMB_UL_log,
     GMB_PT_vse_sidebar,
 )
 
@@ -227,10 +268,12 @@ def register():
         bpy.utils.register_class(cls)
     
     bpy.types.SEQUENCER_MT_add.append(draw_add_menu)
+    bpy.types.SEQUENCER_MT_strip.append(draw_strip_menu)
 
 
 def unregister():
     """Unregister the UI classes."""
+    bpy.types.SEQUENCER_MT_strip.remove(draw_strip_menu)
     bpy.types.SEQUENCER_MT_add.remove(draw_add_menu)
     
     for cls in reversed(classes):
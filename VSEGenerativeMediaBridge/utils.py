@@ -16,12 +16,36 @@
 
 import bpy
 import os
+import re
 import shutil
+import time
 
 def get_prefs(context):
     """Get the addon preferences."""
     return context.preferences.addons[__package__].preferences
 
+def get_ffmpeg_executable(context=None):
+    """The ffmpeg from the addon preferences, with a blend-relative (//) path resolved. Bare names are kept for PATH lookup."""
+    ffmpeg = get_prefs(context or bpy.context).ffmpeg_executable
+    return bpy.path.abspath(ffmpeg) if ffmpeg else "ffmpeg"
+
+def get_yaml_parser():
+    """
+    Imports the YAML parser on first use, keeping addon startup light. Its cache of validated
+    configs is kept in the extension's user directory, so unchanged configs skip StrictYAML
+    in later sessions too.
+    """
+    from . import yaml_parser
+    if yaml_parser.get_validated_cache_path() is None:
+        try:
+            cache_dir = bpy.utils.extension_path_user(__package__, path="cache", create=True)
+        except (AttributeError, ValueError):
+            # Installed as a legacy add-on
+            import tempfile
+            cache_dir = os.path.join(tempfile.gettempdir(), "gmb_cache")
+        yaml_parser.set_validated_cache_path(os.path.join(cache_dir, "validated_configs.json"))
+    return yaml_parser
+
 def get_strip_by_uuid(uuid_to_find: str):
     """Find a VSE strip by its 'gmb_id' custom property."""
     if not uuid_to_find:
@@ -32,6 +56,19 @@ def get_strip_by_uuid(uuid_to_find: str):
             return strip
     return None
 
+def find_sequencer(scene):
+    """Returns a (window, area, region) showing the sequencer for the given scene, or None."""
+    for window in bpy.context.window_manager.windows:
+        if window.scene != scene:
+            continue
+        for area in window.screen.areas:
+            if area.type != 'SEQUENCE_EDITOR':
+                continue
+            for region in area.regions:
+                if region.type == 'WINDOW':
+                    return window, area, region
+    return None
+
 def get_gmb_type_from_strip(strip):
     """
     Determines the GMB media type ('IMAGE', 'VIDEO', 'AUDIO', 'TEXT') from a VSE strip.
@@ -51,10 +88,10 @@ def get_gmb_type_from_strip(strip):
     # EffectStrips and others don't have a direct media type
     return None
 
-def get_stable_filepath(strip_name, generator_name, output_name, gmb_id, file_ext):
+def get_project_output_dir(create=True):
     """
-    Constructs a stable, unique filepath for a generated media file next to the .blend file.
-    Example: //MyProject_vse_gmb/MyStrip_MyGenerator_OutputName_gmb_id.png
+    Returns (and by default creates) the directory next to the .blend file that holds generated media.
+    Example: //MyProject_vse_gmb
     """
     # This check is crucial. We can't form a relative path without a saved .blend file.
     if not bpy.data.is_saved:
@@ -62,38 +99,301 @@ def get_stable_filepath(strip_name, generator_name, output_name, gmb_id, file_ex
 
     blend_filepath = bpy.data.filepath
     blend_dir = os.path.dirname(blend_filepath)
-    
+
     # Create a unique directory name based on the .blend file's name
     blend_filename = os.path.basename(blend_filepath)
     blend_name, _ = os.path.splitext(blend_filename)
     output_dir_name = f"{blend_name}_vse_gmb"
     output_dir = os.path.join(blend_dir, output_dir_name)
-    
+
     # Create the directory if it doesn't exist.
-    os.makedirs(output_dir, exist_ok=True)
+    if create:
+        os.makedirs(output_dir, exist_ok=True)
+    return output_dir
+
+def get_detached_jobs_dir(create=True):
+    """Returns (and by default creates) the per-project directory holding the state of detached jobs."""
+    jobs_dir = os.path.join(get_project_output_dir(create), ".gmb_jobs")
+    if create:
+        os.makedirs(jobs_dir, exist_ok=True)
+    return jobs_dir
+
+def get_input_cache_dir():
+    """
+    Returns the directory holding trimmed input clips (see input_cache.py): inside the project's
+    output directory, or in the system temp directory for unsaved projects.
+    """
+    if bpy.data.is_saved:
+        return os.path.join(get_project_output_dir(), ".gmb_input_cache")
+    import tempfile
+    return os.path.join(tempfile.gettempdir(), "gmb_input_cache")
+
+def get_strip_source_range(strip):
+    """
+    Returns (start, duration) in seconds of the part of a movie or sound strip's source file
+    that is visible on the timeline, or None if the strip shows its whole source or is retimed.
+    """
+    # Retimed strips don't map timeline frames linearly to the source
+    if len(getattr(strip, "retiming_keys", ())) > 0:
+        return None
+
+    offset_start = strip.frame_offset_start + strip.animation_offset_start
+    offset_end = strip.frame_offset_end + strip.animation_offset_end
+    if offset_start <= 0 and offset_end <= 0:
+        return None
+
+    render = bpy.context.scene.render
+    scene_fps = render.fps / render.fps_base
+    if strip.type == 'MOVIE':
+        # Movie frames map one to one to timeline frames, at the movie's own frame rate
+        fps = strip.fps or scene_fps
+        start = offset_start / fps
+        duration = strip.frame_final_duration / fps
+    else:
+        speed = getattr(strip, "speed_factor", 1.0)
+        start = offset_start / scene_fps * speed + getattr(strip, "sound_offset", 0.0)
+        duration = strip.frame_final_duration / scene_fps * speed
+    return max(start, 0.0), duration
+
+def append_run_record(record):
+    """
+    Appends a finished run to the project's run log (//<blend name>_vse_gmb/gmb_runs.jsonl).
+    Does nothing for unsaved projects.
+    """
+    if not bpy.data.is_saved:
+        return
+    import json
+    try:
+        with open(os.path.join(get_project_output_dir(), "gmb_runs.jsonl"), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + "\n")
+    except OSError as e:
+        print(f"GMB: Could not write run record: {e}")
+
+# Generated files end in _<gmb_id>, optionally followed by a variant such as _draft, _preview or _partial
+GMB_OUTPUT_NAME = re.compile(r'_([0-9a-f]{32})(?:_[A-Za-z_]+)?$')
+
+def get_output_shard_dir(output_dir, gmb_id):
+    """Directory of a gmb_id's outputs in the sharded layout: <output dir>/ab/cd for gmb_id 'abcd...'."""
+    return os.path.join(output_dir, gmb_id[:2], gmb_id[2:4])
+
+def get_gmb_id_output_dirs(gmb_id):
+    """
+    The directories that can hold a gmb_id's outputs: the flat project output directory and its shard.
+    Projects may contain both layouts, e.g. before they are migrated.
+    """
+    output_dir = get_project_output_dir(create=False)
+    return [output_dir, get_output_shard_dir(output_dir, gmb_id)]
+
+def get_stable_filepath(strip_name, generator_name, output_name, gmb_id, file_ext, variant=""):
+    """
+    Constructs a stable, unique filepath for a generated media file next to the .blend file.
+    Example: //MyProject_vse_gmb/MyStrip_MyGenerator_OutputName_gmb_id.png
+    With the sharded output layout: //MyProject_vse_gmb/ab/cd/MyStrip_MyGenerator_OutputName_abcd....png
+    A variant (e.g. 'draft') is stored as a separate version: ..._gmb_id_draft.png
+    """
+    output_dir = get_project_output_dir()
+    if get_prefs(bpy.context).output_layout == 'SHARDED':
+        output_dir = get_output_shard_dir(output_dir, gmb_id)
+        os.makedirs(output_dir, exist_ok=True)
     
     # Create a name for the output file based on all available info, ensuring uniqueness.
     output_strip_name = f"{strip_name}_{generator_name}_{output_name}_{gmb_id}"
+    if variant:
+        output_strip_name += f"_{variant}"
     safe_filename = bpy.path.clean_name(output_strip_name) + file_ext
     
     # Return the full, absolute path for file operations.
     return os.path.join(output_dir, safe_filename)
 
-def cleanup_gmb_id_version(directory, gmb_id_to_remove):
+def cleanup_gmb_id_version(gmb_id_to_remove, variant=""):
     """
-    Removes any file from the target directory that contains the gmb_id as a substring.
+    Removes the files of a gmb_id's version (final, or the given variant such as 'draft')
+    from the project's output directory, in either layout. Other variants of the same gmb_id are kept.
     This is used to clean up old versions of generated media before creating a new one.
     """
-    if not os.path.isdir(directory):
+    version_suffix = f"{gmb_id_to_remove}_{variant}" if variant else gmb_id_to_remove
+    # Deduplicated files whose blob only they link to; the blob is removed with them
+    output_dedup = None
+    if os.path.isdir(get_blob_dir()):
+        from . import output_dedup
+    blob_linked = set()
+    for directory in get_gmb_id_output_dirs(gmb_id_to_remove):
+        if not os.path.isdir(directory):
+            continue
+        for filename in os.listdir(directory):
+            if os.path.splitext(filename)[0].endswith(version_suffix):
+                path = os.path.join(directory, filename)
+                try:
+                    if output_dedup:
+                        blob_linked |= output_dedup.get_blob_linked_files(path)
+                    # Image sequences are stored as a directory of frames
+                    if os.path.isdir(path):
+                        shutil.rmtree(path)
+                    else:
+                        os.remove(path)
+                    print(f"GMB Cleanup: Removed old version '{filename}'")
+                except OSError as e:
+                    print(f"GMB Cleanup Error: Could not remove file '{filename}': {e}")
+    if blob_linked:
+        try:
+            output_dedup.release_blobs(blob_linked, get_blob_dir())
+        except OSError as e:
+            print(f"GMB Cleanup Error: Could not remove unused blobs: {e}")
+
+def iter_output_entries(output_dir):
+    """
+    Yields (gmb_id, path) for every generated file or image-sequence directory in the project's
+    output directory, in both the flat and the sharded layout.
+    """
+    try:
+        entries = list(os.scandir(output_dir))
+    except FileNotFoundError:
         return
+    for entry in entries:
+        if entry.name.startswith("."):
+            continue
+        match = GMB_OUTPUT_NAME.search(os.path.splitext(entry.name)[0])
+        if match:
+            yield match.group(1), entry.path
+        elif entry.is_dir() and len(entry.name) == 2:
+            # A first-level shard, holding second-level shards
+            for shard in os.scandir(entry.path):
+                if not shard.is_dir() or len(shard.name) != 2:
+                    continue
+                for output in os.scandir(shard.path):
+                    match = GMB_OUTPUT_NAME.search(os.path.splitext(output.name)[0])
+                    if match and match.group(1).startswith(entry.name + shard.name):
+                        yield match.group(1), output.path
+
+def migrate_output_layout(output_dir, layout):
+    """
+    Moves the generated media in output_dir into the given layout ('FLAT' or 'SHARDED').
+    Returns a dict of old path -> new path for everything that was moved, and empties
+    shard directories left behind when flattening.
+    """
+    moved = {}
+    for gmb_id, path in list(iter_output_entries(output_dir)):
+        target_dir = get_output_shard_dir(output_dir, gmb_id) if layout == 'SHARDED' else output_dir
+        if os.path.dirname(path) == target_dir:
+            continue
+        target = os.path.join(target_dir, os.path.basename(path))
+        if os.path.exists(target):
+            print(f"GMB Migration: '{target}' already exists, leaving '{path}' in place")
+            continue
+        try:
+            os.makedirs(target_dir, exist_ok=True)
+            os.rename(path, target)
+        except OSError as e:
+            # Keep going, so everything moved so far can still be repointed
+            print(f"GMB Migration: could not move '{path}': {e}")
+            continue
+        moved[path] = target
+
+    if layout == 'FLAT' and os.path.isdir(output_dir):
+        for entry in os.scandir(output_dir):
+            if entry.is_dir() and len(entry.name) == 2 and not entry.name.startswith("."):
+                for shard in os.scandir(entry.path):
+                    if shard.is_dir() and not os.listdir(shard.path):
+                        os.rmdir(shard.path)
+                if not os.listdir(entry.path):
+                    os.rmdir(entry.path)
+    return moved
+
+BLOB_DIR_NAME = ".gmb_blobs"
+
+def get_blob_dir():
+    """The project's store of deduplicated output content (see output_dedup)."""
+    return os.path.join(get_project_output_dir(create=False), BLOB_DIR_NAME)
 
-    for filename in os.listdir(directory):
-        if gmb_id_to_remove in filename:
-            try:
-                os.remove(os.path.join(directory, filename))
-                print(f"GMB Cleanup: Removed old version '{filename}'")
-            except OSError as e:
-                print(f"GMB Cleanup Error: Could not remove file '{filename}': {e}")
+def deduplicate_new_output(path):
+    """
+    Deduplicates a newly ingested output file or image-sequence directory in the background, if enabled.
+    For a file, returns a future of its content digest (see output_dedup), otherwise None.
+    """
+    if not get_prefs(bpy.context).deduplicate_outputs:
+        return None
+    from . import output_dedup
+    if os.path.isdir(path):
+        output_dedup.deduplicate_in_background([path], get_blob_dir())
+        return None
+    return output_dedup.deduplicate_file_in_background(path, get_blob_dir())
+
+def get_live_gmb_ids():
+    """The gmb_ids of every strip in every scene of the open project."""
+    live_ids = set()
+    for scene in bpy.data.scenes:
+        if scene.sequence_editor:
+            live_ids.update(strip.get("gmb_id") for strip in scene.sequence_editor.sequences_all)
+    live_ids.discard(None)
+    return live_ids
+
+def _get_entry_size(path):
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+ORPHANS_FILE_NAME = ".gmb_orphans.json"
+
+def _load_orphan_times(orphans_path):
+    import json
+    try:
+        with open(orphans_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_orphan_times(orphans_path, orphan_times):
+    import json
+    tmp_path = orphans_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(orphan_times, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, orphans_path)
+
+def find_orphaned_outputs(output_dir, live_ids, min_age=0.0):
+    """
+    Returns (path, size in bytes) for every generated file or image-sequence directory in
+    output_dir, in either layout, whose gmb_id is not in live_ids and has been orphaned for
+    at least min_age seconds.
+    When each gmb_id was first found orphaned is recorded in output_dir/.gmb_orphans.json,
+    so the age counts from when its strip was deleted, not from when the output was generated.
+    """
+    orphans_path = os.path.join(output_dir, ORPHANS_FILE_NAME)
+    recorded = _load_orphan_times(orphans_path)
+    orphan_times = {}
+    now = time.time()
+    orphans = []
+    for gmb_id, path in iter_output_entries(output_dir):
+        if gmb_id in live_ids:
+            continue
+        orphaned_at = orphan_times.setdefault(gmb_id, recorded.get(gmb_id, now))
+        if now - orphaned_at < min_age:
+            continue
+        try:
+            orphans.append((path, _get_entry_size(path)))
+        except OSError:
+            # Removed while scanning
+            continue
+    # Only the currently orphaned IDs are kept, so restored strips start over when deleted again
+    if orphan_times != recorded and os.path.isdir(output_dir):
+        try:
+            _save_orphan_times(orphans_path, orphan_times)
+        except OSError as e:
+            print(f"GMB GC: Could not record orphaned outputs: {e}")
+    return orphans
+
+def list_sequence_frames(directory, file_ext=""):
+    """
+    Returns the frame filenames of an image sequence directory in frame order.
+    Only files with the given extension are included when one is set.
+    Numbers are compared by value, so frame_2.png sorts before frame_10.png.
+    """
+    try:
+        names = [e.name for e in os.scandir(directory) if e.is_file() and not e.name.startswith(".")]
+    except OSError:
+        return []
+    if file_ext:
+        names = [name for name in names if name.lower().endswith(file_ext.lower())]
+    return sorted(names, key=lambda name: [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', name)])
                 
                 
 def get_addon_placeholder_filepath(gmb_type):
@@ -103,7 +403,7 @@ def get_addon_placeholder_filepath(gmb_type):
     addon_dir = os.path.dirname(__file__)
     placeholder_dir = os.path.join(addon_dir, "placeholders")
 
-    if gmb_type == 'IMAGE':
+    if gmb_type in ('IMAGE', 'IMAGE_SEQUENCE'):
         return os.path.join(placeholder_dir, "placeholder.png")
     elif gmb_type == 'SOUND':
         return os.path.join(placeholder_dir, "placeholder.wav")
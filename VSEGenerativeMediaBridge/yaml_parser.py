@@ -14,8 +14,17 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import os
+import json
+import hashlib
+import threading
 from dataclasses import dataclass, field, is_dataclass, fields
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Callable, Union, get_origin, get_args
+
+
+CONFIG_FILE_EXTENSIONS = ('.yaml', '.yml')
+CHUNKABLE_OUTPUT_TYPES = ('movie', 'sound', 'text')
+POST_PROCESSABLE_OUTPUT_TYPES = ('image', 'movie', 'sound')
 
 
 @dataclass
@@ -24,6 +33,42 @@ class Argument:
     argument: str
     if_property_set: Optional[str] = field(default=None, metadata={'key': 'if-property-set'})
 
+@dataclass
+class DraftConfig:
+    """Alternate arguments used when a strip is generated in draft (preview) quality."""
+    arguments: Optional[str] = None
+    argument_list: List[Argument] = field(default_factory=list, metadata={'key': 'argument-list'})
+
+    def __post_init__(self):
+        if self.arguments and self.argument_list:
+            raise ValueError("In 'draft', 'arguments' and 'argument_list' are mutually exclusive.")
+        if self.arguments is None and not self.argument_list:
+            raise ValueError("'draft' must define either 'arguments' or 'argument-list'.")
+
+@dataclass
+class ChunkingConfig:
+    """Lets a generator render a long strip as frame-range chunks run in parallel."""
+    frames: int
+    max_parallel: Optional[int] = field(default=None, metadata={'key': 'max-parallel'})
+
+    def __post_init__(self):
+        if self.frames <= 0:
+            raise ValueError(f"In 'chunking', 'frames' must be positive, got {self.frames}.")
+        if self.max_parallel is not None and self.max_parallel <= 0:
+            raise ValueError(f"In 'chunking', 'max-parallel' must be positive, got {self.max_parallel}.")
+
+@dataclass
+class BatchConfig:
+    """Lets one run of the program generate many strips from a JSONL manifest."""
+    arguments: str
+    max_size: Optional[int] = field(default=None, metadata={'key': 'max-size'})
+
+    def __post_init__(self):
+        if "{manifest}" not in self.arguments:
+            raise ValueError("In 'batch', 'arguments' must contain the {manifest} placeholder.")
+        if self.max_size is not None and self.max_size <= 0:
+            raise ValueError(f"In 'batch', 'max-size' must be positive, got {self.max_size}.")
+
 @dataclass
 class CommandConfig:
     """Configuration for the external command to be executed."""
@@ -31,10 +76,27 @@ class CommandConfig:
     arguments: Optional[str] = None
     argument_list: List[Argument] = field(default_factory=list, metadata={'key': 'argument-list'})
     timeout: Optional[int] = None
+    draft: Optional[DraftConfig] = None
+    max_memory_mb: Optional[int] = field(default=None, metadata={'key': 'max-memory-mb'})
+    nice: Optional[int] = None
+    chunking: Optional[ChunkingConfig] = None
+    batch: Optional[BatchConfig] = None
 
     def __post_init__(self):
         if self.arguments and self.argument_list:
             raise ValueError("'arguments' and 'argument_list' are mutually exclusive.")
+        if self.chunking and self.batch:
+            raise ValueError("'chunking' and 'batch' are mutually exclusive.")
+        if self.max_memory_mb is not None and self.max_memory_mb <= 0:
+            raise ValueError(f"'max-memory-mb' must be positive, got {self.max_memory_mb}.")
+        if self.nice is not None and not 0 <= self.nice <= 19:
+            raise ValueError(f"'nice' must be between 0 and 19, got {self.nice}.")
+
+    def get_arguments(self, draft: bool = False):
+        """Returns the (arguments, argument_list) pair for the requested quality."""
+        if draft and self.draft:
+            return self.draft.arguments, self.draft.argument_list
+        return self.arguments, self.argument_list
 
 @dataclass
 class InputProperty:
@@ -61,6 +123,19 @@ class InputProperty:
         if self.type == "text" and self.pass_via not in ["file", "stream", "text"]:
             raise ValueError(f"For input '{self.name}', invalid 'pass-via' for type 'text': {self.pass_via}")
 
+@dataclass
+class PostProcessStep:
+    """A command run on a generated output file before it is ingested, e.g. a transcode."""
+    name: str
+    program: str
+    arguments: str
+    file_ext: Optional[str] = field(default=None, metadata={'key': 'file-ext'})
+
+    def __post_init__(self):
+        for placeholder in ("{input}", "{output}"):
+            if placeholder not in self.arguments:
+                raise ValueError(f"In post-process step '{self.name}', 'arguments' must contain the {placeholder} placeholder.")
+
 @dataclass
 class OutputProperty:
     """Represents an output property for the generator."""
@@ -69,15 +144,27 @@ class OutputProperty:
     pass_via: str = field(default="file", metadata={'key': 'pass-via'})
     file_ext: Optional[str] = field(default=None, metadata={'key': 'file-ext'})
     required: bool = True
+    post_process: List[PostProcessStep] = field(default_factory=list, metadata={'key': 'post-process'})
     
     def __post_init__(self):
-        VALID_TYPES = ["text", "image", "sound", "movie"]
+        VALID_TYPES = ["text", "image", "image-sequence", "sound", "movie"]
         if self.type.lower() not in VALID_TYPES:
             raise ValueError(f"For property '{self.name}', invalid type '{self.type}'. Must be one of {VALID_TYPES}")
             
         if self.pass_via not in ["file", "stream"]:
             raise ValueError(f"For output '{self.name}', invalid 'pass-via': {self.pass_via}")
 
+        if self.post_process and self.type.lower() not in POST_PROCESSABLE_OUTPUT_TYPES:
+            raise ValueError(f"Output '{self.name}' of type '{self.type}' can't be post-processed. "
+                             f"'post-process' only supports {list(POST_PROCESSABLE_OUTPUT_TYPES)} outputs.")
+
+    def get_final_file_ext(self):
+        """The extension of the ingested file, after any post-process step that changes it."""
+        file_ext = self.file_ext
+        for step in self.post_process:
+            file_ext = step.file_ext or file_ext
+        return file_ext
+
 @dataclass
 class PropertiesConfig:
     """Container for input and output properties."""
@@ -91,40 +178,281 @@ class GeneratorConfig:
     command: CommandConfig
     properties: PropertiesConfig
     description: Optional[str] = None
+    category: Optional[str] = None
+    tags: List[str] = field(default_factory=list)
+    resources: Dict[str, float] = field(default_factory=dict)
 
-def _from_dict(cls, data: Dict[str, Any]):
-    """Recursively constructs a dataclass instance from a dictionary."""
-    if not isinstance(data, dict):
-        return data
+    def __post_init__(self):
+        for resource, amount in self.resources.items():
+            if amount < 0:
+                raise ValueError(f"Resource '{resource}' must not be negative, got {amount}.")
+        if self.command.chunking:
+            # Chunk outputs are joined end to end, which only makes sense for time-based media
+            for output in self.properties.output:
+                if output.type.lower() not in CHUNKABLE_OUTPUT_TYPES:
+                    raise ValueError(
+                        f"Output '{output.name}' of type '{output.type}' can't be chunked. "
+                        f"Generators with 'chunking' only support {list(CHUNKABLE_OUTPUT_TYPES)} outputs."
+                    )
+        if self.command.batch and any(output.post_process for output in self.properties.output):
+            raise ValueError("'post-process' steps are not supported for generators with 'batch'.")
+
+def _unwrap_optional(field_type):
+    """Returns X for Optional[X], otherwise the type unchanged."""
+    if get_origin(field_type) is Union:
+        args = [arg for arg in get_args(field_type) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return field_type
 
-    kwargs = {}
+def _compile_constructor(cls) -> Callable[[Any], Any]:
+    """
+    Builds a constructor for a dataclass from a dictionary.
+    The field reflection (kebab-case keys, nested dataclasses, lists of dataclasses)
+    is resolved once here instead of on every object.
+    """
+    field_specs = []
     for f in fields(cls):
         # Map kebab-case from YAML to snake_case in dataclass
         field_key = f.metadata.get('key', f.name)
-        
-        if field_key in data:
-            field_value = data[field_key]
-            # Recursively call _from_dict for nested dataclasses
-            if is_dataclass(f.type):
-                kwargs[f.name] = _from_dict(f.type, field_value)
-            # Handle lists of dataclasses
-            elif hasattr(f.type, '__origin__') and f.type.__origin__ == list and is_dataclass(f.type.__args__[0]):
-                item_cls = f.type.__args__[0]
-                kwargs[f.name] = [_from_dict(item_cls, item) for item in field_value]
-            else:
-                kwargs[f.name] = field_value
-    
-    return cls(**kwargs)
+        field_type = _unwrap_optional(f.type)
+        converter = None
+        # Nested dataclasses
+        if is_dataclass(field_type):
+            converter = _get_constructor(field_type)
+        # Lists of dataclasses
+        elif hasattr(f.type, '__origin__') and f.type.__origin__ == list and is_dataclass(f.type.__args__[0]):
+            item_constructor = _get_constructor(f.type.__args__[0])
+            converter = lambda items, construct=item_constructor: [construct(item) for item in items]
+        field_specs.append((field_key, f.name, converter))
+
+    def construct(data):
+        if not isinstance(data, dict):
+            return data
+        kwargs = {}
+        for field_key, field_name, converter in field_specs:
+            if field_key in data:
+                value = data[field_key]
+                kwargs[field_name] = converter(value) if converter else value
+        return cls(**kwargs)
+
+    return construct
+
+_constructors: Dict[type, Callable[[Any], Any]] = {}
+
+def _get_constructor(cls) -> Callable[[Any], Any]:
+    """Returns the cached constructor for a dataclass, compiling it on first use."""
+    constructor = _constructors.get(cls)
+    if constructor is None:
+        constructor = _constructors[cls] = _compile_constructor(cls)
+    return constructor
+
+def _from_dict(cls, data: Dict[str, Any]):
+    """Recursively constructs a dataclass instance from a dictionary."""
+    return _get_constructor(cls)(data)
 
 # Alias fields for use in the helper function
 field_iter = fields
 
-def parse_yaml_config(yaml_string: str) -> Optional[GeneratorConfig]:
+# The StrictYAML schema and loader, built once on first use.
+_schema = None
+_yaml_load = None
+
+def _get_schema():
+    """Builds the StrictYAML schema on first use and returns (load, schema)."""
+    global _schema, _yaml_load
+    if _schema is not None:
+        return _yaml_load, _schema
+
+    # Import dynamically to avoid static import linter errors in environments
+    # where StrictYAML isn't installed at analysis time.
+    from importlib import import_module
+    yaml_mod = import_module('strictyaml')
+
+    # Define a schema to ensure correct typing (e.g., Bool/Int) rather than strings
+    Map = yaml_mod.Map
+    Seq = yaml_mod.Seq
+    Str = yaml_mod.Str
+    Int = yaml_mod.Int
+    Bool = yaml_mod.Bool
+    Float = yaml_mod.Float
+    MapPattern = yaml_mod.MapPattern
+    OptionalKey = yaml_mod.Optional
+
+    argument_list_schema = Seq(Map({
+        "argument": Str(),
+        OptionalKey("if-property-set"): Str(),
+    }))
+
+    schema = Map({
+        "name": Str(),
+        OptionalKey("description"): Str(),
+        OptionalKey("category"): Str(),
+        OptionalKey("tags"): Seq(Str()),
+        OptionalKey("resources"): MapPattern(Str(), Float()),
+        "command": Map({
+            "program": Str(),
+            OptionalKey("arguments"): Str(),
+            OptionalKey("argument-list"): argument_list_schema,
+            OptionalKey("timeout"): Int(),
+            OptionalKey("max-memory-mb"): Int(),
+            OptionalKey("nice"): Int(),
+            OptionalKey("chunking"): Map({
+                "frames": Int(),
+                OptionalKey("max-parallel"): Int(),
+            }),
+            OptionalKey("batch"): Map({
+                "arguments": Str(),
+                OptionalKey("max-size"): Int(),
+            }),
+            OptionalKey("draft"): Map({
+                OptionalKey("arguments"): Str(),
+                OptionalKey("argument-list"): argument_list_schema,
+            }),
+        }),
+        "properties": Map({
+            "input": Seq(Map({
+                "name": Str(),
+                "type": Str(),
+                OptionalKey("pass-via"): Str(),
+                OptionalKey("required"): Bool(),
+                OptionalKey("default-value"): Str(),
+            })),
+            "output": Seq(Map({
+                "name": Str(),
+                "type": Str(),
+                OptionalKey("pass-via"): Str(),
+                OptionalKey("file-ext"): Str(),
+                OptionalKey("required"): Bool(),
+                OptionalKey("post-process"): Seq(Map({
+                    "name": Str(),
+                    "program": Str(),
+                    "arguments": Str(),
+                    OptionalKey("file-ext"): Str(),
+                })),
+            })),
+        }),
+    })
+    # Worker threads of load_config_files may call this concurrently and check _schema without
+    # a lock, so the loader is published first; a duplicate build is harmless
+    _yaml_load = yaml_mod.load
+    _schema = schema
+    return yaml_mod.load, schema
+
+# Schema-validated data of previously seen configs, keyed by a digest of the YAML text.
+# Stored as JSON so every hit builds fresh (mutable) dataclass instances.
+# With set_validated_cache_path() the cache is kept in a file, so later sessions skip
+# StrictYAML for configs that haven't changed. The file is tied to this module's source,
+# so a changed schema or parser starts from an empty cache.
+_validated_cache: Dict[str, str] = {}
+VALIDATED_CACHE_SIZE = 512
+# Guards the cache, which load_config_files() fills from its worker threads
+_cache_lock = threading.Lock()
+_cache_path: Optional[str] = None
+_cache_dirty = False
+_parser_digest: Optional[str] = None
+
+def _get_parser_digest() -> str:
+    global _parser_digest
+    if _parser_digest is None:
+        with open(__file__, 'rb') as f:
+            _parser_digest = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+    return _parser_digest
+
+def get_validated_cache_path() -> Optional[str]:
+    return _cache_path
+
+def set_validated_cache_path(path: str) -> None:
+    """Keeps the validated-config cache in the given JSON file, loading what earlier sessions stored there."""
+    global _cache_path
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        stored = {}
+    with _cache_lock:
+        _cache_path = path
+        if isinstance(stored, dict) and stored.get("parser") == _get_parser_digest():
+            for digest, data in list(stored.get("configs", {}).items())[-VALIDATED_CACHE_SIZE:]:
+                _validated_cache.setdefault(digest, data)
+
+def save_validated_cache() -> None:
+    """Writes the cache to the file set with set_validated_cache_path(), if anything was added."""
+    global _cache_dirty
+    with _cache_lock:
+        if not _cache_path or not _cache_dirty:
+            return
+        contents = {"parser": _get_parser_digest(), "configs": dict(_validated_cache)}
+        _cache_dirty = False
+    tmp_path = f"{_cache_path}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(_cache_path), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(contents, f)
+        os.replace(tmp_path, _cache_path)
+    except OSError as e:
+        print(f"GMB: Could not save the config cache: {e}")
+
+def _config_digest(yaml_string: str) -> str:
+    return hashlib.blake2b(yaml_string.encode('utf-8'), digest_size=16).hexdigest()
+
+def validate_yaml_config(yaml_string: str, use_cache: bool = True) -> GeneratorConfig:
+    """
+    Parse and validate a YAML string into a GeneratorConfig object.
+
+    Args:
+        yaml_string: The string containing the YAML configuration.
+        use_cache: If True, YAML text that already passed schema validation skips
+            StrictYAML and is rebuilt from its cached, serialized form.
+
+    Returns:
+        A GeneratorConfig object.
+
+    Raises:
+        ValueError: If the YAML is empty or does not describe a valid generator.
+        Any StrictYAML error raised while parsing or validating against the schema.
+    """
+    config = _validate(yaml_string, use_cache)
+    save_validated_cache()
+    return config
+
+def _validate(yaml_string: str, use_cache: bool) -> GeneratorConfig:
+    """validate_yaml_config() without saving the cache, so bulk loads save it once."""
+    global _cache_dirty
+    if not yaml_string:
+        raise ValueError("YAML config is empty.")
+
+    digest = _config_digest(yaml_string) if use_cache else None
+    with _cache_lock:
+        cached = _validated_cache.get(digest) if digest else None
+    if cached is not None:
+        # Dataclass __post_init__ checks still run on the fast path.
+        return _from_dict(GeneratorConfig, json.loads(cached))
+
+    yaml_load, schema = _get_schema()
+    data = yaml_load(yaml_string, schema).data
+    if not isinstance(data, dict):
+        raise ValueError(f"YAML root must be a dictionary, but got {type(data)}")
+
+    config = _from_dict(GeneratorConfig, data)
+
+    if digest:
+        serialized = json.dumps(data)
+        with _cache_lock:
+            while len(_validated_cache) >= VALIDATED_CACHE_SIZE:
+                # Evict the oldest entry (dicts keep insertion order)
+                del _validated_cache[next(iter(_validated_cache))]
+            _validated_cache[digest] = serialized
+            _cache_dirty = True
+    return config
+
+def parse_yaml_config(yaml_string: str, use_cache: bool = True) -> Optional[GeneratorConfig]:
     """
     Safely parse a YAML string and return a GeneratorConfig object.
 
     Args:
         yaml_string: The string containing the YAML configuration.
+        use_cache: Whether previously validated configs may skip StrictYAML.
 
     Returns:
         A GeneratorConfig object, or None if parsing or validation fails.
@@ -133,57 +461,45 @@ def parse_yaml_config(yaml_string: str) -> Optional[GeneratorConfig]:
         return None
         
     try:
-        # Import dynamically to avoid static import linter errors in environments
-        # where StrictYAML isn't installed at analysis time.
-        from importlib import import_module
-        yaml_mod = import_module('strictyaml')
-
-        # Define a schema to ensure correct typing (e.g., Bool/Int) rather than strings
-        Map = yaml_mod.Map
-        Seq = yaml_mod.Seq
-        Str = yaml_mod.Str
-        Int = yaml_mod.Int
-        Bool = yaml_mod.Bool
-        OptionalKey = yaml_mod.Optional
-
-        schema = Map({
-            "name": Str(),
-            OptionalKey("description"): Str(),
-            "command": Map({
-                "program": Str(),
-                OptionalKey("arguments"): Str(),
-                OptionalKey("argument-list"): Seq(Map({
-                    "argument": Str(),
-                    OptionalKey("if-property-set"): Str(),
-                })),
-                OptionalKey("timeout"): Int(),
-            }),
-            "properties": Map({
-                "input": Seq(Map({
-                    "name": Str(),
-                    "type": Str(),
-                    OptionalKey("pass-via"): Str(),
-                    OptionalKey("required"): Bool(),
-                    OptionalKey("default-value"): Str(),
-                })),
-                "output": Seq(Map({
-                    "name": Str(),
-                    "type": Str(),
-                    OptionalKey("pass-via"): Str(),
-                    OptionalKey("file-ext"): Str(),
-                    OptionalKey("required"): Bool(),
-                })),
-            }),
-        })
-
-        data = yaml_mod.load(yaml_string, schema).data
-        if not isinstance(data, dict):
-            print(f"Error: YAML root must be a dictionary, but got {type(data)}")
-            return None
-
-        return _from_dict(GeneratorConfig, data)
-
+        return validate_yaml_config(yaml_string, use_cache)
     except Exception as e:
         # Catches YAML errors, dataclass constructor errors, and validation errors from __post_init__
         print(f"Error parsing or validating YAML config: {e}")
-        return None 
\ No newline at end of file
+        return None
+
+def discover_config_files(directory: str, recursive: bool = True) -> List[str]:
+    """Returns the sorted list of YAML config files found in a directory."""
+    found = []
+    for root, dirs, files in os.walk(directory):
+        # Skip hidden directories such as .git
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        for filename in files:
+            if filename.lower().endswith(CONFIG_FILE_EXTENSIONS):
+                found.append(os.path.join(root, filename))
+        if not recursive:
+            break
+    return sorted(found)
+
+def _load_config_file(filepath: str) -> Tuple[str, Optional[GeneratorConfig], Optional[str]]:
+    """Reads and validates a single config file, returning (filepath, config, error)."""
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            yaml_string = f.read()
+        return filepath, _validate(yaml_string, True), None
+    except Exception as e:
+        return filepath, None, str(e).strip() or type(e).__name__
+
+def load_config_files(filepaths: List[str], max_workers: Optional[int] = None) -> List[Tuple[str, Optional[GeneratorConfig], Optional[str]]]:
+    """
+    Reads and validates many config files on a thread pool.
+
+    Returns a list of (filepath, config, error) tuples in the same order as `filepaths`.
+    Exactly one of config/error is set for each entry.
+    """
+    if not filepaths:
+        return []
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(_load_config_file, filepaths))
+    save_validated_cache()
+    return results